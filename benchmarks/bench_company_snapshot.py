@@ -0,0 +1,86 @@
+"""
+Benchmark: /predict for a known company, by payload vs by snapshot reference.
+
+Builds a company snapshot from synthetic Crunchbase tables, then times the
+feature stage and the full /predict path for the same companies sent once
+as JSON payloads (every agent runs) and once as a company reference (only
+the synergy agent runs). Both start from the request body, so validating
+the larger payload request is included. Also reports how long opening the
+snapshot takes.
+
+Usage:
+    python benchmarks/bench_company_snapshot.py [companies] [iterations]
+"""
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from src.api import app as api
+from models.company_snapshot import CompanySnapshot
+from pipeline.process_datasets import build_company_payloads, build_company_snapshot
+from synthetic import make_objects, make_funding_rounds
+
+ACQUIRER = {"industry": "software", "market": "software", "tech_stack": ["python"], "team_size": 200}
+
+
+def parse(body):
+    """Validate a request body and resolve its company reference, as /predict does."""
+    startup = api.StartupInput.model_validate_json(body)
+    if startup.company is not None:
+        startup._company_record = api._snapshot_record(startup.company)
+    return startup
+
+
+def time_per_call(func, requests, iterations):
+    for request in requests:
+        func(request)  # warm-up
+    start = time.perf_counter()
+    for i in range(iterations):
+        func(requests[i % len(requests)])
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def main():
+    companies = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    iterations = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+    if not (api.model_registry.wait() and api._models_ready()):
+        print("Models not loaded; train them first (python train_models.py)")
+        return
+    logging.getLogger(api.__name__).setLevel(logging.WARNING)
+
+    objects_df = make_objects(companies)
+    funding_rounds_df = make_funding_rounds(objects_df)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'snapshot')
+        start = time.perf_counter()
+        count = build_company_snapshot(objects_df, funding_rounds_df, path)
+        build_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        api.company_snapshot = CompanySnapshot(path)
+        open_ms = (time.perf_counter() - start) * 1e3
+        print(f"{count:,} companies: built in {build_seconds:.1f}s, opened in {open_ms:.2f}ms\n")
+
+        payloads = build_company_payloads(objects_df, funding_rounds_df).sample(200, random_state=0)
+        by_payload = [json.dumps({'acquirer_json': ACQUIRER, **{
+            column: json.loads(payloads[column].iloc[i])
+            for column in ('funding_json', 'team_json', 'target_json', 'financials_json')
+        }}) for i in range(len(payloads))]
+        by_reference = [json.dumps({'acquirer_json': ACQUIRER, 'company': company}) for company in payloads['id']]
+        assert api._predict_one(parse(by_payload[0])) == api._predict_one(parse(by_reference[0]))
+
+        print(f"{'request':<12} {'body (bytes)':>13} {'features (us)':>14} {'/predict (us)':>14}")
+        for name, requests in (('payload', by_payload), ('reference', by_reference)):
+            body_bytes = sum(map(len, requests)) / len(requests)
+            features_us = time_per_call(lambda body: api._compute_agent_features(parse(body)), requests, iterations)
+            predict_us = time_per_call(lambda body: api._predict_one(parse(body)), requests, iterations)
+            print(f"{name:<12} {body_bytes:>13,.0f} {features_us:>14,.1f} {predict_us:>14,.1f}")
+
+
+if __name__ == "__main__":
+    main()
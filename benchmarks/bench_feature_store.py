@@ -0,0 +1,58 @@
+"""
+Benchmark: full feature rebuild vs an incremental feature store update.
+
+Builds a synthetic raw startups file, fills the feature store once, then
+changes the funding rounds of a small share of the startups and compares a
+full stream_features run with update_features, which only recomputes the
+changed rows.
+
+Usage:
+    python benchmarks/bench_feature_store.py [rows] [changed_fraction]
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from pipeline.build_features import feature_agents, stream_features
+from pipeline.feature_store import update_features
+from pipeline.process_datasets import build_crunchbase_scenarios
+from synthetic import make_objects, make_funding_rounds
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    changed_fraction = float(sys.argv[2]) if len(sys.argv) > 2 else 0.01
+    objects_df = make_objects(rows)
+    raw = build_crunchbase_scenarios(objects_df, make_funding_rounds(objects_df))
+    agents = feature_agents()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        raw_path = os.path.join(tmp, "startups.csv")
+        store_path = os.path.join(tmp, "store.sqlite")
+        raw.to_csv(raw_path, index=False)
+
+        start = time.perf_counter()
+        update_features(raw_path, os.path.join(tmp, "features.csv"), store_path, agents=agents, progress=False)
+        print(f"{len(raw):,} scenarios, store filled in {time.perf_counter() - start:.2f}s")
+
+        changed = np.random.default_rng(0).choice(len(raw), int(len(raw) * changed_fraction), replace=False)
+        raw.loc[changed, 'funding_json'] = json.dumps({'rounds': [{'type': 'series-b', 'amount': 5e6}]})
+        raw.to_csv(raw_path, index=False)
+
+        start = time.perf_counter()
+        stream_features(raw_path, os.path.join(tmp, "full.csv"), agents=agents, progress=False)
+        full = time.perf_counter() - start
+        stats = update_features(raw_path, os.path.join(tmp, "features.csv"), store_path, agents=agents, progress=False)
+        print(f"  full rebuild        {full:7.2f}s")
+        print(f"  incremental update  {stats['seconds']:7.2f}s  ({stats['rows_recomputed']:,} rows recomputed, "
+              f"{full / stats['seconds']:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
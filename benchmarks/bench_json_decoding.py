@@ -0,0 +1,71 @@
+"""
+Benchmark: decoding the *_json payload columns.
+
+Builds a synthetic raw startups file and times three ways of getting the
+five payload columns into Python objects: ``json.loads`` per cell, the
+json_codec column decoder (orjson when installed), and reading the
+Parquet written by ``convert_raw_to_parquet``, whose typed columns need no
+parsing (the rest are decoded with the column decoder).
+
+Usage:
+    python benchmarks/bench_json_decoding.py [rows]
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from models import json_codec
+from pipeline.build_features import JSON_COLUMNS, convert_raw_to_parquet, read_raw_chunks
+from pipeline.process_datasets import build_crunchbase_scenarios
+from synthetic import make_objects, make_funding_rounds
+
+
+def timed(func):
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    objects_df = make_objects(rows)
+    raw = build_crunchbase_scenarios(objects_df, make_funding_rounds(objects_df))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, "startups.csv")
+        parquet_path = os.path.join(tmp, "startups.parquet")
+        raw.to_csv(csv_path, index=False)
+        layout = convert_raw_to_parquet(csv_path, parquet_path)
+        columns = {column: pd.read_csv(csv_path, usecols=[column])[column].tolist() for column in JSON_COLUMNS}
+
+        def per_cell():
+            for values in columns.values():
+                [json.loads(value) for value in values]
+
+        def batched():
+            for values in columns.values():
+                json_codec.loads_column(values)
+
+        def typed():
+            for chunk in read_raw_chunks(parquet_path, len(raw)):
+                for column, kind in layout.items():
+                    if kind == "json":
+                        json_codec.loads_column(chunk[column].tolist())
+
+        baseline = timed(per_cell)
+        print(f"{len(raw):,} rows, typed columns: {', '.join(c for c, kind in layout.items() if kind == 'typed')}")
+        print(f"  json.loads per cell      {baseline:7.2f}s")
+        seconds = timed(batched)
+        print(f"  loads_column ({json_codec.decoder_name():<6})    {seconds:7.2f}s  {baseline / seconds:5.1f}x")
+        seconds = timed(typed)
+        print(f"  typed Parquet read       {seconds:7.2f}s  {baseline / seconds:5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
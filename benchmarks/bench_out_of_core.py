@@ -0,0 +1,79 @@
+"""
+Benchmark: peak memory and time of in-memory vs out-of-core training.
+
+Writes a synthetic feature table with valuation targets, then trains the
+meta and valuation models from it in a fresh process per run, once with the
+in-memory trainers (train_with_crunchbase) and once with the chunked
+trainers (train_out_of_core). Each process reports its peak RSS.
+
+Usage:
+    python benchmarks/bench_out_of_core.py [rows] [chunk_size]
+"""
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from models.train_with_crunchbase import VALUATION_FEATURE_COLUMNS
+
+
+def write_features(path, rows, chunk_size=500_000):
+    """Random feature rows with the training columns, written in chunks."""
+    rng = np.random.default_rng(0)
+    for start in range(0, rows, chunk_size):
+        count = min(chunk_size, rows - start)
+        chunk = pd.DataFrame(rng.lognormal(1, 1, (count, len(VALUATION_FEATURE_COLUMNS))),
+                             columns=VALUATION_FEATURE_COLUMNS)
+        chunk.insert(0, 'startup_id', np.arange(start, start + count))
+        chunk['valuation_12m_forward'] = chunk['valuation_proxy_current'] * rng.uniform(0.8, 1.5, count)
+        chunk.to_csv(path, mode='w' if start == 0 else 'a', header=start == 0, index=False)
+
+
+def child(mode, features_path, model_dir, chunk_size):
+    import contextlib
+    import io
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        if mode == 'in-memory':
+            from models.train_with_crunchbase import train_meta_model_with_crunchbase, \
+                train_valuation_model_with_crunchbase
+            df = pd.read_csv(features_path)
+            train_meta_model_with_crunchbase(df, os.path.join(model_dir, 'meta.joblib'))
+            train_valuation_model_with_crunchbase(df, os.path.join(model_dir, 'valuation.joblib'))
+        else:
+            from models.train_out_of_core import train_meta_model_out_of_core, train_valuation_model_out_of_core
+            train_meta_model_out_of_core(features_path, os.path.join(model_dir, 'meta.joblib'), int(chunk_size))
+            train_valuation_model_out_of_core(features_path, os.path.join(model_dir, 'valuation.joblib'),
+                                              int(chunk_size))
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    peak = peak if sys.platform == 'darwin' else peak * 1024
+    print(f"{time.perf_counter() - start} {peak}")
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000
+    chunk_size = int(sys.argv[2]) if len(sys.argv) > 2 else 100_000
+    with tempfile.TemporaryDirectory() as tmp:
+        features_path = os.path.join(tmp, 'features.csv')
+        write_features(features_path, rows)
+        print(f"{rows:,} rows, {os.path.getsize(features_path) / 2**20:,.0f} MiB CSV, chunks of {chunk_size:,}\n")
+        print(f"{'mode':<12} {'seconds':>9} {'peak RSS MiB':>13}")
+        for mode in ('in-memory', 'out-of-core'):
+            output = subprocess.run([sys.executable, __file__, '--child', mode, features_path, tmp, str(chunk_size)],
+                                    check=True, capture_output=True, text=True).stdout.split()
+            seconds, peak = float(output[-2]), int(output[-1])
+            print(f"{mode:<12} {seconds:>9.1f} {peak / 2**20:>13,.0f}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == '--child':
+        child(*sys.argv[2:])
+    else:
+        main()
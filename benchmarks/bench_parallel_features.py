@@ -0,0 +1,53 @@
+"""
+Benchmark: scaling of parallel feature building from 1 to N processes.
+
+Builds features for a synthetic Crunchbase scenario CSV with
+stream_features at increasing worker counts, checks that every run writes
+the same bytes as the serial one and reports rows/sec and the speed-up.
+
+Usage:
+    python benchmarks/bench_parallel_features.py [num_companies] [max_workers]
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from pipeline.build_features import stream_features
+from pipeline.process_datasets import build_crunchbase_scenarios
+from synthetic import make_objects, make_funding_rounds
+
+CHUNK_SIZE = 20_000
+
+
+def main():
+    num_companies = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    max_workers = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count() or 1
+    worker_counts = sorted({1, 2, 4, max_workers} - {n for n in (2, 4) if n > max_workers})
+
+    with tempfile.TemporaryDirectory() as tmp:
+        objects_df = make_objects(num_companies)
+        raw_path = os.path.join(tmp, "startups.csv")
+        build_crunchbase_scenarios(objects_df, make_funding_rounds(objects_df)).to_csv(raw_path, index=False)
+        del objects_df
+
+        print(f"{'workers':>8} {'seconds':>9} {'rows/s':>10} {'speed-up':>9} {'identical':>10}")
+        serial_bytes = None
+        serial_seconds = None
+        for workers in worker_counts:
+            output_path = os.path.join(tmp, f"features_{workers}.csv")
+            start = time.perf_counter()
+            stats = stream_features(raw_path, output_path, CHUNK_SIZE, progress=False, workers=workers)
+            seconds = time.perf_counter() - start
+            with open(output_path, "rb") as f:
+                output = f.read()
+            if serial_bytes is None:
+                serial_bytes, serial_seconds = output, seconds
+            print(f"{workers:>8} {seconds:>9.2f} {stats['rows_read'] / seconds:>10,.0f} "
+                  f"{serial_seconds / seconds:>8.2f}x {str(output == serial_bytes):>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Benchmark: per-request overhead of the /predict scoring path.
+
+Compares the old request path (new agent instances per call, two pandas
+DataFrames per request) with the hoisted agents and the compiled
+InferencePlan that app.py now uses. Both paths score the same payload with
+the same models, so the difference is pure per-request overhead.
+
+Usage:
+    python benchmarks/bench_predict_overhead.py [iterations]
+"""
+import logging
+import os
+import sys
+import time
+
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from src.api import app as api
+from models.funding_agent import FundingAgent
+from models.synergy_agent import SynergyAgent
+from models.valuation_agent import ValuationAgent
+
+PAYLOAD = api.StartupInput(
+    funding_json={"rounds": [{"type": "Seed", "amount": "500000"}, {"type": "Series A", "amount": "2000000"}]},
+    team_json={"founders": [{"experience_years": 5, "has_exit": True}, {"experience_years": 3, "has_exit": False}]},
+    acquirer_json={"industry": "tech", "market": "saas", "tech_stack": ["python", "react"], "team_size": 500},
+    target_json={"industry": "tech", "market": "saas", "tech_stack": ["python", "angular"], "team_size": 50},
+    financials_json={"monthly_revenue_usd": 100000, "revenue_growth_mom": 15.0, "gross_margin": 0.8}
+)
+
+
+def legacy_score(startup):
+    """The scoring half of /predict before agents and model inputs were hoisted."""
+    features = {
+        **FundingAgent().transform(startup.funding_json),
+        **api.team_agent.transform(startup.team_json),
+        **SynergyAgent().transform(startup.acquirer_json, startup.target_json),
+        **ValuationAgent().transform(startup.financials_json)
+    }
+    df_mna = pd.DataFrame([[features.get(col, 0) for col in api.META_FEATURE_COLUMNS]],
+                          columns=api.META_FEATURE_COLUMNS)
+    df_valuation = pd.DataFrame([[features.get(col, 0) for col in api.VALUATION_FEATURE_COLUMNS]],
+                                columns=api.VALUATION_FEATURE_COLUMNS)
+    return float(api.model.predict_proba(df_mna)[:, 1][0]), float(api.valuation_model.predict(df_valuation)[0])
+
+
+def current_score(startup):
+    """The scoring half of /predict as it runs now."""
+    features = api._compute_agent_features(startup)
+    likelihoods, forecasts = api._score_batch([features["mna"]])
+    return likelihoods[0], forecasts[0]
+
+
+def time_per_call(func, iterations):
+    func(PAYLOAD)  # warm-up
+    start = time.perf_counter()
+    for _ in range(iterations):
+        result = func(PAYLOAD)
+    return (time.perf_counter() - start) / iterations * 1e6, result
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    if not (api.model_registry.wait() and api._models_ready()):
+        print("Models not loaded; train them first (python train_models.py)")
+        return
+
+    # Keep the per-request log lines out of the measurement
+    logging.getLogger(api.__name__).setLevel(logging.WARNING)
+
+    legacy_us, legacy_result = time_per_call(legacy_score, iterations)
+    current_us, current_result = time_per_call(current_score, iterations)
+    full_us, _ = time_per_call(api._predict_one, iterations)
+
+    assert legacy_result == current_result, (legacy_result, current_result)
+    print(f"{'path':<28} {'us/request':>12}")
+    print(f"{'legacy scoring':<28} {legacy_us:>12,.0f}")
+    print(f"{'hoisted + inference plan':<28} {current_us:>12,.0f}")
+    print(f"{'full /predict (current)':<28} {full_us:>12,.0f}")
+    print(f"Scoring speed-up: {legacy_us / current_us:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
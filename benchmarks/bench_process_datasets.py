@@ -0,0 +1,59 @@
+"""
+Benchmark: scaling of process_datasets.build_crunchbase_scenarios.
+
+Times the relational scenario builder on synthetic Crunchbase tables of
+increasing size. For the small sizes it also times the old per-row
+``object_id in sample_companies['id'].values`` funding scan to show the
+O(N*M) behaviour it replaced.
+
+Usage:
+    python benchmarks/bench_process_datasets.py [max_companies]
+"""
+import os
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from pipeline.process_datasets import build_crunchbase_scenarios
+from synthetic import make_objects, make_funding_rounds
+
+LEGACY_MAX_COMPANIES = 10_000
+
+
+def legacy_funding_scan(companies_df, funding_rounds_df):
+    """The funding aggregation loop that build_crunchbase_scenarios replaced."""
+    funding_data = {}
+    for _, round_row in funding_rounds_df.iterrows():
+        object_id = round_row['object_id']
+        if object_id in companies_df['id'].values:
+            funding_data.setdefault(object_id, []).append(round_row['raised_amount_usd'])
+    return funding_data
+
+
+def main():
+    max_companies = int(sys.argv[1]) if len(sys.argv) > 1 else 300_000
+    sizes = [size for size in (1_000, 10_000, 100_000, 300_000, 1_000_000) if size <= max_companies]
+
+    print(f"{'companies':>10} {'rounds':>10} {'scenarios':>10} {'new (s)':>10} {'rows/s':>12} {'legacy scan (s)':>16}")
+    for size in sizes:
+        objects_df = make_objects(size)
+        funding_rounds_df = make_funding_rounds(objects_df)
+
+        start = time.perf_counter()
+        scenarios = build_crunchbase_scenarios(objects_df, funding_rounds_df)
+        elapsed = time.perf_counter() - start
+
+        legacy = '-'
+        if size <= LEGACY_MAX_COMPANIES:
+            companies_df = objects_df[objects_df['entity_type'] == 'Company']
+            start = time.perf_counter()
+            legacy_funding_scan(companies_df, funding_rounds_df)
+            legacy = f"{time.perf_counter() - start:.2f}"
+
+        print(f"{size:>10} {len(funding_rounds_df):>10} {len(scenarios):>10} {elapsed:>10.2f} "
+              f"{size / elapsed:>12,.0f} {legacy:>16}")
+
+
+if __name__ == "__main__":
+    main()
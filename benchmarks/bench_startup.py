@@ -0,0 +1,81 @@
+"""
+Benchmark: API cold-start time.
+
+Each configuration runs in a fresh interpreter. The report shows how long it
+takes until the app module is imported (the process can answer /health) and
+until the models are ready to score (/ready returns 200):
+
+- legacy: the old import-time path, which loads both models, the company
+  datasets and the VC evaluation CSV one after another
+- eager: the model registry loading in parallel, blocking the import
+- background: the model registry loading in parallel after the import returns
+- background + mmap: as above, with MODEL_MMAP_MODE=r
+
+Usage:
+    python benchmarks/bench_startup.py [repeats]
+"""
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+LEGACY_SCRIPT = """
+import json, os, sys, time
+start = time.perf_counter()
+sys.path.append('src')
+import fastapi, joblib, pandas as pd
+from models.team_agent import TeamAgent
+import models.reasoning_agent, models.business_model_agent, models.inference_plan
+for candidates in (["models/meta_model_crunchbase.joblib", "models/meta_model.joblib"],
+                   ["models/valuation_model_crunchbase.joblib", "models/valuation_model.joblib"]):
+    path = next(p for p in candidates if os.path.exists(p))
+    joblib.load(path)
+TeamAgent()
+csv_path = 'enhanced_training_data.csv'
+for _ in range(2):  # ReasoningAgent and BusinessModelAgent each read it
+    try:
+        pd.read_csv(csv_path)
+    except Exception:
+        pass
+elapsed = time.perf_counter() - start
+print(json.dumps({"live": elapsed, "ready": elapsed}))
+"""
+
+REGISTRY_SCRIPT = """
+import json, time
+start = time.perf_counter()
+from src.api import app as api
+live = time.perf_counter() - start
+api.model_registry.wait()
+print(json.dumps({"live": live, "ready": time.perf_counter() - start}))
+"""
+
+
+def run(script, env_overrides):
+    env = dict(os.environ, **env_overrides)
+    output = subprocess.run([sys.executable, "-c", script], cwd=ROOT, env=env,
+                            capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    configurations = [
+        ("legacy", LEGACY_SCRIPT, {}),
+        ("eager", REGISTRY_SCRIPT, {"MODEL_LOAD_MODE": "eager"}),
+        ("background", REGISTRY_SCRIPT, {"MODEL_LOAD_MODE": "background"}),
+        ("background + mmap", REGISTRY_SCRIPT, {"MODEL_LOAD_MODE": "background", "MODEL_MMAP_MODE": "r"})
+    ]
+
+    print(f"{'configuration':<20} {'live (s)':>10} {'ready (s)':>10}   (best of {repeats})")
+    for name, script, env in configurations:
+        results = [run(script, env) for _ in range(repeats)]
+        live = min(result["live"] for result in results)
+        ready = min(result["ready"] for result in results)
+        print(f"{name:<20} {live:>10.2f} {ready:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Benchmark: peak memory and throughput of feature building.
+
+Writes synthetic Crunchbase scenario CSVs of increasing size and builds
+their features twice: in one pass over the whole DataFrame, and with the
+chunked stream_features pipeline. Peak memory is measured with tracemalloc,
+which sees the NumPy/pandas buffers as well as the Python objects. The
+streaming peak stays flat as the input grows.
+
+Usage:
+    python benchmarks/bench_streaming_features.py [max_rows]
+"""
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from pipeline.build_features import compute_feature_frame, feature_agents, stream_features
+from pipeline.process_datasets import build_crunchbase_scenarios
+from synthetic import make_objects, make_funding_rounds
+
+CHUNK_SIZE = 20_000
+
+
+def measure(func):
+    tracemalloc.start()
+    start = time.perf_counter()
+    func()
+    seconds = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return seconds, peak / 2**20
+
+
+def main():
+    max_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    sizes = [size for size in (25_000, 50_000, 100_000, 200_000, 400_000) if size <= max_rows]
+    agents = feature_agents()
+
+    print(f"{'rows':>8} {'single pass (s)':>16} {'peak MiB':>9} {'streamed (s)':>13} {'peak MiB':>9} {'rows/s':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            objects_df = make_objects(size)
+            raw_path = os.path.join(tmp, "startups.csv")
+            build_crunchbase_scenarios(objects_df, make_funding_rounds(objects_df)).to_csv(raw_path, index=False)
+            del objects_df
+
+            def single_pass():
+                compute_feature_frame(pd.read_csv(raw_path), *agents).to_csv(os.path.join(tmp, "full.csv"), index=False)
+
+            def streamed():
+                stream_features(raw_path, os.path.join(tmp, "streamed.csv"), CHUNK_SIZE, agents, progress=False)
+
+            full_seconds, full_peak = measure(single_pass)
+            stream_seconds, stream_peak = measure(streamed)
+            rows = len(pd.read_csv(raw_path, usecols=['startup_id']))
+            print(f"{rows:>8} {full_seconds:>16.2f} {full_peak:>9.0f} {stream_seconds:>13.2f} {stream_peak:>9.0f} "
+                  f"{rows / stream_seconds:>9,.0f}")
+
+
+if __name__ == "__main__":
+    main()
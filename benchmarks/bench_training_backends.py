@@ -0,0 +1,94 @@
+"""
+Benchmark: training time, model quality and scoring latency of the model backends.
+
+Trains the meta and valuation models with the default backend (random
+forest and XGBoost) and with LightGBM on the same feature table, then
+times single-row scoring the way the API does it (compiled tree engine
+where possible) and 1,000-row batches.
+
+Uses data/processed/crunchbase_features_with_targets.csv when it exists,
+otherwise synthetic Crunchbase tables of the given size.
+
+Usage:
+    python benchmarks/bench_training_backends.py [companies]
+"""
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.metrics import accuracy_score, mean_absolute_error
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from models.inference_plan import _without_feature_name_check
+from models.tree_engine import compile_model
+from models.train_with_crunchbase import MODEL_BACKENDS, meta_training_data, scoring_latency_us, \
+    split_training_data, train_meta_model_with_crunchbase, train_valuation_model_with_crunchbase, \
+    valuation_training_data
+from pipeline.build_features import stream_features
+from pipeline.process_datasets import add_valuation_targets, build_crunchbase_scenarios
+from synthetic import make_objects, make_funding_rounds
+
+FEATURES_WITH_TARGETS = os.path.join('data', 'processed', 'crunchbase_features_with_targets.csv')
+
+
+def load_features(companies, tmp):
+    if os.path.exists(FEATURES_WITH_TARGETS):
+        print(f"Using {FEATURES_WITH_TARGETS}")
+        return pd.read_csv(FEATURES_WITH_TARGETS)
+    print(f"Using {companies:,} synthetic companies")
+    objects_df = make_objects(companies)
+    raw_path, features_path = os.path.join(tmp, 'startups.csv'), os.path.join(tmp, 'features.csv')
+    build_crunchbase_scenarios(objects_df, make_funding_rounds(objects_df)).to_csv(raw_path, index=False)
+    stream_features(raw_path, features_path, progress=False)
+    return add_valuation_targets(pd.read_csv(features_path))
+
+
+def batch_seconds(model, X):
+    try:
+        scorer = compile_model(model)
+    except ValueError:
+        scorer = _without_feature_name_check(model)
+    predict = scorer.predict_proba if getattr(scorer, 'classes_', None) is not None else scorer.predict
+    start = time.perf_counter()
+    predict(X)
+    return time.perf_counter() - start
+
+
+def main():
+    companies = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    with tempfile.TemporaryDirectory() as tmp:
+        df = load_features(companies, tmp)
+        print(f"{len(df):,} rows, {os.cpu_count()} CPUs\n")
+        print(f"{'model':<10} {'backend':<9} {'train (s)':>10} {'quality':>18} {'1 row (us)':>11} "
+              f"{'1k rows (ms)':>13}")
+        for name, train, training_data in (
+                ('meta', train_meta_model_with_crunchbase, meta_training_data),
+                ('valuation', train_valuation_model_with_crunchbase, valuation_training_data)):
+            for backend in MODEL_BACKENDS:
+                path = os.path.join(tmp, f'{name}-{backend}.joblib')
+                start = time.perf_counter()
+                with contextlib.redirect_stdout(io.StringIO()):
+                    train(df, path, backend=backend)
+                train_seconds = time.perf_counter() - start
+
+                model = joblib.load(path)
+                X, y = training_data(df, backend)
+                _, X_test, _, y_test = split_training_data(X, y)
+                X_test = X_test.to_numpy(dtype=np.float64)
+                if name == 'meta':
+                    quality = f"accuracy {accuracy_score(y_test, model.predict(X_test)):.4f}"
+                else:
+                    quality = f"MAE {mean_absolute_error(y_test, model.predict(X_test)) / 1e6:,.2f}M"
+                print(f"{name:<10} {backend:<9} {train_seconds:>10.2f} {quality:>18} "
+                      f"{scoring_latency_us(model, X_test):>11.0f} {batch_seconds(model, X_test[:1000]) * 1e3:>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Load test: /predict latency under concurrency, and /health while it is saturated.
+
+Fires ``requests`` /predict calls with ``concurrency`` callers in flight and
+reports p50/p99 latency and the number of 503 rejections. A separate probe
+polls /health throughout, so the report also shows whether the event loop
+stays responsive while the inference pool is busy.
+
+Without ``--url`` the app is driven in-process through httpx's ASGI
+transport. Pass ``--url http://localhost:8000`` to test a running uvicorn
+server instead. ``--micro-batch`` turns on request coalescing for the
+in-process app (set PREDICT_MICRO_BATCH=1 on the server otherwise).
+
+Every request is a distinct scenario so that the result cache does not
+answer it. ``--repeat`` sends the same scenario each time instead, which
+measures cache hits.
+
+Usage:
+    python benchmarks/load_test.py [--url URL] [--requests N] [--concurrency C] [--micro-batch] [--repeat]
+"""
+import argparse
+import asyncio
+import itertools
+import logging
+import os
+import sys
+import time
+
+import httpx
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+PAYLOAD = {
+    "funding_json": {"rounds": [{"type": "Seed", "amount": "500000"}, {"type": "Series A", "amount": "2000000"}]},
+    "team_json": {"founders": [{"experience_years": 5, "has_exit": True}, {"experience_years": 3, "has_exit": False}]},
+    "acquirer_json": {"industry": "tech", "market": "saas", "tech_stack": ["python", "react"], "team_size": 500},
+    "target_json": {"industry": "tech", "market": "saas", "tech_stack": ["python", "angular"], "team_size": 50},
+    "financials_json": {"monthly_revenue_usd": 100000, "revenue_growth_mom": 15.0, "gross_margin": 0.8}
+}
+
+
+SCENARIO_IDS = itertools.count()
+
+
+def next_payload(repeat):
+    if repeat:
+        return PAYLOAD
+    growth = 15.0 + next(SCENARIO_IDS) / 1000
+    return dict(PAYLOAD, financials_json=dict(PAYLOAD["financials_json"], revenue_growth_mom=growth))
+
+
+def make_client(url):
+    if url:
+        return httpx.AsyncClient(base_url=url, timeout=60)
+    from src.api import app as api
+    logging.getLogger(api.__name__).setLevel(logging.ERROR)
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=api.app), base_url="http://loadtest", timeout=60)
+
+
+def percentiles(latencies):
+    if not latencies:
+        return "-", "-"
+    p50, p99 = np.percentile(np.asarray(latencies) * 1000, [50, 99])
+    return f"{p50:.1f}", f"{p99:.1f}"
+
+
+async def run(url, total_requests, concurrency, repeat):
+    predict_latencies, status_counts = [], {}
+    health_latencies = []
+    queue = asyncio.Queue()
+    for _ in range(total_requests):
+        queue.put_nowait(next_payload(repeat))
+
+    async with make_client(url) as client:
+        async def caller():
+            while not queue.empty():
+                payload = queue.get_nowait()
+                start = time.perf_counter()
+                response = await client.post("/predict", json=payload)
+                elapsed = time.perf_counter() - start
+                status_counts[response.status_code] = status_counts.get(response.status_code, 0) + 1
+                if response.status_code == 200:
+                    predict_latencies.append(elapsed)
+
+        async def health_probe(done):
+            while not done.is_set():
+                start = time.perf_counter()
+                await client.get("/health")
+                health_latencies.append(time.perf_counter() - start)
+                await asyncio.sleep(0.05)
+
+        done = asyncio.Event()
+        probe = asyncio.create_task(health_probe(done))
+        start = time.perf_counter()
+        await asyncio.gather(*(caller() for _ in range(concurrency)))
+        wall = time.perf_counter() - start
+        done.set()
+        await probe
+
+    return predict_latencies, status_counts, health_latencies, wall
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="Base URL of a running server (default: in-process)")
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32, 128])
+    parser.add_argument("--micro-batch", action="store_true", help="Enable micro-batching in the in-process app")
+    parser.add_argument("--repeat", action="store_true", help="Send the same scenario every time (cache hits)")
+    args = parser.parse_args()
+    if args.micro_batch:
+        os.environ["PREDICT_MICRO_BATCH"] = "1"
+
+    print(f"{'concurrency':>11} {'ok':>6} {'503':>6} {'ok/s':>8} {'p50 ms':>8} {'p99 ms':>8} "
+          f"{'health p50':>11} {'health p99':>11}")
+    for concurrency in args.concurrency:
+        predict_latencies, status_counts, health_latencies, wall = asyncio.run(
+            run(args.url, args.requests, concurrency, args.repeat)
+        )
+        p50, p99 = percentiles(predict_latencies)
+        health_p50, health_p99 = percentiles(health_latencies)
+        print(f"{concurrency:>11} {status_counts.get(200, 0):>6} {status_counts.get(503, 0):>6} "
+              f"{status_counts.get(200, 0) / wall:>8.0f} {p50:>8} {p99:>8} {health_p50:>11} {health_p99:>11}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+Synthetic Crunchbase-shaped tables for the benchmarks.
+
+The real CSVs under datasets/ are stored in Git LFS, so the benchmarks
+generate tables with the same columns at any size instead.
+"""
+import numpy as np
+import pandas as pd
+
+CATEGORY_CODES = [
+    'web', 'software', 'mobile', 'enterprise', 'games_video', 'ecommerce',
+    'advertising', 'biotech', 'cleantech', 'hardware', 'network_hosting', None
+]
+TAGS = [f'tag{i}' for i in range(500)]
+ROUND_TYPES = ['angel', 'series-a', 'series-b', 'series-c+', 'venture', 'private-equity']
+
+
+def make_objects(num_companies: int, seed: int = 0) -> pd.DataFrame:
+    """Objects table with ``num_companies`` companies plus a few other entities."""
+    rng = np.random.default_rng(seed)
+    num_other = max(1, num_companies // 10)
+    total = num_companies + num_other
+    years = rng.integers(1990, 2013, total).astype(str)
+    founded_at = np.where(rng.random(total) < 0.3, None, np.char.add(years, '-01-01').astype(object))
+    return pd.DataFrame({
+        'id': [f'c:{i}' for i in range(num_companies)] + [f'p:{i}' for i in range(num_other)],
+        'entity_type': ['Company'] * num_companies + ['Person'] * num_other,
+        'name': [f'Company {i}' for i in range(num_companies)] + [f'Person {i}' for i in range(num_other)],
+        'permalink': [f'/company/company-{i}' for i in range(num_companies)] + [f'/person/person-{i}' for i in range(num_other)],
+        'category_code': rng.choice(np.asarray(CATEGORY_CODES, dtype=object), total),
+        'founded_at': founded_at,
+        'funding_total_usd': rng.integers(0, 50_000_000, total).astype(float),
+        'tag_list': [', '.join(rng.choice(TAGS, size)) if size else None for size in rng.integers(0, 6, total)]
+    })
+
+
+def make_funding_rounds(objects_df: pd.DataFrame, rounds_per_company: float = 1.2, seed: int = 1) -> pd.DataFrame:
+    """Funding rounds table referencing the companies in ``objects_df``."""
+    rng = np.random.default_rng(seed)
+    company_ids = objects_df.loc[objects_df['entity_type'] == 'Company', 'id'].to_numpy()
+    count = int(len(company_ids) * rounds_per_company)
+    return pd.DataFrame({
+        'funding_round_id': np.arange(count),
+        'object_id': rng.choice(company_ids, count),
+        'funded_at': rng.choice(np.asarray(['2008-03-01', '2010-07-15', '2012-11-30'], dtype=object), count),
+        'funding_round_type': rng.choice(np.asarray(ROUND_TYPES, dtype=object), count),
+        'raised_amount_usd': rng.integers(0, 20_000_000, count).astype(float)
+    })
@@ -1,16 +1,17 @@
+import asyncio
 import json
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
-from pydantic import BaseModel
+from fastapi.responses import FileResponse, JSONResponse, PlainTextResponse
+from pydantic import BaseModel, PrivateAttr, model_validator
+from typing import List, Optional
 
-import joblib
-import pandas as pd
 import sys
 import os
 import logging
 import math
+import time
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
@@ -19,7 +20,7 @@ logger = logging.getLogger(__name__)
 # Add the parent directory to the path to import from src.models
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
-from models.funding_agent import FundingAgent
+from models.funding_agent import FundingAgent, round_type_code
 from models.team_agent import TeamAgent
 from models.synergy_agent import SynergyAgent
 from models.valuation_agent import ValuationAgent
@@ -28,18 +29,51 @@ from models.decision_score_agent import DecisionScoreAgent
 from models.risk_agent import RiskAgent
 from models.benchmark_agent import BenchmarkAgent
 from models.business_model_agent import BusinessModelAgent
+from models.company_snapshot import COMPANY_SNAPSHOT_PATH, CompanySnapshot
+from models.inference_plan import InferencePlan
+from models.synergy_screen import SynergyScreen
+from api.inference_pool import InferencePool, InferencePoolFull
+from api.micro_batcher import MicroBatcher
+from api.model_registry import ModelRegistry, model_artifacts
+from api.result_cache import ResultCache, scenario_key
+from api.metrics import Histogram, render_metric
+from api.json_route import JSONCodecRoute
 
 
 class StartupInput(BaseModel):
-    funding_json: dict
-    team_json: dict
+    funding_json: Optional[dict] = None
+    team_json: Optional[dict] = None
     acquirer_json: dict
-    target_json: dict
-    financials_json: dict
+    target_json: Optional[dict] = None
+    financials_json: Optional[dict] = None
+    # Id or permalink of a company in the snapshot, in place of the four payloads above
+    company: Optional[str] = None
+    # Snapshot record of ``company`` once /predict has looked it up
+    _company_record: Optional[dict] = PrivateAttr(default=None)
 
+    @model_validator(mode="after")
+    def _target_given_once(self):
+        payloads = (self.funding_json, self.team_json, self.target_json, self.financials_json)
+        if self.company is None and any(payload is None for payload in payloads):
+            raise ValueError("funding_json, team_json, target_json and financials_json are required without company")
+        if self.company is not None and any(payload is not None for payload in payloads):
+            raise ValueError("company replaces funding_json, team_json, target_json and financials_json")
+        return self
 
-# Initialize FastAPI app
+
+class BatchStartupInput(BaseModel):
+    items: List[StartupInput]
+
+
+class ScreenInput(BaseModel):
+    acquirer: dict
+    k: int = 10
+    exclude_id: Optional[str] = None
+
+
+# Initialize FastAPI app; request bodies are decoded by the pluggable JSON codec
 app = FastAPI()
+app.router.route_class = JSONCodecRoute
 
 # Add CORS middleware to allow frontend requests
 app.add_middleware(
@@ -51,23 +85,33 @@ app.add_middleware(
 )
 
 
-# Load the trained models when the app starts
-model = None
-valuation_model = None
-# Try to load Crunchbase-trained models first, fallback to original models
-if os.path.exists("models/meta_model_crunchbase.joblib"):
-    model = joblib.load("models/meta_model_crunchbase.joblib")
-    print("Loaded Crunchbase-trained meta model")
-elif os.path.exists("models/meta_model.joblib"):
-    model = joblib.load("models/meta_model.joblib")
-    print("Loaded original meta model")
-    
-if os.path.exists("models/valuation_model_crunchbase.joblib"):
-    valuation_model = joblib.load("models/valuation_model_crunchbase.joblib")
-    print("Loaded Crunchbase-trained valuation model")
-elif os.path.exists("models/valuation_model.joblib"):
-    valuation_model = joblib.load("models/valuation_model.joblib")
-    print("Loaded original valuation model")
+# Feature columns used by the models (same order as training)
+META_FEATURE_COLUMNS = [
+    'num_rounds', 'total_raised_usd', 'avg_round_size',
+    'team_strength_score', 'founder_count', 'avg_experience', 'exits_count',
+    'market_similarity', 'tech_similarity', 'revenue_synergy_score',
+    'cost_synergy_score', 'overall_synergy_score'
+]
+
+VALUATION_FEATURE_COLUMNS = META_FEATURE_COLUMNS + [
+    'revenue_ttm', 'revenue_growth_mom', 'gross_margin', 'ebitda_margin',
+    'revenue_multiple_proxy', 'valuation_proxy_current'
+]
+
+# Appended to the columns above for models trained with the LightGBM backend
+ROUND_TYPE_CODE_COLUMN = 'last_round_type_code'
+
+
+def _model_columns(model, columns: List[str]) -> List[str]:
+    """``columns``, plus the encoded last round type if ``model`` was trained with it."""
+    trained = getattr(model, 'feature_names_in_', None)
+    if trained is not None and list(trained) == columns + [ROUND_TYPE_CODE_COLUMN]:
+        return columns + [ROUND_TYPE_CODE_COLUMN]
+    return columns
+
+# Latency spans for every /predict stage and for the scoring endpoints, exported on /metrics
+stage_latency = Histogram("smart_acquirer_stage_seconds", "Latency of each scoring pipeline stage", "stage")
+request_latency = Histogram("smart_acquirer_request_seconds", "End-to-end latency of scoring endpoints", "endpoint")
 
 # Load reasoning agent
 reasoning_agent = ReasoningAgent()
@@ -78,111 +122,243 @@ decision_agent = DecisionScoreAgent()
 # Load business model agent
 business_model_agent = BusinessModelAgent()
 
-# Load team agent with enhanced features
-team_agent = TeamAgent()
+# Load team agent with enhanced features (its datasets load with the models)
+team_agent = TeamAgent(load_datasets=False)
 
+# Stateless agents are shared across requests
+funding_agent = FundingAgent()
+synergy_agent = SynergyAgent()
+valuation_agent = ValuationAgent()
+benchmark_agent = BenchmarkAgent()
+risk_agent = RiskAgent()
 
-@app.post("/predict")
-def predict(startup: StartupInput):
-    # Check if models are loaded
-    if model is None or valuation_model is None or reasoning_agent is None or decision_agent is None:
-        return {"error": "Models not loaded"}
-    
-    # Transform input data using agents
-    funding_features = FundingAgent().transform(startup.funding_json)
-    team_features = team_agent.transform(startup.team_json)
-    synergy_features = SynergyAgent().transform(startup.acquirer_json, startup.target_json)
-    valuation_features = ValuationAgent().transform(startup.financials_json)
-    business_model_features = business_model_agent.transform(startup.funding_json, startup.team_json, startup.financials_json)
-    
-    # Combine features for M&A prediction
-    mna_features = {**funding_features, **team_features, **synergy_features, **valuation_features}
-    
-    # Define the feature columns for M&A prediction (same as training)
-    meta_feature_columns = [
-        'num_rounds', 'total_raised_usd', 'avg_round_size',
-        'team_strength_score', 'founder_count', 'avg_experience', 'exits_count',
-        'market_similarity', 'tech_similarity', 'revenue_synergy_score',
-        'cost_synergy_score', 'overall_synergy_score'
-    ]
-    
-    # Create DataFrame with the features for M&A prediction
-    feature_values = [mna_features.get(col, 0) for col in meta_feature_columns]
-    df_mna = pd.DataFrame([feature_values], columns=meta_feature_columns)
-    
-    # Debug: Log the features being sent to the model
-    logger.info("M&A Features being sent to model:")
-    for i, col in enumerate(meta_feature_columns):
-        logger.info(f"  {col}: {feature_values[i]}")
-    
-    # Make M&A prediction
+# Set once the model registry has loaded the trained models
+model = None
+valuation_model = None
+inference_plan = None
+
+
+# "compiled" (default) scores the tree ensembles with the flat-array evaluator in
+# models/tree_engine.py (bit-identical, no per-tree dispatch); "library" uses
+# scikit-learn's and XGBoost's own predict.
+TREE_ENGINE = os.environ.get("PREDICT_TREE_ENGINE", "compiled")
+
+
+# Responses for repeated scenarios, keyed by the canonical request and the model fingerprint
+result_cache = ResultCache(
+    max_entries=int(os.environ.get("PREDICT_CACHE_SIZE", 4096)),
+    ttl_seconds=float(os.environ.get("PREDICT_CACHE_TTL_SECONDS", 3600))
+)
+
+
+def _on_models_loaded(registry: ModelRegistry) -> None:
+    """Publish the loaded models, compile the scoring path and invalidate cached results."""
+    global model, valuation_model, inference_plan
+    model = registry.get("meta_model")
+    valuation_model = registry.get("valuation_model")
+    if model is not None and valuation_model is not None:
+        try:
+            inference_plan = InferencePlan(
+                model, valuation_model, _model_columns(model, META_FEATURE_COLUMNS),
+                _model_columns(valuation_model, VALUATION_FEATURE_COLUMNS),
+                compile_trees=TREE_ENGINE == "compiled"
+            )
+        except ValueError as e:
+            logger.error(f"Could not build inference plan: {e}")
+    result_cache.reset(registry.fingerprint(["meta_model", "valuation_model"]) if inference_plan is not None else None)
+
+
+# Models, company datasets and VC evaluation data load in parallel.
+# "background" (default) serves liveness checks while loading; "eager" blocks
+# the import until everything is loaded, e.g. for gunicorn --preload so forked
+# workers share the loaded pages.
+MODEL_LOAD_MODE = os.environ.get("MODEL_LOAD_MODE", "background")
+# Seconds a scoring request waits for the models during warm-up
+MODEL_READY_TIMEOUT = float(os.environ.get("MODEL_READY_TIMEOUT", 60))
+
+# "full" (default) serves the trained meta model; "student" serves its distilled
+# student from train_models.py, a much smaller forest with near-identical scores
+META_MODEL_VARIANT = os.environ.get("META_MODEL_VARIANT", "full")
+
+model_registry = ModelRegistry(model_artifacts(META_MODEL_VARIANT),
+                               mmap_mode=os.environ.get("MODEL_MMAP_MODE") or None)
+model_registry.add_loader("company_index", team_agent.load_datasets)
+model_registry.add_loader("vc_evaluation_data", lambda: business_model_agent.business_model_data)
+model_registry.on_ready(_on_models_loaded)
+
+# Synergy screening over the company universe, built once the company datasets have loaded
+SCREEN_CHUNK_SIZE = int(os.environ.get("SCREEN_CHUNK_SIZE", 65536))
+SCREEN_THREADS = int(os.environ.get("SCREEN_THREADS", 1))
+SCREEN_MAX_K = 100
+synergy_screen = None
+
+
+def _on_companies_loaded(registry: ModelRegistry) -> None:
+    global synergy_screen
+    if team_agent.companies_df is not None:
+        synergy_screen = SynergyScreen.from_companies(team_agent.companies_df)
+        logger.info(f"Synergy screen covers {synergy_screen.size} companies")
+
+
+model_registry.on_ready(_on_companies_loaded)
+
+# Precomputed funding/team/valuation/business model features of known companies
+# (pipeline.process_datasets.build_company_snapshot), memory-mapped; empty disables it
+COMPANY_SNAPSHOT = os.environ.get("COMPANY_SNAPSHOT", COMPANY_SNAPSHOT_PATH)
+company_snapshot = None
+
+
+def _on_snapshot_loaded(registry: ModelRegistry) -> None:
+    global company_snapshot
+    company_snapshot = registry.get("company_snapshot")
+    if company_snapshot is not None:
+        logger.info(f"Company snapshot covers {company_snapshot.size} companies")
+
+
+if COMPANY_SNAPSHOT:
+    model_registry.add_loader("company_snapshot", lambda: CompanySnapshot.open(COMPANY_SNAPSHOT))
+    model_registry.on_ready(_on_snapshot_loaded)
+if MODEL_LOAD_MODE == "eager":
+    model_registry.load()
+else:
+    model_registry.start()
+
+
+# Scoring runs on a bounded pool so the event loop stays free for /health and static files
+inference_pool = InferencePool()
+# Seconds a client should wait before retrying a request rejected with 503
+RETRY_AFTER_SECONDS = 1
+
+
+# Fallbacks used when a model call fails
+DEFAULT_MNA_LIKELIHOOD = 0.5
+DEFAULT_VALUATION_FORECAST = 1000000
+
+
+class UnknownCompanyError(LookupError):
+    """A company reference that is not in the company snapshot."""
+
+
+def _snapshot_record(company: str) -> dict:
+    if company_snapshot is None:
+        raise UnknownCompanyError("Company snapshot not loaded")
+    with stage_latency.time("snapshot"):
+        record = company_snapshot.get(company)
+    if record is None:
+        raise UnknownCompanyError(f"Unknown company: {company}")
+    return record
+
+
+def _compute_agent_features(startup: StartupInput) -> dict:
+    """
+    Run the feature agents for a single startup.
+
+    For a company reference the funding, team, valuation and business model
+    features come from the company snapshot, leaving only the synergy agent.
+    """
+    if startup.company is not None:
+        record = startup._company_record or _snapshot_record(startup.company)
+        funding_features, team_features = record["funding"], record["team"]
+        valuation_features, business_model_features = record["valuation"], record["business_model"]
+        target_json = record["target"]
+    else:
+        with stage_latency.time("funding"):
+            funding_features = funding_agent.transform(startup.funding_json)
+        with stage_latency.time("team"):
+            team_features = team_agent.transform(startup.team_json)
+        with stage_latency.time("valuation"):
+            valuation_features = valuation_agent.transform(startup.financials_json)
+        with stage_latency.time("business_model"):
+            business_model_features = business_model_agent.transform(
+                startup.funding_json, startup.team_json, startup.financials_json
+            )
+        target_json = startup.target_json
+    with stage_latency.time("synergy"):
+        synergy_features = synergy_agent.transform(startup.acquirer_json, target_json)
+
+    # Combined features for M&A and valuation prediction
+    mna_features = dict(funding_features)
+    mna_features.update(team_features)
+    mna_features.update(synergy_features)
+    mna_features.update(valuation_features)
+    mna_features[ROUND_TYPE_CODE_COLUMN] = round_type_code(funding_features.get('last_round_type'))
+
+    return {
+        "funding": funding_features,
+        "team": team_features,
+        "synergy": synergy_features,
+        "valuation": valuation_features,
+        "business_model": business_model_features,
+        "mna": mna_features
+    }
+
+
+def _score_batch(mna_feature_dicts: list) -> tuple:
+    """
+    Score a batch of feature dicts with one model call per model.
+
+    Args:
+        mna_feature_dicts: List of combined funding/team/synergy/valuation features
+
+    Returns:
+        Tuple of (mna_likelihoods, valuation_forecasts) lists in input order
+    """
+    count = len(mna_feature_dicts)
+
+    # Make M&A predictions
     try:
-        mna_likelihood = model.predict_proba(df_mna)[0][1]  # Probability of positive class
-        logger.info(f"M&A likelihood from model: {mna_likelihood}")
+        with stage_latency.time("meta_matrix"):
+            meta_matrix = inference_plan.meta_matrix(mna_feature_dicts)
+        with stage_latency.time("predict_proba"):
+            mna_likelihoods = inference_plan.predict_mna(meta_matrix).tolist()
     except Exception as e:
         logger.error(f"Error in M&A prediction: {e}")
-        mna_likelihood = 0.5  # Default value if model fails
-    
-    # Define the feature columns for valuation prediction (same as training)
-    valuation_feature_columns = [
-        'num_rounds', 'total_raised_usd', 'avg_round_size',
-        'team_strength_score', 'founder_count', 'avg_experience', 'exits_count',
-        'market_similarity', 'tech_similarity', 'revenue_synergy_score',
-        'cost_synergy_score', 'overall_synergy_score',
-        'revenue_ttm', 'revenue_growth_mom', 'gross_margin', 'ebitda_margin',
-        'revenue_multiple_proxy', 'valuation_proxy_current'
-    ]
-    
-    # Create DataFrame with valuation features
-    valuation_feature_values = [mna_features.get(col, 0) for col in valuation_feature_columns]
-    df_valuation = pd.DataFrame([valuation_feature_values], columns=valuation_feature_columns)
-    
-    # Debug: Log some key valuation features
-    logger.info("Key Valuation Features:")
-    key_val_features = ['revenue_ttm', 'revenue_growth_mom', 'gross_margin']
-    for col in key_val_features:
-        idx = valuation_feature_columns.index(col)
-        logger.info(f"  {col}: {valuation_feature_values[idx]}")
-    
-    # Make valuation prediction
+        mna_likelihoods = [DEFAULT_MNA_LIKELIHOOD] * count
+
+    # Make valuation predictions
     try:
-        valuation_forecast = valuation_model.predict(df_valuation)[0]
-        logger.info(f"Valuation forecast from model: ${valuation_forecast:,.2f}")
+        with stage_latency.time("valuation_matrix"):
+            valuation_matrix = inference_plan.valuation_matrix(mna_feature_dicts)
+        with stage_latency.time("predict"):
+            valuation_forecasts = [float(v) for v in inference_plan.predict_valuation(valuation_matrix)]
     except Exception as e:
         logger.error(f"Error in valuation prediction: {e}")
-        valuation_forecast = 1000000  # Default value if model fails
-    
+        valuation_forecasts = [DEFAULT_VALUATION_FORECAST] * count
+
+    return mna_likelihoods, valuation_forecasts
+
+
+def _build_response(features: dict, mna_likelihood: float, valuation_forecast: float) -> dict:
+    """Run the decision-layer agents and assemble the /predict response."""
+    funding_features = features["funding"]
+    team_features = features["team"]
+    synergy_features = features["synergy"]
+    valuation_features = features["valuation"]
+    business_model_features = features["business_model"]
+
     # Combine all features for decision scoring and reasoning
-    combined_features = {
-        **funding_features,
-        **team_features,
-        **synergy_features,
-        **valuation_features,
-        **business_model_features
-    }
+    full_feature_dict = dict(features["mna"])
+    full_feature_dict.update(business_model_features)
     
     # Run BenchmarkAgent and RiskAgent
-    benchmark_features = BenchmarkAgent().transform(combined_features)
-    risk_features = RiskAgent().transform(combined_features)
+    with stage_latency.time("benchmark"):
+        benchmark_features = benchmark_agent.transform(full_feature_dict)
+    with stage_latency.time("risk"):
+        risk_features = risk_agent.transform(full_feature_dict)
     
     # Merge everything into full feature dict
-    full_feature_dict = {
-        **funding_features,
-        **team_features,
-        **synergy_features,
-        **valuation_features,
-        **business_model_features,
-        **benchmark_features,
-        **risk_features,
-        "mna_likelihood": float(mna_likelihood),
-        "valuation_forecast_usd": float(valuation_forecast)
-    }
+    full_feature_dict.update(benchmark_features)
+    full_feature_dict.update(risk_features)
+    full_feature_dict["mna_likelihood"] = float(mna_likelihood)
+    full_feature_dict["valuation_forecast_usd"] = float(valuation_forecast)
     
     # Compute decision score
-    decision_output = decision_agent.compute(full_feature_dict)
+    with stage_latency.time("decision"):
+        decision_output = decision_agent.compute(full_feature_dict)
     
     # Get explanation from reasoning agent
-    explanation = reasoning_agent.explain(full_feature_dict)
+    with stage_latency.time("reasoning"):
+        explanation = reasoning_agent.explain(full_feature_dict)
     
     # Get business model insights
     business_model_insights = business_model_agent.get_insights()
@@ -218,9 +394,220 @@ def predict(startup: StartupInput):
     }
 
 
+def _models_ready() -> bool:
+    return not (inference_plan is None or reasoning_agent is None or decision_agent is None)
+
+
+async def _wait_for_models() -> bool:
+    """Wait (off the event loop) for the registry to finish loading, then check the models."""
+    if not model_registry.ready.is_set():
+        await asyncio.get_running_loop().run_in_executor(None, model_registry.wait, MODEL_READY_TIMEOUT)
+    return _models_ready()
+
+
+def _predict_one(startup: StartupInput) -> dict:
+    """Score a single startup; runs on the inference pool."""
+    # Transform input data using agents
+    features = _compute_agent_features(startup)
+    mna_features = features["mna"]
+    
+    # Debug: Log the features being sent to the model
+    logger.debug("M&A Features being sent to model:")
+    for col in META_FEATURE_COLUMNS:
+        logger.debug(f"  {col}: {mna_features.get(col, 0)}")
+    
+    # Debug: Log some key valuation features
+    logger.debug("Key Valuation Features:")
+    for col in ['revenue_ttm', 'revenue_growth_mom', 'gross_margin']:
+        logger.debug(f"  {col}: {mna_features.get(col, 0)}")
+    
+    mna_likelihoods, valuation_forecasts = _score_batch([mna_features])
+    mna_likelihood, valuation_forecast = mna_likelihoods[0], valuation_forecasts[0]
+    logger.debug(f"M&A likelihood from model: {mna_likelihood}")
+    logger.debug(f"Valuation forecast from model: ${valuation_forecast:,.2f}")
+    
+    return _build_response(features, mna_likelihood, valuation_forecast)
+
+
+def _capacity_exhausted(e: InferencePoolFull) -> HTTPException:
+    logger.warning(f"Rejecting scoring request: {e}")
+    return HTTPException(
+        status_code=503,
+        detail="Scoring capacity exhausted, retry shortly",
+        headers={"Retry-After": str(RETRY_AFTER_SECONDS)}
+    )
+
+
+def _timed_queue_wait(func):
+    """Wrap ``func`` so the time it spends queued for a pool thread is recorded."""
+    submitted = time.perf_counter()
+
+    def run(*args):
+        stage_latency.observe("queue_wait", time.perf_counter() - submitted)
+        return func(*args)
+    return run
+
+
+async def _run_on_pool(func, *args):
+    """Run scoring work on the inference pool, answering 503 when it is saturated."""
+    try:
+        return await inference_pool.run(_timed_queue_wait(func), *args)
+    except InferencePoolFull as e:
+        raise _capacity_exhausted(e)
+
+
+@app.post("/predict")
+async def predict(startup: StartupInput):
+    with request_latency.time("/predict"):
+        # Check if models are loaded
+        if not await _wait_for_models():
+            return {"error": "Models not loaded"}
+
+        # Repeated scenarios are served from the result cache
+        cache_key = None
+        if result_cache.enabled:
+            with stage_latency.time("cache_lookup"):
+                cache_key = scenario_key(startup.model_dump(), result_cache.model_fingerprint)
+                cached = result_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        # A company reference must be in the snapshot
+        if startup.company is not None:
+            try:
+                startup._company_record = _snapshot_record(startup.company)
+            except UnknownCompanyError as e:
+                raise HTTPException(status_code=404, detail=str(e))
+
+        if micro_batcher is None:
+            result = await _run_on_pool(_predict_one, startup)
+        else:
+            try:
+                result = await micro_batcher.submit(startup)
+            except InferencePoolFull as e:
+                raise _capacity_exhausted(e)
+
+        if cache_key is not None:
+            result_cache.put(cache_key, result)
+        return result
+
+
+def _predict_many(items: List[StartupInput]) -> dict:
+    """Score a batch of startups; runs on the inference pool."""
+    results = [None] * len(items)
+
+    # Run the feature agents for every item, keeping failures separate
+    scored_indices = []
+    scored_features = []
+    for index, startup in enumerate(items):
+        try:
+            scored_features.append(_compute_agent_features(startup))
+            scored_indices.append(index)
+        except Exception as e:
+            logger.error(f"Error computing features for batch item {index}: {e}")
+            results[index] = {"index": index, "error": f"Error computing features: {e}"}
+
+    # One model call per model for the whole batch
+    if scored_features:
+        mna_likelihoods, valuation_forecasts = _score_batch([f["mna"] for f in scored_features])
+    else:
+        mna_likelihoods, valuation_forecasts = [], []
+
+    for index, features, mna_likelihood, valuation_forecast in zip(
+        scored_indices, scored_features, mna_likelihoods, valuation_forecasts
+    ):
+        try:
+            results[index] = {"index": index, "result": _build_response(features, mna_likelihood, valuation_forecast)}
+        except Exception as e:
+            logger.error(f"Error building response for batch item {index}: {e}")
+            results[index] = {"index": index, "error": f"Error building response: {e}"}
+
+    error_count = sum(1 for item in results if "error" in item)
+    logger.info(f"Scored batch of {len(results)} startups ({error_count} errors)")
+
+    return {
+        "count": len(results),
+        "error_count": error_count,
+        "results": results
+    }
+
+
+class ItemScoringError(Exception):
+    """A single item of a micro-batch could not be scored."""
+
+
+def _score_micro_batch(items: List[StartupInput]) -> list:
+    """Score requests coalesced by the micro-batcher, one outcome per item."""
+    return [
+        item["result"] if "result" in item else ItemScoringError(item["error"])
+        for item in _predict_many(items)["results"]
+    ]
+
+
+# Optional micro-batching: concurrent /predict calls share one model call per model
+MICRO_BATCH_ENABLED = os.environ.get("PREDICT_MICRO_BATCH", "").lower() in ("1", "true", "yes")
+MICRO_BATCH_MAX_ITEMS = int(os.environ.get("PREDICT_BATCH_MAX_ITEMS", 32))
+MICRO_BATCH_MAX_WAIT_MS = float(os.environ.get("PREDICT_BATCH_MAX_WAIT_MS", 5))
+
+micro_batcher = None
+if MICRO_BATCH_ENABLED:
+    micro_batcher = MicroBatcher(
+        _score_micro_batch,
+        lambda func, *args: inference_pool.run(_timed_queue_wait(func), *args),
+        max_items=MICRO_BATCH_MAX_ITEMS,
+        max_wait_ms=MICRO_BATCH_MAX_WAIT_MS,
+        max_pending=inference_pool.max_in_flight * MICRO_BATCH_MAX_ITEMS
+    )
+    logger.info(f"Micro-batching enabled: {micro_batcher.stats()}")
+
+
+@app.post("/predict/batch")
+async def predict_batch(batch: BatchStartupInput):
+    """
+    Score many startups in one request.
+
+    Every agent runs per item, but each model is called once on the stacked
+    feature matrix. Results come back in input order; an item that fails is
+    reported as an error in its own slot without affecting the others.
+    """
+    with request_latency.time("/predict/batch"):
+        if not await _wait_for_models():
+            return {"error": "Models not loaded"}
+
+        return await _run_on_pool(_predict_many, batch.items)
+
+
+@app.post("/screen")
+async def screen_targets(request: ScreenInput):
+    """
+    Top-K acquisition candidates for one acquirer by overall synergy.
+
+    Scores the acquirer against every company in the universe with the
+    SynergyAgent formulas, in bounded chunks on the inference pool.
+    """
+    with request_latency.time("/screen"):
+        if not await _wait_for_models() or synergy_screen is None:
+            return {"error": "Company universe not loaded"}
+        if not 1 <= request.k <= SCREEN_MAX_K:
+            raise HTTPException(status_code=422, detail=f"k must be between 1 and {SCREEN_MAX_K}")
+
+        def run():
+            with stage_latency.time("screen"):
+                return synergy_screen.top_k(
+                    request.acquirer, k=request.k, chunk_size=SCREEN_CHUNK_SIZE, n_jobs=SCREEN_THREADS,
+                    exclude=[request.exclude_id] if request.exclude_id else ()
+                )
+
+        try:
+            candidates = await _run_on_pool(run)
+        except ValueError as e:
+            raise HTTPException(status_code=422, detail=str(e))
+        return {"universe_size": synergy_screen.size, "candidates": candidates}
+
+
 @app.get("/health")
 def health_check():
-    """Health check endpoint"""
+    """Liveness check: answers as soon as the process is up, even while models load"""
     models_loaded = {
         "meta_model": model is not None,
         "valuation_model": valuation_model is not None,
@@ -232,10 +619,79 @@ def health_check():
     
     return {
         "status": "healthy",
-        "models_loaded": models_loaded
+        "ready": model_registry.ready.is_set() and _models_ready(),
+        "models_loaded": models_loaded,
+        "tree_engine": inference_plan.compiled if inference_plan is not None else None,
+        "inference_pool": inference_pool.stats(),
+        "micro_batcher": micro_batcher.stats() if micro_batcher is not None else None,
+        "result_cache": result_cache.stats(),
+        "company_snapshot": company_snapshot.size if company_snapshot is not None else None
     }
 
 
+@app.get("/ready")
+def readiness_check():
+    """Readiness check: 503 until the models are loaded and the scoring path is compiled"""
+    registry_status = model_registry.status()
+    if model_registry.ready.is_set() and _models_ready():
+        return {"status": "ready", "model_registry": registry_status}
+    return JSONResponse(
+        status_code=503,
+        content={"status": "loading" if registry_status["loading"] else "unavailable", "model_registry": registry_status}
+    )
+
+
+def _render_metrics() -> str:
+    """Prometheus text exposition of latency histograms and cache, queue and model-load counters."""
+    lines = stage_latency.render() + request_latency.render()
+
+    cache = result_cache.stats()
+    for key, metric_type, documentation in (
+        ("hits", "counter", "Result cache hits"),
+        ("misses", "counter", "Result cache misses"),
+        ("evictions", "counter", "Result cache LRU evictions"),
+        ("expirations", "counter", "Result cache TTL expirations"),
+        ("invalidations", "counter", "Result cache invalidations after a model change")
+    ):
+        lines += render_metric(f"smart_acquirer_cache_{key}_total", metric_type, documentation, [(None, cache[key])])
+    lines += render_metric("smart_acquirer_cache_entries", "gauge", "Responses held in the result cache",
+                           [(None, cache["entries"])])
+
+    pool = inference_pool.stats()
+    lines += render_metric("smart_acquirer_inference_in_flight", "gauge",
+                           "Scoring requests running or queued on the inference pool", [(None, pool["in_flight"])])
+    lines += render_metric("smart_acquirer_inference_max_in_flight", "gauge",
+                           "Admission limit of the inference pool", [(None, pool["max_in_flight"])])
+    lines += render_metric("smart_acquirer_inference_rejected_total", "counter",
+                           "Scoring requests rejected with 503", [(None, pool["rejected"])])
+
+    if micro_batcher is not None:
+        batcher = micro_batcher.stats()
+        lines += render_metric("smart_acquirer_micro_batches_total", "counter", "Micro-batches dispatched",
+                               [(None, batcher["batches"])])
+        lines += render_metric("smart_acquirer_micro_batch_items_total", "counter", "Requests scored in micro-batches",
+                               [(None, batcher["items"])])
+        lines += render_metric("smart_acquirer_micro_batch_pending", "gauge", "Requests waiting for a micro-batch",
+                               [(None, batcher["pending"])])
+
+    registry = model_registry.status()
+    lines += render_metric("smart_acquirer_models_ready", "gauge", "1 once the models are loaded",
+                           [(None, registry["ready"] and _models_ready())])
+    lines += render_metric("smart_acquirer_model_startup_seconds", "gauge", "Time taken by the model registry to load",
+                           [(None, registry["startup_seconds"])])
+    lines += render_metric("smart_acquirer_model_load_seconds", "gauge", "Load time of each startup item",
+                           [({"item": name}, item["seconds"]) for name, item in registry["items"].items()])
+    lines += render_metric("smart_acquirer_model_load_failed", "gauge", "1 if a startup item failed to load",
+                           [({"item": name}, item["error"] is not None) for name, item in registry["items"].items()])
+    return "\n".join(lines) + "\n"
+
+
+@app.get("/metrics")
+def metrics():
+    """Prometheus metrics: per-stage latency histograms plus cache, queue and model-load counters"""
+    return PlainTextResponse(_render_metrics(), media_type="text/plain; version=0.0.4")
+
+
 @app.get("/competitors/{company_name}")
 def get_competitors(company_name: str, industry: str = None):
     """Get competitors for a company"""
@@ -0,0 +1,68 @@
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+
+
+class InferencePoolFull(Exception):
+    """Raised when the inference pool already has its maximum number of requests in flight."""
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.environ.get(name)
+    return int(value) if value else default
+
+
+class InferencePool:
+    """
+    Bounded thread pool for CPU-bound scoring work.
+
+    Async endpoints hand their feature building and model calls to this pool
+    so the event loop stays free for ``/health`` and static assets. The pool
+    admits at most ``max_in_flight`` requests (running plus queued); beyond
+    that ``run`` raises InferencePoolFull straight away instead of letting
+    the queue and the latency grow without bound.
+
+    The in-flight counter is only touched from the event loop thread, so it
+    needs no lock.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, max_in_flight: Optional[int] = None):
+        self.max_workers = max_workers or _env_int("PREDICT_WORKERS", min(4, os.cpu_count() or 1))
+        self.max_in_flight = max_in_flight or _env_int("PREDICT_MAX_IN_FLIGHT", self.max_workers * 8)
+        self.in_flight = 0
+        self.rejected = 0
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="inference")
+
+    @property
+    def saturated(self) -> bool:
+        return self.in_flight >= self.max_in_flight
+
+    async def run(self, func: Callable, *args):
+        """
+        Run ``func(*args)`` on the pool and wait for its result.
+
+        Raises:
+            InferencePoolFull: If ``max_in_flight`` requests are already admitted
+        """
+        if self.saturated:
+            self.rejected += 1
+            raise InferencePoolFull(f"{self.in_flight} scoring requests in flight (limit {self.max_in_flight})")
+
+        self.in_flight += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, func, *args)
+        finally:
+            self.in_flight -= 1
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.max_workers,
+            "max_in_flight": self.max_in_flight,
+            "in_flight": self.in_flight,
+            "rejected": self.rejected
+        }
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,35 @@
+from typing import Any, Callable
+
+from fastapi.routing import APIRoute
+from starlette.requests import Request
+
+from models import json_codec
+
+
+class JSONCodecRequest(Request):
+    """Request whose JSON body is decoded by ``json_codec`` (orjson when installed)."""
+
+    async def json(self) -> Any:
+        if not hasattr(self, "_json"):
+            # orjson.JSONDecodeError subclasses json.JSONDecodeError, so
+            # FastAPI still answers malformed bodies with a 422
+            self._json = json_codec.loads(await self.body())
+        return self._json
+
+
+class JSONCodecRoute(APIRoute):
+    """
+    Route class that decodes request bodies with ``json_codec``.
+
+    Set as ``app.router.route_class`` before the routes are declared; the
+    /predict payloads are then parsed by the same pluggable decoder as the
+    pipeline's payload columns.
+    """
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+
+        async def route_handler(request: Request):
+            return await handler(JSONCodecRequest(request.scope, request.receive))
+
+        return route_handler
@@ -0,0 +1,115 @@
+import bisect
+import math
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Latency buckets in seconds, from 50us agent transforms up to multi-second batches
+DEFAULT_BUCKETS = (
+    0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005,
+    0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0
+)
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    if isinstance(value, int):
+        return str(value)
+    return repr(float(value))
+
+
+def _escape_label(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape_label(value)}"' for key, value in labels.items()) + "}"
+
+
+class _Timer:
+    __slots__ = ("histogram", "label", "start")
+
+    def __init__(self, histogram: 'Histogram', label: str):
+        self.histogram = histogram
+        self.label = label
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.histogram.observe(self.label, time.perf_counter() - self.start)
+        return False
+
+
+class Histogram:
+    """
+    Latency histogram with one label, rendered in Prometheus text format.
+
+    ``observe`` is a bisect and three additions under a lock, cheap enough to
+    wrap every agent call of every request.
+    """
+
+    def __init__(self, name: str, documentation: str, label_name: str, buckets: Iterable[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.label_name = label_name
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[str, List] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, label: str, seconds: float) -> None:
+        index = bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            series = self._series.get(label)
+            if series is None:
+                series = self._series[label] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += seconds
+            series[2] += 1
+
+    def time(self, label: str) -> _Timer:
+        """Context manager that observes the duration of its block under ``label``."""
+        return _Timer(self, label)
+
+    def snapshot(self) -> Dict[str, Tuple[List[int], float, int]]:
+        """Per-label (bucket counts, sum, count); bucket counts are not cumulative."""
+        with self._lock:
+            return {label: (list(counts), total, count) for label, (counts, total, count) in self._series.items()}
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        for label, (counts, total, count) in sorted(self.snapshot().items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (math.inf,), counts):
+                cumulative += bucket_count
+                labels = _format_labels({self.label_name: label, "le": _format_value(bound)})
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels({self.label_name: label})
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+def render_metric(name: str, metric_type: str, documentation: str,
+                  samples: Iterable[Tuple[Optional[Dict[str, str]], float]]) -> List[str]:
+    """
+    Prometheus text lines for a counter or gauge.
+
+    Args:
+        name: Metric name
+        metric_type: "counter" or "gauge"
+        documentation: HELP text
+        samples: (labels or None, value) pairs
+    """
+    lines = [f"# HELP {name} {documentation}", f"# TYPE {name} {metric_type}"]
+    for labels, value in samples:
+        if value is None:
+            continue
+        lines.append(f"{name}{_format_labels(labels or {})} {_format_value(value)}")
+    return lines
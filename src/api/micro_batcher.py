@@ -0,0 +1,110 @@
+import asyncio
+from typing import Any, Awaitable, Callable, List, Optional
+
+from api.inference_pool import InferencePoolFull
+
+
+class _PendingBatch:
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self.loop = loop
+        self.items: List[Any] = []
+        self.futures: List[asyncio.Future] = []
+        self.timer: Optional[asyncio.TimerHandle] = None
+        self.flushed = False
+
+
+class MicroBatcher:
+    """
+    Coalesces concurrent single-item requests into one batched call.
+
+    ``submit`` adds an item to the open batch and waits for its own result.
+    A batch is dispatched once it holds ``max_items`` items, or ``max_wait_ms``
+    after its first item arrived, whichever comes first. At most that long is
+    added to any request's latency. The whole batch goes through
+    ``process_batch`` in one call, via ``runner``. ``process_batch`` must
+    return one outcome per item, in order. An outcome that is an exception
+    is raised in that item's caller only.
+
+    ``max_pending`` bounds the items waiting or being scored. Past it
+    ``submit`` raises InferencePoolFull, as the pool itself does.
+    """
+
+    def __init__(self, process_batch: Callable[[list], list], runner: Callable[..., Awaitable[list]],
+                 max_items: int = 32, max_wait_ms: float = 5.0, max_pending: int = 1024):
+        self.process_batch = process_batch
+        self.runner = runner
+        self.max_items = max_items
+        self.max_wait = max_wait_ms / 1000.0
+        self.max_pending = max_pending
+        self.pending = 0
+        self.batches = 0
+        self.items = 0
+        self.rejected = 0
+        self._open: Optional[_PendingBatch] = None
+        self._running = set()
+
+    async def submit(self, item):
+        """
+        Queue ``item`` for the next batch and wait for its outcome.
+
+        Raises:
+            InferencePoolFull: If ``max_pending`` items are already waiting
+        """
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            raise InferencePoolFull(f"{self.pending} items waiting for a batch (limit {self.max_pending})")
+
+        loop = asyncio.get_running_loop()
+        batch = self._open
+        if batch is None or batch.loop is not loop:
+            batch = _PendingBatch(loop)
+            batch.timer = loop.call_later(self.max_wait, self._flush, batch)
+            self._open = batch
+
+        future = loop.create_future()
+        batch.items.append(item)
+        batch.futures.append(future)
+        self.pending += 1
+        if len(batch.items) >= self.max_items:
+            self._flush(batch)
+        return await future
+
+    def _flush(self, batch: _PendingBatch) -> None:
+        if batch.flushed:
+            return
+        batch.flushed = True
+        batch.timer.cancel()
+        if self._open is batch:
+            self._open = None
+        task = batch.loop.create_task(self._run(batch))
+        self._running.add(task)
+        task.add_done_callback(self._running.discard)
+
+    async def _run(self, batch: _PendingBatch) -> None:
+        try:
+            outcomes = await self.runner(self.process_batch, batch.items)
+        except Exception as e:
+            outcomes = [e] * len(batch.items)
+        finally:
+            self.pending -= len(batch.items)
+
+        self.batches += 1
+        self.items += len(batch.items)
+        for future, outcome in zip(batch.futures, outcomes):
+            if future.done():
+                continue
+            if isinstance(outcome, BaseException):
+                future.set_exception(outcome)
+            else:
+                future.set_result(outcome)
+
+    def stats(self) -> dict:
+        return {
+            "max_items": self.max_items,
+            "max_wait_ms": self.max_wait * 1000.0,
+            "pending": self.pending,
+            "batches": self.batches,
+            "items": self.items,
+            "mean_batch_size": self.items / self.batches if self.batches else 0.0,
+            "rejected": self.rejected
+        }
@@ -0,0 +1,195 @@
+import hashlib
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+import joblib
+
+from models.tree_engine import TreeEnsembleEvaluator
+
+logger = logging.getLogger(__name__)
+
+# Model artifacts in order of preference: Crunchbase-trained first, then the original models.
+# The ``.trees.npz`` exports (``python -m src.models.tree_engine``) load with NumPy alone, for
+# scoring images that ship without scikit-learn and XGBoost.
+MODEL_ARTIFACTS: Dict[str, List[str]] = {
+    "meta_model": [
+        "models/meta_model_crunchbase.joblib", "models/meta_model.joblib",
+        "models/meta_model_crunchbase.trees.npz", "models/meta_model.trees.npz"
+    ],
+    "valuation_model": [
+        "models/valuation_model_crunchbase.joblib", "models/valuation_model.joblib",
+        "models/valuation_model_crunchbase.trees.npz", "models/valuation_model.trees.npz"
+    ]
+}
+
+
+# Distilled student of the Crunchbase meta model (``distill_meta_model``), served instead of
+# the full forest when ``model_artifacts(meta_variant="student")`` is used
+META_STUDENT_ARTIFACTS = [
+    "models/meta_model_crunchbase.student.joblib", "models/meta_model_crunchbase.student.trees.npz"
+]
+
+
+def model_artifacts(meta_variant: str = "full") -> Dict[str, List[str]]:
+    """
+    ``MODEL_ARTIFACTS`` for the given meta model variant.
+
+    Args:
+        meta_variant: "full" for the trained forest, or "student" to prefer its
+            distilled student, falling back to the full model if there is none
+
+    Returns:
+        Artifact name -> candidate paths
+    """
+    if meta_variant not in ("full", "student"):
+        raise ValueError(f"Unknown meta model variant: {meta_variant}")
+    artifacts = {name: list(candidates) for name, candidates in MODEL_ARTIFACTS.items()}
+    if meta_variant == "student":
+        artifacts["meta_model"] = META_STUDENT_ARTIFACTS + artifacts["meta_model"]
+    return artifacts
+
+
+def _file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ModelRegistry:
+    """
+    Loads the API's model artifacts and other startup data in parallel.
+
+    Every registered loader runs on its own thread, so artifact
+    deserialization and dataset reads overlap instead of running one after
+    another at import time. ``start`` returns immediately. The ``ready``
+    event is set once every loader has finished and the ``on_ready``
+    callbacks have run, which lets the API answer liveness checks while it
+    is still warming up.
+
+    ``mmap_mode`` is passed to ``joblib.load``. Large NumPy arrays in an
+    uncompressed artifact are then memory-mapped from the page cache instead
+    of being copied into each worker process.
+    """
+
+    def __init__(self, artifacts: Optional[Dict[str, List[str]]] = None, mmap_mode: Optional[str] = None):
+        self.mmap_mode = mmap_mode
+        self._loaders: Dict[str, Callable[[], Any]] = {}
+        self._on_ready: List[Callable[['ModelRegistry'], None]] = []
+        self._objects: Dict[str, Any] = {}
+        self._status: Dict[str, dict] = {}
+        self._thread: Optional[threading.Thread] = None
+        self.ready = threading.Event()
+        self.started_at: Optional[float] = None
+        self.startup_seconds: Optional[float] = None
+
+        for name, candidates in (artifacts or {}).items():
+            self.add_artifact(name, candidates)
+
+    def add_artifact(self, name: str, candidates: List[str]) -> None:
+        """Register a joblib artifact, loaded from the first of ``candidates`` that exists."""
+        self._loaders[name] = lambda: self._load_artifact(name, candidates)
+
+    def add_loader(self, name: str, loader: Callable[[], Any]) -> None:
+        """Register any other startup work, e.g. reading a dataset."""
+        self._loaders[name] = loader
+
+    def on_ready(self, callback: Callable[['ModelRegistry'], None]) -> None:
+        """Run ``callback(registry)`` once everything has loaded, before ``ready`` is set."""
+        self._on_ready.append(callback)
+
+    def _load_artifact(self, name: str, candidates: List[str]):
+        for path in candidates:
+            if os.path.exists(path):
+                try:
+                    if path.endswith(".npz"):
+                        artifact = TreeEnsembleEvaluator.load(path)
+                    else:
+                        artifact = joblib.load(path, mmap_mode=self.mmap_mode)
+                except ImportError as e:
+                    # The library that pickled this artifact is not installed; try the next one
+                    logger.warning(f"Skipping {path} for {name}: {e}")
+                    continue
+                self._status[name]["path"] = path
+                self._status[name]["sha256"] = _file_sha256(path)
+                logger.info(f"Loaded {name} from {path}")
+                return artifact
+        logger.warning(f"No artifact found for {name} (tried {', '.join(candidates)})")
+        return None
+
+    def _run_loader(self, name: str, loader: Callable[[], Any]) -> None:
+        start = time.perf_counter()
+        try:
+            self._objects[name] = loader()
+        except Exception as e:
+            logger.error(f"Could not load {name}: {e}")
+            self._objects[name] = None
+            self._status[name]["error"] = str(e)
+        self._status[name]["seconds"] = round(time.perf_counter() - start, 4)
+
+    def _load_all(self) -> None:
+        for name in self._loaders:
+            self._status[name] = {"path": None, "seconds": None, "error": None}
+        with ThreadPoolExecutor(max_workers=max(len(self._loaders), 1), thread_name_prefix="model-load") as executor:
+            for name, loader in self._loaders.items():
+                executor.submit(self._run_loader, name, loader)
+
+        for callback in self._on_ready:
+            try:
+                callback(self)
+            except Exception as e:
+                logger.error(f"Model registry ready callback failed: {e}")
+
+        self.startup_seconds = time.perf_counter() - self.started_at
+        logger.info(f"Model registry loaded {len(self._loaders)} items in {self.startup_seconds:.2f}s")
+        self.ready.set()
+
+    def start(self) -> None:
+        """Begin loading on a background thread; returns immediately."""
+        if self._thread is not None:
+            return
+        self.started_at = time.perf_counter()
+        self._thread = threading.Thread(target=self._load_all, name="model-registry", daemon=True)
+        self._thread.start()
+
+    def load(self) -> None:
+        """Load everything and wait for it (for preloading before workers fork)."""
+        self.start()
+        self.ready.wait()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until loading has finished; False if ``timeout`` expired first."""
+        return self.ready.wait(timeout)
+
+    def get(self, name: str) -> Any:
+        """A loaded object, or None while loading or if it failed to load."""
+        return self._objects.get(name)
+
+    def fingerprint(self, names: List[str]) -> Optional[str]:
+        """
+        Content hash identifying the loaded versions of the named artifacts.
+
+        Returns:
+            Hex digest, or None if any of them is not loaded
+        """
+        digest = hashlib.sha256()
+        for name in names:
+            sha256 = self._status.get(name, {}).get("sha256")
+            if sha256 is None or self._objects.get(name) is None:
+                return None
+            digest.update(f"{name}={sha256};".encode("utf-8"))
+        return digest.hexdigest()
+
+    def status(self) -> dict:
+        return {
+            "ready": self.ready.is_set(),
+            "loading": self._thread is not None and not self.ready.is_set(),
+            "startup_seconds": round(self.startup_seconds, 4) if self.startup_seconds is not None else None,
+            "mmap_mode": self.mmap_mode,
+            "items": {name: dict(status) for name, status in self._status.items()}
+        }
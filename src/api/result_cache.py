@@ -0,0 +1,128 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+# Request fields that make up a scoring scenario; "company" references a snapshot company
+SCENARIO_FIELDS = ("funding_json", "team_json", "acquirer_json", "target_json", "financials_json", "company")
+
+
+def _canonical_amount(amount):
+    """Round amounts as FundingAgent and BusinessModelAgent read them ("$500,000" -> 500000.0)."""
+    if isinstance(amount, str):
+        return float(''.join(filter(str.isdigit, amount)) or '0')
+    if isinstance(amount, (int, float)) and not isinstance(amount, bool):
+        return float(amount)
+    return amount
+
+
+def canonical_scenario(payload: dict) -> str:
+    """
+    Canonical JSON text of a scoring request.
+
+    Keys are sorted and round amounts are normalized the way the agents parse
+    them, so requests that differ only in key order or in how an amount is
+    written ("500000", "$500,000", 500000) map to the same text. Everything
+    else is kept as-is: other agents distinguish values such as 5 and 5.0.
+    """
+    scenario = {field: payload.get(field) for field in SCENARIO_FIELDS}
+    funding = scenario.get("funding_json")
+    if isinstance(funding, dict) and isinstance(funding.get("rounds"), list):
+        funding = dict(funding)
+        funding["rounds"] = [
+            dict(round_info, amount=_canonical_amount(round_info["amount"]))
+            if isinstance(round_info, dict) and "amount" in round_info else round_info
+            for round_info in funding["rounds"]
+        ]
+        scenario["funding_json"] = funding
+    return json.dumps(scenario, sort_keys=True, separators=(",", ":"), default=str)
+
+
+def scenario_key(payload: dict, model_fingerprint: str) -> str:
+    """Cache key for a request: hash of the model fingerprint and the canonical scenario."""
+    digest = hashlib.sha256(model_fingerprint.encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(canonical_scenario(payload).encode("utf-8"))
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """
+    Thread-safe LRU cache with a time-to-live for /predict responses.
+
+    Entries are evicted least-recently-used once ``max_entries`` is reached,
+    and they expire ``ttl_seconds`` after they were stored. ``reset`` clears
+    the cache whenever a different model is loaded. Values are stored and
+    returned as-is, so treat them as read-only.
+    """
+
+    def __init__(self, max_entries: int = 4096, ttl_seconds: Optional[float] = 3600.0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.model_fingerprint: Optional[str] = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 and self.model_fingerprint is not None
+
+    def get(self, key: str) -> Optional[Any]:
+        """The cached value for ``key``, or None on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            stored_at, value = entry
+            if self.ttl_seconds is not None and time.monotonic() - stored_at > self.ttl_seconds:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return value
+
+    def put(self, key: str, value: Any) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def reset(self, model_fingerprint: Optional[str]) -> None:
+        """Drop every entry if the model fingerprint changed."""
+        with self._lock:
+            if model_fingerprint == self.model_fingerprint:
+                return
+            if self._entries:
+                self.invalidations += 1
+            self._entries.clear()
+            self.model_fingerprint = model_fingerprint
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+            "model_fingerprint": self.model_fingerprint
+        }
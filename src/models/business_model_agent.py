@@ -1,8 +1,9 @@
 import json
 import pandas as pd
-import os
 from typing import Dict, Any
 
+from .reasoning_agent import load_vc_evaluation_data
+
 
 class BusinessModelAgent:
     def __init__(self):
@@ -10,27 +11,34 @@ class BusinessModelAgent:
         Initialize BusinessModelAgent with no arguments.
         This agent evaluates startup business models using insights from the VC evaluation dataset.
         """
-        # Load the VC evaluation dataset
-        self._load_vc_data()
-    
+        # The VC evaluation dataset is loaded on first use
+        self._vc_data = None
+        self._business_model_data = None
+
+    @property
+    def vc_data(self) -> pd.DataFrame:
+        if self._vc_data is None:
+            self._load_vc_data()
+        return self._vc_data
+
+    @property
+    def business_model_data(self) -> pd.DataFrame:
+        if self._business_model_data is None:
+            self._load_vc_data()
+        return self._business_model_data
+
     def _load_vc_data(self):
-        """Load the VC evaluation dataset"""
+        """Load the VC evaluation dataset (shared with ReasoningAgent)"""
         try:
-            # Check if the dataset files exist in the project root
-            csv_path = os.path.join(os.path.dirname(__file__), '..', '..', 'enhanced_training_data.csv')
-            if os.path.exists(csv_path):
-                self.vc_data = pd.read_csv(csv_path)
-                # Filter for business model related evaluations
-                self.business_model_data = self.vc_data[
-                    self.vc_data['evaluation_aspect'] == 'business_model'
-                ]
-            else:
-                self.vc_data = pd.DataFrame()
-                self.business_model_data = pd.DataFrame()
+            vc_data = load_vc_evaluation_data()
+            # Filter for business model related evaluations
+            business_model_data = vc_data[vc_data['evaluation_aspect'] == 'business_model']
         except Exception as e:
             print(f"Warning: Could not load VC evaluation data: {e}")
-            self.vc_data = pd.DataFrame()
-            self.business_model_data = pd.DataFrame()
+            vc_data = pd.DataFrame()
+            business_model_data = pd.DataFrame()
+        self._vc_data = vc_data
+        self._business_model_data = business_model_data
     
     def transform(self, funding_json: dict, team_json: dict, financials_json: dict) -> dict:
         """
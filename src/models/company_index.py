@@ -0,0 +1,232 @@
+import bisect
+import itertools
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+
+def normalize_name(name) -> Optional[str]:
+    """Lower-case, whitespace-collapsed company name (None for missing names)."""
+    if not isinstance(name, str):
+        return None
+    return " ".join(name.lower().split())
+
+
+def _trigrams(text: str) -> set:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class CompanyIndex:
+    """
+    In-memory lookup structures over the whole company universe.
+
+    Built once from the objects and acquisitions tables, it answers the
+    competitor and acquisition-target queries without scanning the tables:
+
+    - trigram postings over lower-cased names for substring matches
+    - normalized-name postings and a sorted name list for exact/prefix lookups
+    - ``category_code`` postings
+    - an ``acquiring_object_id -> acquisitions`` adjacency map
+
+    Postings hold row positions in file order, so results come back in the
+    same order as a filter over the original DataFrame.
+    """
+
+    def __init__(self, companies_df: pd.DataFrame, acquisitions_df: Optional[pd.DataFrame] = None):
+        companies_df = companies_df.reset_index(drop=True)
+        self.size = len(companies_df)
+        self._columns = {column: companies_df[column].to_numpy(dtype=object) for column in companies_df.columns}
+        self._names_lower = [name.lower() if isinstance(name, str) else None for name in self._columns['name']]
+
+        # Trigram postings for substring search
+        trigram_lists: Dict[str, List[int]] = {}
+        for position, name in enumerate(self._names_lower):
+            if name:
+                for trigram in _trigrams(name):
+                    trigram_lists.setdefault(trigram, []).append(position)
+        self._trigram_postings = {trigram: np.asarray(positions, dtype=np.int64)
+                                  for trigram, positions in trigram_lists.items()}
+
+        # Normalized-name postings and a sorted list for prefix search
+        self._name_postings: Dict[str, List[int]] = {}
+        for position, name in enumerate(self._columns['name']):
+            normalized = normalize_name(name)
+            if normalized:
+                self._name_postings.setdefault(normalized, []).append(position)
+        self._sorted_names = sorted(self._name_postings)
+
+        # Category postings
+        self._category_postings: Dict[str, np.ndarray] = {}
+        if 'category_code' in self._columns:
+            codes = pd.Series(self._columns['category_code'])
+            for category, positions in codes.groupby(codes, sort=False).indices.items():
+                self._category_postings[category] = np.sort(positions)
+
+        # Company id -> first row position
+        self._id_to_position: Dict[str, int] = {}
+        for position, company_id in enumerate(self._columns['id']):
+            self._id_to_position.setdefault(company_id, position)
+
+        # acquiring_object_id -> acquisition rows, in file order
+        self._acquisitions: Dict[str, List[dict]] = {}
+        if acquisitions_df is not None and 'acquiring_object_id' in acquisitions_df.columns:
+            for acquisition in acquisitions_df.to_dict('records'):
+                self._acquisitions.setdefault(acquisition['acquiring_object_id'], []).append(acquisition)
+
+    def _value(self, column: str, position: int, default=''):
+        values = self._columns.get(column)
+        return default if values is None else values[position]
+
+    def _contains(self, position: int, query: str) -> bool:
+        name = self._names_lower[position]
+        return name is not None and query in name
+
+    def find_containing(self, query: str, limit: Optional[int] = None) -> List[int]:
+        """
+        Row positions whose name contains ``query`` (case-insensitive), in file order.
+
+        Args:
+            query: Substring to look for
+            limit: Stop after this many matches
+
+        Returns:
+            List of row positions
+        """
+        query = query.lower()
+        matches = []
+        if len(query) < 3:
+            # Too short for trigrams; short queries match early in the list
+            candidate_chunks = [range(self.size)]
+        else:
+            postings = []
+            for trigram in _trigrams(query):
+                posting = self._trigram_postings.get(trigram)
+                if posting is None:
+                    return []
+                postings.append(posting)
+            postings.sort(key=len)
+            candidate_chunks = self._intersect_chunks(postings[0], postings[1:])
+
+        for chunk in candidate_chunks:
+            for position in chunk:
+                if self._contains(position, query):
+                    matches.append(position)
+                    if limit is not None and len(matches) >= limit:
+                        return matches
+        return matches
+
+    @staticmethod
+    def _intersect_chunks(rarest: np.ndarray, others: List[np.ndarray], chunk_size: int = 256):
+        """
+        Lazily intersect sorted postings, one chunk of the rarest list at a time.
+
+        Membership in the other postings is a binary search per element, so an
+        early-exit query only pays for the chunks it actually inspects.
+        """
+        for start in range(0, len(rarest), chunk_size):
+            chunk = rarest[start:start + chunk_size]
+            for posting in others:
+                slots = np.minimum(np.searchsorted(posting, chunk), len(posting) - 1)
+                chunk = chunk[posting[slots] == chunk]
+                if len(chunk) == 0:
+                    break
+            yield chunk.tolist()
+
+    def lookup(self, name: str) -> List[int]:
+        """Row positions whose normalized name equals ``name``'s."""
+        return list(self._name_postings.get(normalize_name(name) or '', []))
+
+    def search_prefix(self, prefix: str, limit: int = 10) -> List[int]:
+        """Row positions of companies whose normalized name starts with ``prefix``."""
+        prefix = normalize_name(prefix) or ''
+        results = []
+        start = bisect.bisect_left(self._sorted_names, prefix)
+        for name in itertools.islice(self._sorted_names, start, None):
+            if not name.startswith(prefix):
+                break
+            results.extend(self._name_postings[name])
+            if len(results) >= limit:
+                break
+        return results[:limit]
+
+    def position_of(self, company_id) -> Optional[int]:
+        """Row position of a company id, or None if unknown."""
+        return self._id_to_position.get(company_id)
+
+    def company(self, position: int) -> dict:
+        """All indexed columns of one company as a dict."""
+        return {column: values[position] for column, values in self._columns.items()}
+
+    def find_competitors(self, company_name: str, industry: str = None, limit: int = 10) -> list:
+        """
+        Companies (optionally in ``industry``) whose name does not contain ``company_name``.
+
+        Returns:
+            Up to ``limit`` competitor dicts, in file order
+        """
+        query = company_name.lower()
+        if industry:
+            candidates = self._category_postings.get(industry)
+            if candidates is None:
+                return []
+        else:
+            candidates = range(self.size)
+
+        result = []
+        for position in candidates:
+            if self._contains(position, query):
+                continue
+
+            funding_total = self._value('funding_total_usd', position, 0)
+            if pd.isna(funding_total) or np.isinf(funding_total):
+                funding_total = 0.0
+            else:
+                funding_total = float(funding_total)
+
+            result.append({
+                'name': self._columns['name'][position],
+                'permalink': self._columns['permalink'][position],
+                'domain': self._value('domain', position),
+                'funding_total_usd': funding_total,
+                'category_code': self._value('category_code', position)
+            })
+            if len(result) >= limit:
+                break
+        return result
+
+    def find_acquisition_targets(self, acquirer_name: str, limit: int = 10) -> list:
+        """
+        Past acquisitions of the first company whose name contains ``acquirer_name``.
+
+        Returns:
+            Up to ``limit`` target dicts, in file order
+        """
+        acquirer_matches = self.find_containing(acquirer_name, limit=1)
+        if not acquirer_matches:
+            return []
+
+        acquirer_id = self._columns['id'][acquirer_matches[0]]
+        targets = []
+        for acquisition in self._acquisitions.get(acquirer_id, [])[:limit]:
+            position = self._id_to_position.get(acquisition['acquired_object_id'])
+            if position is None:
+                continue
+
+            # Handle NaN values for price_amount
+            price_amount = acquisition.get('price_amount', 0)
+            if pd.isna(price_amount) or np.isinf(price_amount):
+                price_amount = 0.0
+            else:
+                price_amount = float(price_amount)
+
+            targets.append({
+                'name': self._columns['name'][position],
+                'permalink': self._columns['permalink'][position],
+                'domain': self._value('domain', position),
+                'price_amount': price_amount,
+                'price_currency_code': acquisition.get('price_currency_code', 'USD'),
+                'acquired_at': acquisition.get('acquired_at', ''),
+                'category_code': self._value('category_code', position)
+            })
+        return targets
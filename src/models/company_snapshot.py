@@ -0,0 +1,151 @@
+"""
+Memory-mapped snapshot of precomputed per-company agent outputs.
+
+For a known company the funding, team, valuation and business model
+features depend only on the company's own payloads, so they can be computed
+once offline and looked up at predict time. A snapshot is a directory of
+flat files that are memory-mapped rather than read, so opening one is
+instant and forked API workers share its pages:
+
+- ``records.bin``: one JSON record per company, back to back
+- ``offsets.npy``: int64 byte offset of every record, plus the end offset
+- ``key_hashes.npy``: sorted 64-bit hashes of every company id and permalink
+- ``key_rows.npy``: record number of each hash
+- ``manifest.json``: record count and agent versions
+
+A lookup is one binary search over the hashes followed by decoding a single
+record; hash collisions are resolved by comparing the keys in the record.
+"""
+import hashlib
+import json
+import mmap
+import os
+import shutil
+import time
+from typing import Iterable, List, Optional
+
+import numpy as np
+
+from . import json_codec
+
+COMPANY_SNAPSHOT_PATH = os.path.join("data", "processed", "company_snapshot")
+MANIFEST_FILE = "manifest.json"
+# Record fields a company can be looked up by
+KEY_FIELDS = ("id", "permalink")
+
+
+def key_hash(key: str) -> int:
+    """Stable 64-bit hash of a key (the first 8 bytes of its BLAKE2b digest)."""
+    return int.from_bytes(hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def _record_keys(record: dict) -> List[str]:
+    return [record[field] for field in KEY_FIELDS if isinstance(record.get(field), str)]
+
+
+def write_company_snapshot(path: str, records: Iterable[dict], manifest: Optional[dict] = None) -> int:
+    """
+    Write a snapshot directory from per-company records.
+
+    The files are written to ``path + ".tmp"`` and moved into place once
+    complete, so a reader never sees a half-written snapshot.
+
+    Args:
+        path: Snapshot directory to create or replace
+        records: Dicts with ``id`` and optionally ``permalink`` plus the precomputed outputs
+        manifest: Extra fields for manifest.json, e.g. agent versions
+
+    Returns:
+        Number of records written
+
+    Raises:
+        ValueError: If a record holds NaN or infinity
+    """
+    tmp_path = path + ".tmp"
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    os.makedirs(tmp_path)
+
+    offsets = [0]
+    keys, rows = [], []
+    with open(os.path.join(tmp_path, "records.bin"), "wb") as f:
+        for row, record in enumerate(records):
+            # NaN is not valid JSON and would fail to encode in the /predict response
+            data = json.dumps(record, separators=(",", ":"), allow_nan=False).encode("utf-8")
+            f.write(data)
+            offsets.append(offsets[-1] + len(data))
+            for key in _record_keys(record):
+                keys.append(key)
+                rows.append(row)
+
+    hashes = np.asarray([key_hash(key) for key in keys], dtype=np.uint64)
+    order = np.argsort(hashes, kind="stable")
+    np.save(os.path.join(tmp_path, "offsets.npy"), np.asarray(offsets, dtype=np.int64))
+    np.save(os.path.join(tmp_path, "key_hashes.npy"), hashes[order])
+    np.save(os.path.join(tmp_path, "key_rows.npy"), np.asarray(rows, dtype=np.int64)[order])
+    with open(os.path.join(tmp_path, MANIFEST_FILE), "w", encoding="utf-8") as f:
+        json.dump({**(manifest or {}), "records": len(offsets) - 1, "created_at": time.time()}, f, indent=2)
+
+    if os.path.exists(path):
+        shutil.rmtree(path)
+    os.replace(tmp_path, path)
+    return len(offsets) - 1
+
+
+class CompanySnapshot:
+    """
+    Read-only view of a snapshot written by ``write_company_snapshot``.
+
+    Args:
+        path: Snapshot directory
+    """
+
+    def __init__(self, path: str = COMPANY_SNAPSHOT_PATH):
+        self.path = path
+        with open(os.path.join(path, MANIFEST_FILE), "r", encoding="utf-8") as f:
+            self.manifest = json.load(f)
+        # Plain ndarray views of the mapped files: indexing an np.memmap is several times slower
+        self._offsets = np.load(os.path.join(path, "offsets.npy"), mmap_mode="r").view(np.ndarray)
+        self._hashes = np.load(os.path.join(path, "key_hashes.npy"), mmap_mode="r").view(np.ndarray)
+        self._rows = np.load(os.path.join(path, "key_rows.npy"), mmap_mode="r").view(np.ndarray)
+        with open(os.path.join(path, "records.bin"), "rb") as f:
+            # An empty file cannot be mapped
+            self._records = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if os.fstat(f.fileno()).st_size else b""
+
+    @classmethod
+    def open(cls, path: str = COMPANY_SNAPSHOT_PATH) -> Optional['CompanySnapshot']:
+        """The snapshot at ``path``, or None if none has been built."""
+        if not os.path.exists(os.path.join(path, MANIFEST_FILE)):
+            return None
+        return cls(path)
+
+    @property
+    def size(self) -> int:
+        """Number of companies in the snapshot."""
+        return len(self._offsets) - 1
+
+    def record(self, row: int) -> dict:
+        """The record at position ``row``."""
+        start, end = self._offsets[row:row + 2].tolist()
+        return json_codec.loads(self._records[start:end])
+
+    def get(self, key: str) -> Optional[dict]:
+        """
+        The record of a company.
+
+        Args:
+            key: Company id (e.g. "c:1234") or permalink (e.g. "/company/acme")
+
+        Returns:
+            The record, or None if the company is not in the snapshot
+        """
+        target = key_hash(key)
+        position = int(self._hashes.searchsorted(np.uint64(target)))
+        while position < len(self._hashes) and int(self._hashes[position]) == target:
+            record = self.record(int(self._rows[position]))
+            if key in _record_keys(record):
+                return record
+            position += 1
+        return None
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key) is not None
@@ -0,0 +1,231 @@
+import hashlib
+import json
+import os
+import tempfile
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+# pyarrow is optional: without it datasets are parsed from CSV on every load
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+except ImportError:
+    pa = None
+    feather = None
+
+DATASETS_DIR = "datasets"
+CACHE_DIR = os.path.join("data", "cache")
+MANIFEST_FILE = "manifest.json"
+LFS_POINTER_HEADER = b"version https://git-lfs.github.com/spec/v1"
+
+# Column types for the Crunchbase CSVs. Columns missing from a file are ignored.
+DATASET_SCHEMAS: Dict[str, Dict[str, List[str]]] = {
+    'objects': {
+        'categorical': ['entity_type', 'category_code', 'status', 'country_code', 'state_code', 'region'],
+        'dates': ['founded_at', 'closed_at']
+    },
+    'funding_rounds': {
+        'categorical': ['funding_round_type', 'funding_round_code', 'raised_currency_code'],
+        'dates': ['funded_at']
+    },
+    'acquisitions': {
+        'categorical': ['term_code', 'price_currency_code'],
+        'dates': []
+    },
+    'investments': {'categorical': [], 'dates': []},
+    'ipos': {'categorical': ['raised_currency_code', 'stock_symbol'], 'dates': ['public_at']},
+    'funds': {'categorical': ['raised_currency_code'], 'dates': ['funded_at']},
+    'milestones': {'categorical': [], 'dates': ['milestone_at']},
+    'offices': {'categorical': ['country_code', 'state_code', 'region'], 'dates': []},
+    'people': {'categorical': [], 'dates': []},
+    'degrees': {'categorical': ['degree_type'], 'dates': ['graduated_at']},
+    'relationships': {'categorical': [], 'dates': ['start_at', 'end_at']}
+}
+
+
+def lfs_pointer_oid(path: str) -> Optional[str]:
+    """
+    Return the sha256 recorded in a Git LFS pointer file.
+
+    Args:
+        path: File to inspect
+
+    Returns:
+        The hex digest if ``path`` is an LFS pointer, otherwise None
+    """
+    with open(path, "rb") as f:
+        head = f.read(200)
+    if not head.startswith(LFS_POINTER_HEADER):
+        return None
+    for line in head.decode("ascii", errors="ignore").splitlines():
+        if line.startswith("oid sha256:"):
+            return line.split(":", 1)[1].strip()
+    return None
+
+
+def _read_manifest(cache_dir: str) -> dict:
+    try:
+        with open(os.path.join(cache_dir, MANIFEST_FILE), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _temp_file(directory: str, prefix: str) -> str:
+    """A new, uniquely named temporary file in ``directory``, so concurrent writers never share one."""
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=prefix + ".", suffix=".tmp")
+    os.close(fd)
+    return tmp_path
+
+
+def _write_manifest(cache_dir: str, manifest: dict) -> None:
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp_path = _temp_file(cache_dir, MANIFEST_FILE)
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, os.path.join(cache_dir, MANIFEST_FILE))
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def source_sha256(csv_path: str, cache_dir: str = CACHE_DIR) -> str:
+    """
+    Content hash of a dataset CSV, matching the oid in its LFS pointer.
+
+    The digest is remembered in the cache manifest together with the file's
+    size and mtime, so an unchanged file is only hashed once.
+
+    Args:
+        csv_path: Path to the CSV file
+        cache_dir: Directory holding the cache manifest
+
+    Returns:
+        Hex sha256 digest of the file contents
+    """
+    stat = os.stat(csv_path)
+    key = os.path.abspath(csv_path)
+    manifest = _read_manifest(cache_dir)
+    entry = manifest.get(key)
+    if entry and entry.get("size") == stat.st_size and entry.get("mtime_ns") == stat.st_mtime_ns:
+        return entry["sha256"]
+
+    digest = hashlib.sha256()
+    with open(csv_path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    sha256 = digest.hexdigest()
+
+    manifest[key] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": sha256}
+    _write_manifest(cache_dir, manifest)
+    return sha256
+
+
+def _apply_schema(df: pd.DataFrame, name: str) -> pd.DataFrame:
+    """Convert the categorical and date columns listed in DATASET_SCHEMAS."""
+    schema = DATASET_SCHEMAS.get(name, {})
+    for column in schema.get('categorical', []):
+        if column in df.columns:
+            df[column] = df[column].astype('category')
+    for column in schema.get('dates', []):
+        if column in df.columns:
+            df[column] = pd.to_datetime(df[column], errors='coerce', format='ISO8601')
+    return df
+
+
+def _csv_path(name: str, datasets_dir: str) -> str:
+    path = os.path.join(datasets_dir, f"{name}.csv")
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Dataset not found: {path}")
+    if lfs_pointer_oid(path) is not None:
+        raise FileNotFoundError(f"{path} is a Git LFS pointer; run 'git lfs pull' to fetch the data")
+    return path
+
+
+def cache_path(name: str, datasets_dir: str = DATASETS_DIR, cache_dir: str = CACHE_DIR) -> str:
+    """Path of the columnar cache file for a dataset's current contents."""
+    sha256 = source_sha256(_csv_path(name, datasets_dir), cache_dir)
+    return os.path.join(cache_dir, f"{name}-{sha256[:16]}.feather")
+
+
+def build_cache(name: str, datasets_dir: str = DATASETS_DIR, cache_dir: str = CACHE_DIR) -> str:
+    """
+    Convert a dataset CSV into a typed Feather file, once per CSV version.
+
+    Args:
+        name: Dataset name (CSV file name without extension)
+        datasets_dir: Directory with the source CSVs
+        cache_dir: Directory for the cache files
+
+    Returns:
+        Path to the cache file
+    """
+    if feather is None:
+        raise ImportError("pyarrow is required to build the dataset cache")
+
+    path = cache_path(name, datasets_dir, cache_dir)
+    if os.path.exists(path):
+        return path
+
+    print(f"Building dataset cache for {name}...")
+    df = _apply_schema(pd.read_csv(_csv_path(name, datasets_dir), low_memory=False), name)
+
+    # Write atomically through a temporary file of this writer's own, so concurrent
+    # builds of the same version just replace each other's identical output.
+    # Uncompressed so that readers can memory-map the columns.
+    tmp_path = _temp_file(cache_dir, os.path.basename(path))
+    try:
+        feather.write_feather(df, tmp_path, compression="uncompressed")
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+    # Drop caches of older versions of the same dataset
+    for old_file in os.listdir(cache_dir):
+        if old_file.startswith(f"{name}-") and old_file.endswith(".feather") and old_file != os.path.basename(path):
+            try:
+                os.remove(os.path.join(cache_dir, old_file))
+            except FileNotFoundError:
+                pass  # Removed by a concurrent build
+    return path
+
+
+def load_dataset(name: str, columns: Optional[List[str]] = None, nrows: Optional[int] = None,
+                 datasets_dir: str = DATASETS_DIR, cache_dir: str = CACHE_DIR) -> pd.DataFrame:
+    """
+    Load a Crunchbase dataset with typed columns.
+
+    With pyarrow installed the CSV is converted once into a Feather cache keyed
+    by the CSV's sha256 and then opened memory-mapped, reading only the
+    requested columns. Without pyarrow the CSV is parsed directly.
+
+    Args:
+        name: Dataset name, e.g. "objects" for datasets/objects.csv
+        columns: Columns to load (None for all)
+        nrows: Only return the first N rows
+        datasets_dir: Directory with the source CSVs
+        cache_dir: Directory for the cache files
+
+    Returns:
+        DataFrame with categorical and datetime columns per DATASET_SCHEMAS
+    """
+    if feather is None:
+        df = pd.read_csv(_csv_path(name, datasets_dir), usecols=columns, nrows=nrows, low_memory=False)
+        return _apply_schema(df, name)
+
+    table = feather.read_table(build_cache(name, datasets_dir, cache_dir), columns=columns, memory_map=True)
+    if nrows is not None:
+        table = table.slice(0, nrows)
+    return table.to_pandas()
+
+
+if __name__ == "__main__":
+    # Build the cache for every dataset that has been fetched from LFS
+    for dataset_name in DATASET_SCHEMAS:
+        try:
+            print(f"{dataset_name}: {build_cache(dataset_name)}")
+        except (FileNotFoundError, ImportError) as e:
+            print(f"{dataset_name}: skipped ({e})")
@@ -1,14 +1,56 @@
-import json
 from typing import Dict, Any, Union
 
+import numpy as np
+import pandas as pd
+
+from . import json_codec
+from .vector_ops import as_records, segment_sum
+
+
+# Vocabulary of last_round_type for models that take it as a categorical feature.
+# Types are matched case-insensitively with spaces or underscores read as dashes,
+# and later series ("Series D", "series-e") count as series-c+.
+ROUND_TYPES = [
+    'none', 'pre-seed', 'angel', 'seed', 'convertible', 'crowdfunding', 'grant', 'series-a', 'series-b',
+    'series-c+', 'venture', 'private-equity', 'debt-financing', 'post-ipo', 'other'
+]
+_ROUND_TYPE_CODES = {round_type: float(code) for code, round_type in enumerate(ROUND_TYPES)}
+
+
+def round_type_code(round_type: Any) -> float:
+    """
+    Position of ``round_type`` in ``ROUND_TYPES``, or NaN for unknown types.
+
+    Args:
+        round_type: A last_round_type value, e.g. "Series A" or "series-a"
+
+    Returns:
+        The category code as a float, NaN if the type is not in the vocabulary
+    """
+    if not isinstance(round_type, str):
+        return np.nan
+    name = round_type.strip().lower().replace(' ', '-').replace('_', '-')
+    if name.startswith('series-') and len(name) == 8 and 'c' <= name[-1] <= 'z':
+        name = 'series-c+'
+    return _ROUND_TYPE_CODES.get(name, np.nan)
+
+
+def round_type_codes(round_types) -> np.ndarray:
+    """``round_type_code`` for every value of a column."""
+    round_types = pd.Series(round_types, dtype=object)
+    codes = {value: round_type_code(value) for value in round_types.dropna().unique()}
+    return round_types.map(codes).to_numpy(dtype=np.float64, na_value=np.nan)
+
 
 class FundingAgent:
+    FEATURE_VERSION = 1
+
     def __init__(self):
         pass
     
     def transform(self, funding_json: Union[str, Dict[str, Any]]) -> Dict[str, Any]:
         if isinstance(funding_json, str):
-            funding_data = json.loads(funding_json)
+            funding_data = json_codec.loads(funding_json)
         else:
             funding_data = funding_json
             
@@ -36,6 +78,59 @@ class FundingAgent:
             'last_round_type': last_round_type
         }
     
+    def transform_batch(self, funding_column) -> pd.DataFrame:
+        """
+        Columnar version of ``transform`` for many startups at once.
+
+        Args:
+            funding_column: Column (Series, list or Arrow array) of funding dicts
+                or JSON strings
+
+        Returns:
+            DataFrame with one row per valid input, indexed like the input.
+            Rows that ``transform`` would reject are dropped.
+        """
+        index, records = as_records(funding_column)
+
+        # Flatten the rounds into one array with a row id per round
+        valid_rows = []
+        num_rounds = []
+        last_round_types = []
+        round_row_ids = []
+        round_amounts = []
+        for position, funding_data in enumerate(records):
+            try:
+                rounds = funding_data.get('rounds', [])
+                amounts = []
+                for round_info in rounds:
+                    amount = round_info.get('amount', 0)
+                    if isinstance(amount, str):
+                        amount = ''.join(filter(str.isdigit, amount)) or '0'
+                    amounts.append(float(amount))
+                last_round_type = rounds[-1].get('type', 'Unknown') if rounds else "None"
+                row_count = len(rounds)
+            except Exception:
+                continue
+
+            row_id = len(valid_rows)
+            valid_rows.append(position)
+            num_rounds.append(row_count)
+            last_round_types.append(last_round_type)
+            round_row_ids.extend([row_id] * len(amounts))
+            round_amounts.extend(amounts)
+
+        num_rounds = np.asarray(num_rounds, dtype=np.int64)
+        total_raised_usd = segment_sum(np.asarray(round_row_ids, dtype=np.int64), round_amounts, len(valid_rows))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            avg_round_size = np.where(num_rounds == 0, 0.0, total_raised_usd / np.maximum(num_rounds, 1))
+
+        return pd.DataFrame({
+            'num_rounds': num_rounds,
+            'total_raised_usd': total_raised_usd,
+            'avg_round_size': avg_round_size,
+            'last_round_type': last_round_types
+        }, index=index[valid_rows])
+    
     @classmethod
     def load(cls) -> 'FundingAgent':
         return cls()
\ No newline at end of file
@@ -0,0 +1,153 @@
+import copy
+import logging
+import threading
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+from .tree_engine import TreeEnsembleEvaluator, compile_model
+
+logger = logging.getLogger(__name__)
+
+
+class _LightGBMBooster:
+    """
+    Scores a fitted LightGBM estimator through its ``Booster``.
+
+    The sklearn wrapper validates the input and its feature names on every
+    call; the booster takes the matrix as it is. Predictions run on the
+    estimator's ``n_jobs`` threads rather than the ones it was trained with.
+    """
+
+    def __init__(self, model):
+        self.model = model
+        self.booster = model.booster_
+        n_jobs = model.get_params().get('n_jobs')
+        self.num_threads = n_jobs if n_jobs and n_jobs > 0 else 0
+        self.classes_ = getattr(model, 'classes_', None)
+
+    def predict_proba(self, X) -> np.ndarray:
+        positive = self.booster.predict(X, num_threads=self.num_threads)
+        return np.column_stack([1.0 - positive, positive])
+
+    def predict(self, X) -> np.ndarray:
+        return self.booster.predict(X, num_threads=self.num_threads)
+
+
+def _without_feature_name_check(model):
+    """
+    Shallow copy of a fitted sklearn estimator that accepts plain arrays.
+
+    Estimators fitted on DataFrames warn on every call that gets an ndarray.
+    The column order is validated once when the plan is built, so the copy
+    drops ``feature_names_in_`` and skips that per-call check. The fitted
+    trees are shared with the original model. LightGBM estimators are scored
+    through their booster instead.
+    """
+    if hasattr(model, 'booster_') and type(model).__module__.startswith('lightgbm'):
+        return _LightGBMBooster(model)
+    if 'feature_names_in_' not in getattr(model, '__dict__', {}):
+        return model
+    model = copy.copy(model)
+    del model.feature_names_in_
+    return model
+
+
+def _compiled(model, label: str):
+    """The flat-array evaluator for ``model``, or the model itself if it cannot be compiled."""
+    try:
+        return compile_model(model)
+    except (ValueError, AttributeError, ImportError) as e:
+        logger.warning(f"Scoring the {label} with its own predict path: {e}")
+        return _without_feature_name_check(model)
+
+
+class InferencePlan:
+    """
+    Precompiled scoring path for the meta and valuation models.
+
+    Built once when the models are loaded: the feature column order is checked
+    against each model's ``feature_names_in_``, and every thread gets its own
+    preallocated input buffers, so a request only copies its feature values
+    into a NumPy row and calls the models.
+
+    With ``compile_trees``, the tree ensembles are scored by the flat-array
+    evaluator in ``tree_engine``, which gives bit-identical results without
+    scikit-learn's per-tree dispatch. Models that are already exported
+    evaluators are always scored that way.
+    """
+
+    def __init__(self, meta_model, valuation_model, meta_columns: Sequence[str], valuation_columns: Sequence[str],
+                 compile_trees: bool = False):
+        self.meta_columns = self._validate_columns(meta_model, meta_columns, "meta model")
+        self.valuation_columns = self._validate_columns(valuation_model, valuation_columns, "valuation model")
+        self.meta_model = meta_model
+        self.valuation_model = valuation_model
+        if compile_trees:
+            self._meta_estimator = _compiled(meta_model, "meta model")
+            self._valuation_estimator = _compiled(valuation_model, "valuation model")
+        else:
+            self._meta_estimator = _without_feature_name_check(meta_model)
+            self._valuation_estimator = _without_feature_name_check(valuation_model)
+        self._buffers = threading.local()
+
+    @property
+    def compiled(self) -> dict:
+        """Which models are scored by the flat-array evaluator."""
+        return {
+            "meta_model": isinstance(self._meta_estimator, TreeEnsembleEvaluator),
+            "valuation_model": isinstance(self._valuation_estimator, TreeEnsembleEvaluator)
+        }
+
+    @staticmethod
+    def _validate_columns(model, columns: Sequence[str], label: str) -> List[str]:
+        """Check ``columns`` against the order the model was trained with."""
+        columns = list(columns)
+        trained = getattr(model, 'feature_names_in_', None)
+        if trained is not None and list(trained) != columns:
+            raise ValueError(
+                f"{label} was trained on columns {list(trained)}, but the plan expects {columns}"
+            )
+        n_features = getattr(model, 'n_features_in_', None)
+        if n_features is not None and n_features != len(columns):
+            raise ValueError(f"{label} expects {n_features} features, but the plan has {len(columns)}")
+        return columns
+
+    def _row_buffers(self) -> Tuple[np.ndarray, np.ndarray]:
+        buffers = getattr(self._buffers, 'rows', None)
+        if buffers is None:
+            buffers = (
+                np.zeros((1, len(self.meta_columns)), dtype=np.float64),
+                np.zeros((1, len(self.valuation_columns)), dtype=np.float64)
+            )
+            self._buffers.rows = buffers
+        return buffers
+
+    def _fill(self, matrix: np.ndarray, feature_dicts: Sequence[dict], columns: List[str]) -> np.ndarray:
+        for row, features in enumerate(feature_dicts):
+            matrix[row] = [features.get(column, 0) for column in columns]
+        return matrix
+
+    def meta_matrix(self, feature_dicts: Sequence[dict]) -> np.ndarray:
+        """Feature matrix for the meta model, in its trained column order."""
+        if len(feature_dicts) == 1:
+            matrix = self._row_buffers()[0]
+        else:
+            matrix = np.empty((len(feature_dicts), len(self.meta_columns)), dtype=np.float64)
+        return self._fill(matrix, feature_dicts, self.meta_columns)
+
+    def valuation_matrix(self, feature_dicts: Sequence[dict]) -> np.ndarray:
+        """Feature matrix for the valuation model, in its trained column order."""
+        if len(feature_dicts) == 1:
+            matrix = self._row_buffers()[1]
+        else:
+            matrix = np.empty((len(feature_dicts), len(self.valuation_columns)), dtype=np.float64)
+        return self._fill(matrix, feature_dicts, self.valuation_columns)
+
+    def predict_mna(self, matrix: np.ndarray) -> np.ndarray:
+        """Positive-class probabilities from the meta model."""
+        return self._meta_estimator.predict_proba(matrix)[:, 1]
+
+    def predict_valuation(self, matrix: np.ndarray) -> np.ndarray:
+        """Valuation forecasts from the valuation model."""
+        return self._valuation_estimator.predict(matrix)
@@ -0,0 +1,149 @@
+"""
+Pluggable JSON decoding for the *_json payload columns.
+
+``loads`` and ``loads_column`` use orjson when it is installed and fall back
+to the standard library otherwise. Set ``JSON_DECODER=json`` to force the
+standard library. Cells orjson rejects but the standard library accepts
+(``NaN`` and ``Infinity`` literals, which ``json.dumps`` writes for missing
+amounts) are retried with the standard library, so the backends decode the
+payloads identically. The one difference is that orjson reads integers
+beyond 64 bits as floats, which no payload field holds.
+
+``to_typed_column``/``from_typed_column`` store parsed payloads as nested
+Arrow columns (e.g. a list-of-struct for funding rounds and founders), so
+raw datasets can be saved once and never re-parsed.
+"""
+import json
+import os
+from typing import Any, Callable, List, Optional
+
+# orjson is optional: without it every payload is decoded by the standard library
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# pyarrow is optional: without it payloads can only be stored as JSON strings
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+DECODERS = ("auto", "orjson", "json")
+
+
+def _orjson_loads(text):
+    try:
+        return orjson.loads(text)
+    except orjson.JSONDecodeError:
+        # NaN/Infinity literals are valid for the standard library
+        return json.loads(text)
+
+
+def get_decoder(name: Optional[str] = None) -> Callable[[Any], Any]:
+    """
+    The ``loads`` function of a decoder backend.
+
+    Args:
+        name: "auto" (orjson if installed), "orjson" or "json"; defaults to
+            the JSON_DECODER environment variable
+
+    Returns:
+        Function taking str or bytes and raising ValueError on invalid JSON
+    """
+    name = name or os.environ.get("JSON_DECODER", "auto")
+    if name not in DECODERS:
+        raise ValueError(f"Unknown JSON decoder {name!r}, expected one of {', '.join(DECODERS)}")
+    if name == "orjson" and orjson is None:
+        raise ImportError("orjson is not installed")
+    if name == "json" or orjson is None:
+        return json.loads
+    return _orjson_loads
+
+
+loads = get_decoder()
+
+
+def decoder_name() -> str:
+    return "orjson" if loads is _orjson_loads else "json"
+
+
+def loads_column(values: List[Any]) -> List[Any]:
+    """
+    Decode a whole column of payload cells in one call.
+
+    Strings and bytes are parsed; cells that are not valid JSON become None.
+    Anything else (already-parsed dicts, NaN for empty CSV cells) is
+    returned unchanged.
+    """
+    decode = loads
+    records = []
+    append = records.append
+    for value in values:
+        if isinstance(value, (str, bytes)):
+            try:
+                value = decode(value)
+            except ValueError:
+                value = None
+        append(value)
+    return records
+
+
+def _canonical(value) -> str:
+    return json.dumps(value, sort_keys=True, default=str)
+
+
+def _without_nulls(value):
+    """Drop the None fields Arrow fills in for keys a struct row did not have."""
+    if isinstance(value, dict):
+        return {key: _without_nulls(item) for key, item in value.items() if item is not None}
+    if isinstance(value, list):
+        return [_without_nulls(item) for item in value]
+    return value
+
+
+def _has_nulls(array) -> bool:
+    """Whether an Arrow array or any of its nested children holds a null."""
+    if isinstance(array, pa.ChunkedArray):
+        return any(_has_nulls(chunk) for chunk in array.chunks)
+    if array.null_count:
+        return True
+    if pa.types.is_struct(array.type):
+        return any(_has_nulls(array.field(i)) for i in range(array.type.num_fields))
+    if pa.types.is_list(array.type) or pa.types.is_large_list(array.type):
+        return _has_nulls(array.flatten())
+    return False
+
+
+def from_typed_column(column) -> List[Any]:
+    """Python payloads from a column written by ``to_typed_column``."""
+    values = column.to_pylist()
+    if not _has_nulls(column):
+        # Every row had every field, so there are no filled-in nulls to drop
+        return values
+    return [_without_nulls(value) for value in values]
+
+
+def to_typed_column(records: List[Any]):
+    """
+    Nested Arrow array for a column of parsed payloads, or None.
+
+    The types are inferred from the payloads, e.g. ``funding_json`` becomes
+    ``struct<rounds: list<struct<type: string, amount: double, date: string>>>``.
+    None is returned when the payloads cannot be stored faithfully: when
+    Arrow cannot type them (mixed types in one field), or when reading them
+    back would not give identical payloads (an int widened to float, an
+    explicit null). The column then stays JSON text.
+    """
+    if pa is None:
+        raise ImportError("pyarrow is required for typed payload columns")
+    if any(not isinstance(record, dict) for record in records):
+        return None
+    try:
+        array = pa.array(records)
+    except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+        return None
+    restored = from_typed_column(array)
+    if any(_canonical(a) != _canonical(b) for a, b in zip(records, restored)):
+        return None
+    return array
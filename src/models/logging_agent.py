@@ -1,22 +1,87 @@
 import json
 import datetime
 import os
-from typing import Dict, Any, List
+import atexit
+import gzip
+import queue
+import shutil
+import threading
+import time
+from collections import deque
+from typing import Dict, Any, List, Optional
+
+# orjson is optional: the standard library encoder is used without it
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _encode(entry: Dict[str, Any]) -> bytes:
+    """Serialize one log entry as a JSON line."""
+    if orjson is not None:
+        return orjson.dumps(entry, default=str, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(entry, default=str) + "\n").encode("utf-8")
 
 
 class LoggingAgent:
-    def __init__(self):
+    def __init__(self, log_dir: str = "logs", file_name: str = "app_logs.jsonl",
+                 max_memory_entries: int = 1000, queue_size: int = 10000,
+                 flush_interval: float = 1.0, flush_batch: int = 256,
+                 max_bytes: int = 10 * 1024 * 1024, rotate_daily: bool = True, backup_count: int = 5):
         """
-        Initialize LoggingAgent with no arguments.
+        Initialize LoggingAgent.
+
+        Entries are written by a background thread, so ``log`` never waits on
+        disk I/O. The writer drains a bounded queue and writes a batch once
+        ``flush_batch`` entries are waiting or ``flush_interval`` seconds after
+        the first unwritten entry, whichever comes first. The log file is rotated when it would exceed ``max_bytes`` or
+        when the UTC date changes (with ``rotate_daily``). Rotated files are
+        gzip-compressed, and only the newest ``backup_count`` are kept.
+
+        Args:
+            log_dir: Directory for the log files
+            file_name: Name of the active log file
+            max_memory_entries: Size of the in-memory ring buffer returned by ``get_logs``
+            queue_size: Entries that may wait for the writer before new ones are dropped
+            flush_interval: Longest time an entry waits before being written
+            flush_batch: Maximum entries written per flush
+            max_bytes: Rotate before the file grows past this size (0 disables)
+            rotate_daily: Rotate when the UTC date changes
+            backup_count: Compressed rotated files to keep
         """
-        self.logs: List[Dict[str, Any]] = []
+        self.log_dir = log_dir
+        self.log_path = os.path.join(log_dir, file_name)
+        self.flush_interval = flush_interval
+        self.flush_batch = flush_batch
+        self.max_bytes = max_bytes
+        self.rotate_daily = rotate_daily
+        self.backup_count = backup_count
+
+        self.logs = deque(maxlen=max_memory_entries)
+        self.dropped = 0
+        self.written = 0
+        self.rotations = 0
+
         # Create logs directory if it doesn't exist
-        os.makedirs("logs", exist_ok=True)
-    
+        os.makedirs(log_dir, exist_ok=True)
+
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._file = None
+        self._file_date = None
+        self._closed = False
+        self._writer = threading.Thread(target=self._run_writer, name="logging-agent-writer", daemon=True)
+        self._writer.start()
+        atexit.register(self.close)
+
     def log(self, entry_type: str, data: Dict[str, Any]) -> None:
         """
         Log an entry with type, data, and timestamp.
-        
+
+        The entry is serialized immediately, so later changes to ``data`` do
+        not affect it, and then queued for the writer. If the queue is full,
+        the entry is only kept in memory and counted in ``dropped``.
+
         Args:
             entry_type: Type of log entry (e.g., "input", "features", "prediction")
             data: Data to log
@@ -24,47 +89,162 @@ class LoggingAgent:
         # Validate entry_type
         if not isinstance(entry_type, str) or len(entry_type) == 0:
             entry_type = "unknown"
-        
+
         # Validate data
         if not isinstance(data, dict):
             data = {"value": str(data)}
-        
+
         # Generate timestamp
         timestamp = datetime.datetime.utcnow().isoformat()
-        
+
         # Create log entry
         log_entry = {
             "type": entry_type,
             "data": data,
             "timestamp": timestamp
         }
-        
-        # Append to in-memory logs
+
+        # Keep the most recent entries in memory
         self.logs.append(log_entry)
-        
-        # Append to persistent file
+
+        if self._closed:
+            return
         try:
-            with open("logs/app_logs.jsonl", "a", encoding="utf-8") as f:
-                f.write(json.dumps(log_entry) + "\n")
+            self._queue.put_nowait(_encode(log_entry))
+        except queue.Full:
+            self.dropped += 1
         except Exception:
-            # Silently continue if file writing fails
+            # Silently continue if the entry cannot be serialized
             pass
-    
+
     def get_logs(self) -> List[Dict[str, Any]]:
         """
-        Get all in-memory log entries.
-        
+        Get the most recent in-memory log entries.
+
         Returns:
-            List of all log entries
+            List of up to ``max_memory_entries`` log entries, oldest first
+        """
+        return list(self.logs)
+
+    def flush(self, timeout: Optional[float] = 5.0) -> bool:
         """
-        return self.logs.copy()
-    
+        Wait until every entry logged so far has been written to disk.
+
+        Returns:
+            True if the writer caught up within ``timeout`` seconds
+        """
+        if self._closed or not self._writer.is_alive():
+            return False
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def close(self) -> None:
+        """Write the remaining entries and stop the writer thread."""
+        if self._closed:
+            return
+        self._closed = True
+        atexit.unregister(self.close)
+        try:
+            self._queue.put(None, timeout=5)
+        except queue.Full:
+            # The writer is stuck; don't hang the caller (or interpreter exit) on it
+            return
+        self._writer.join(timeout=10)
+
+    def _run_writer(self) -> None:
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+
+            # Collect until the batch is full, the interval has passed since
+            # its first entry, or someone is waiting in flush()/close()
+            lines, markers = [], []
+            deadline = time.monotonic() + self.flush_interval
+            while True:
+                if item is None:
+                    stopping = True
+                elif isinstance(item, threading.Event):
+                    markers.append(item)
+                else:
+                    lines.append(item)
+                if stopping or markers or len(lines) >= self.flush_batch:
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+
+            if lines:
+                try:
+                    self._write(b"".join(lines))
+                    self.written += len(lines)
+                except Exception:
+                    # Silently continue if file writing fails
+                    self._close_file()
+            for marker in markers:
+                marker.set()
+        self._close_file()
+
+    def _write(self, payload: bytes) -> None:
+        today = datetime.datetime.utcnow().date()
+        if self._file is None:
+            self._open_file()
+        if (self.rotate_daily and self._file_date != today) or \
+                (self.max_bytes and self._file.tell() > 0 and self._file.tell() + len(payload) > self.max_bytes):
+            self._rotate()
+        self._file.write(payload)
+        self._file.flush()
+
+    def _open_file(self) -> None:
+        self._file = open(self.log_path, "ab")
+        if self._file.tell() > 0:
+            modified = datetime.datetime.utcfromtimestamp(os.path.getmtime(self.log_path))
+            self._file_date = modified.date()
+        else:
+            self._file_date = datetime.datetime.utcnow().date()
+
+    def _close_file(self) -> None:
+        if self._file is not None:
+            try:
+                self._file.close()
+            except OSError:
+                pass
+            self._file = None
+
+    def _rotate(self) -> None:
+        """Compress the current file under a timestamped name and start a new one."""
+        self._close_file()
+        if os.path.getsize(self.log_path) > 0:
+            stamp = datetime.datetime.utcnow().strftime("%Y%m%d-%H%M%S-%f")
+            base, ext = os.path.splitext(self.log_path)
+            rotated_path = f"{base}.{stamp}{ext}.gz"
+            with open(self.log_path, "rb") as src, gzip.open(rotated_path, "wb") as dst:
+                shutil.copyfileobj(src, dst)
+            os.remove(self.log_path)
+            self.rotations += 1
+            self._prune_backups()
+        self._open_file()
+        self._file_date = datetime.datetime.utcnow().date()
+
+    def _prune_backups(self) -> None:
+        base, ext = os.path.splitext(os.path.basename(self.log_path))
+        backups = sorted(
+            name for name in os.listdir(self.log_dir)
+            if name.startswith(base + ".") and name.endswith(ext + ".gz")
+        )
+        for name in backups[:max(len(backups) - self.backup_count, 0)]:
+            os.remove(os.path.join(self.log_dir, name))
+
     @staticmethod
     def load() -> 'LoggingAgent':
         """
         Static method to create and return a LoggingAgent instance.
-        
+
         Returns:
             LoggingAgent: A new LoggingAgent instance
         """
-        return LoggingAgent()
\ No newline at end of file
+        return LoggingAgent()
@@ -0,0 +1,93 @@
+"""
+Streaming quantile sketch for columns that do not fit in memory.
+
+A KLL sketch (Karnin, Lang and Liberty, 2016): values are kept in a stack
+of compactors, where an item on level h stands for 2**h input values. When a
+level outgrows its capacity it is sorted and every other item (starting at
+a random offset) moves up a level, so memory stays at O(k log(n / k)) items
+however many values are added. Quantiles are read off the weighted items;
+the rank error is about 1.7 / k (under 0.1% with the default k).
+"""
+from typing import Iterable
+
+import numpy as np
+
+
+class QuantileSketch:
+    """
+    Approximate quantiles of a stream of numbers.
+
+    Args:
+        k: Capacity of the top level; larger is more accurate and uses more memory
+        seed: Seed of the compaction offsets, so results are reproducible
+    """
+
+    def __init__(self, k: int = 2048, seed: int = 0):
+        self.k = int(k)
+        self.count = 0
+        self.min = np.inf
+        self.max = -np.inf
+        self._levels = [np.empty(0, dtype=np.float64)]
+        self._rng = np.random.default_rng(seed)
+
+    def _capacity(self, level: int) -> int:
+        return max(2, int(np.ceil(self.k * (2 / 3) ** (len(self._levels) - 1 - level))))
+
+    def update(self, values: Iterable[float]) -> 'QuantileSketch':
+        """Add values; NaN and infinite values are ignored."""
+        values = np.asarray(values, dtype=np.float64).ravel()
+        values = values[np.isfinite(values)]
+        if not len(values):
+            return self
+        self.count += len(values)
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        self._levels[0] = np.concatenate([self._levels[0], values])
+        self._compress()
+        return self
+
+    def _compress(self) -> None:
+        level = 0
+        while level < len(self._levels):
+            items = self._levels[level]
+            if len(items) > self._capacity(level):
+                if level + 1 == len(self._levels):
+                    self._levels.append(np.empty(0, dtype=np.float64))
+                items = np.sort(items)
+                # With an odd count the largest item stays behind
+                paired = len(items) - len(items) % 2
+                self._levels[level] = items[paired:]
+                promoted = items[:paired][self._rng.integers(2)::2]
+                self._levels[level + 1] = np.concatenate([self._levels[level + 1], promoted])
+            level += 1
+
+    def quantile(self, q: float) -> float:
+        """
+        Approximate ``q``-quantile of the values added so far.
+
+        Args:
+            q: Quantile in [0, 1]; 0 and 1 give the exact minimum and maximum
+
+        Returns:
+            A value from the stream, or NaN if nothing was added
+        """
+        if not 0 <= q <= 1:
+            raise ValueError(f"Quantile must be in [0, 1], got {q}")
+        if self.count == 0:
+            return float("nan")
+        if q == 0:
+            return self.min
+        if q == 1:
+            return self.max
+        items = np.concatenate(self._levels)
+        weights = np.concatenate([np.full(len(level_items), 2 ** level, dtype=np.float64)
+                                  for level, level_items in enumerate(self._levels)])
+        order = np.argsort(items, kind="stable")
+        cumulative = np.cumsum(weights[order])
+        position = np.searchsorted(cumulative, q * cumulative[-1], side="left")
+        return float(items[order][min(position, len(items) - 1)])
+
+    @property
+    def size(self) -> int:
+        """Number of items held."""
+        return int(sum(len(items) for items in self._levels))
@@ -1,4 +1,5 @@
 import json
+import functools
 import pandas as pd
 import os
 
@@ -59,8 +60,14 @@ def llm_call(system_prompt, user_prompt):
 
 
 # Load the VC evaluation dataset for enhanced reasoning
+@functools.lru_cache(maxsize=None)
 def load_vc_evaluation_data():
-    """Load the VC evaluation dataset for enhanced reasoning capabilities"""
+    """
+    Load the VC evaluation dataset for enhanced reasoning capabilities.
+
+    The CSV is read on first use and shared by every caller afterwards, so
+    importing this module (and starting the API) does not touch the disk.
+    """
     try:
         # Check if the dataset files exist in the project root
         csv_path = os.path.join(os.path.dirname(__file__), '..', '..', 'enhanced_training_data.csv')
@@ -75,8 +82,11 @@ def load_vc_evaluation_data():
         return pd.DataFrame(columns=['prompt', 'completion', 'evaluation_aspect'])
 
 
-# Load the dataset at module level
-VC_EVALUATION_DATA = load_vc_evaluation_data()
+def __getattr__(name):
+    # VC_EVALUATION_DATA used to be loaded at import time; keep it available, lazily
+    if name == "VC_EVALUATION_DATA":
+        return load_vc_evaluation_data()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 SYSTEM_PROMPT = """
@@ -171,9 +181,12 @@ class ReasoningAgent:
         """
         Initialize ReasoningAgent with no arguments.
         """
-        # Load VC evaluation data for enhanced reasoning
-        self.vc_data = VC_EVALUATION_DATA
         pass
+
+    @property
+    def vc_data(self):
+        """VC evaluation data for enhanced reasoning, loaded on first access."""
+        return load_vc_evaluation_data()
     
     def explain(self, features: dict) -> dict:
         """
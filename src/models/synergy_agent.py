@@ -1,4 +1,12 @@
+import numpy as np
+import pandas as pd
+
+from .vector_ops import as_records, is_number, clip_upper
+
+
 class SynergyAgent:
+    FEATURE_VERSION = 1
+
     def __init__(self):
         pass
     
@@ -53,6 +61,139 @@ class SynergyAgent:
             'overall_synergy_score': float(overall_synergy)
         }
     
+    def transform_batch(self, acquirer_column, target_column) -> pd.DataFrame:
+        """
+        Columnar version of ``transform`` for many acquirer/target pairs.
+
+        Market and industry similarity are computed once per distinct string
+        pair, tech stacks are encoded as (row, token) ids so the Jaccard
+        intersections come from one sorted-array pass, and the team-size terms
+        are plain NumPy arithmetic. Results are bit-identical to ``transform``.
+
+        Args:
+            acquirer_column: Column of acquirer dicts or JSON strings
+            target_column: Column of target dicts or JSON strings, aligned with
+                ``acquirer_column``
+
+        Returns:
+            DataFrame with one row per valid pair, indexed like the acquirer
+            column. Pairs that ``transform`` would reject are dropped.
+        """
+        index, acquirers = as_records(acquirer_column)
+        _, targets = as_records(target_column)
+
+        valid_rows = []
+        markets = []
+        industries = []
+        acquirer_sizes = []
+        target_sizes = []
+        acquirer_stacks = []
+        target_stacks = []
+        for position, (acquirer, target) in enumerate(zip(acquirers, targets)):
+            try:
+                market_pair = (acquirer.get('market', ''), target.get('market', ''))
+                industry_pair = (acquirer.get('industry', ''), target.get('industry', ''))
+                acquirer_stack = acquirer.get('tech_stack', [])
+                target_stack = target.get('tech_stack', [])
+                acquirer_size = acquirer.get('team_size', 1)
+                target_size = target.get('team_size', 1)
+                # Mirror the failure modes of the scalar path
+                for str1, str2 in (market_pair, industry_pair):
+                    if str1 and str2 and not (isinstance(str1, str) and isinstance(str2, str)):
+                        raise TypeError("similarity inputs must be strings")
+                if acquirer_stack and target_stack:
+                    set(acquirer_stack), set(target_stack)
+                if not (is_number(acquirer_size) and is_number(target_size)):
+                    raise TypeError("team sizes must be numeric")
+            except Exception:
+                continue
+
+            valid_rows.append(position)
+            markets.append(market_pair)
+            industries.append(industry_pair)
+            acquirer_sizes.append(acquirer_size)
+            target_sizes.append(target_size)
+            acquirer_stacks.append(acquirer_stack)
+            target_stacks.append(target_stack)
+
+        # Combined market similarity (average of market and industry)
+        market_sim = (self._string_similarity_batch(markets) + self._string_similarity_batch(industries)) / 2
+        tech_sim = self._jaccard_similarity_batch(acquirer_stacks, target_stacks)
+
+        acquirer_team_size = np.asarray(acquirer_sizes, dtype=np.float64)
+        target_team_size = np.asarray(target_sizes, dtype=np.float64)
+        revenue_synergy = market_sim + (acquirer_team_size + target_team_size) / 100
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            team_size_ratio = acquirer_team_size / target_team_size
+            cost_synergy = np.where(
+                team_size_ratio >= 1, clip_upper(team_size_ratio / 2, 1.0), team_size_ratio / 2
+            )
+            cost_synergy = np.where(target_team_size > 0, cost_synergy, 0.0)
+
+        overall_synergy = (
+            market_sim * 0.35 + 
+            tech_sim * 0.35 + 
+            revenue_synergy * 0.15 + 
+            cost_synergy * 0.15
+        )
+
+        return pd.DataFrame({
+            'market_similarity': market_sim.astype(np.float64),
+            'tech_similarity': tech_sim.astype(np.float64),
+            'revenue_synergy_score': revenue_synergy.astype(np.float64),
+            'cost_synergy_score': cost_synergy.astype(np.float64),
+            'overall_synergy_score': overall_synergy.astype(np.float64)
+        }, index=index[valid_rows])
+
+    def _string_similarity_batch(self, pairs: list) -> np.ndarray:
+        """Vectorized _calculate_string_similarity over a list of string pairs."""
+        if not pairs:
+            return np.zeros(0, dtype=np.float64)
+        # Normalize falsy values (and non-string values, which only reach here
+        # paired with an empty string and score 0.0) so the pairs can be factorized
+        normalized = [
+            tuple((value if isinstance(value, str) else '<non-string>') if value else '' for value in pair)
+            for pair in pairs
+        ]
+        codes, uniques = pd.factorize(pd.Series(normalized, dtype=object))
+        scores = np.asarray([self._calculate_string_similarity(a, b) for a, b in uniques], dtype=np.float64)
+        return scores[codes]
+
+    def _jaccard_similarity_batch(self, stacks1: list, stacks2: list) -> np.ndarray:
+        """Vectorized _calculate_jaccard_similarity over aligned lists of stacks."""
+        num_rows = len(stacks1)
+        empty1 = np.asarray([not stack for stack in stacks1], dtype=bool)
+        empty2 = np.asarray([not stack for stack in stacks2], dtype=bool)
+
+        # Encode each (row, token) membership as one integer key
+        vocabulary = {}
+        keys1 = self._encode_stacks(stacks1, vocabulary)
+        keys2 = self._encode_stacks(stacks2, vocabulary)
+        width = max(len(vocabulary), 1)
+        keys1 = np.unique(keys1[:, 0] * width + keys1[:, 1])
+        keys2 = np.unique(keys2[:, 0] * width + keys2[:, 1])
+
+        size1 = np.bincount(keys1 // width, minlength=num_rows)
+        size2 = np.bincount(keys2 // width, minlength=num_rows)
+        intersection = np.bincount(np.intersect1d(keys1, keys2, assume_unique=True) // width, minlength=num_rows)
+        union = size1 + size2 - intersection
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            jaccard = np.where(union > 0, intersection / np.maximum(union, 1), 0.0)
+        jaccard = np.where(empty1 | empty2, 0.0, jaccard)
+        return np.where(empty1 & empty2, 1.0, jaccard).astype(np.float64)
+
+    @staticmethod
+    def _encode_stacks(stacks: list, vocabulary: dict) -> np.ndarray:
+        """Map each tech-stack entry to a (row, token id) pair."""
+        pairs = [
+            (row, vocabulary.setdefault(token, len(vocabulary)))
+            for row, stack in enumerate(stacks) if stack
+            for token in stack
+        ]
+        return np.asarray(pairs, dtype=np.int64).reshape(-1, 2)
+    
     def _calculate_string_similarity(self, str1: str, str2: str) -> float:
         """Calculate similarity between two strings."""
         if not str1 and not str2:
@@ -0,0 +1,239 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .synergy_agent import SynergyAgent
+from .vector_ops import is_number, clip_upper
+
+SYNERGY_COLUMNS = [
+    'market_similarity', 'tech_similarity', 'revenue_synergy_score',
+    'cost_synergy_score', 'overall_synergy_score'
+]
+
+
+class SynergyScreen:
+    """
+    Scores one acquirer against every company in a universe.
+
+    Uses the same formulas as ``SynergyAgent.transform``, laid out for one
+    acquirer against many targets:
+
+    - market and industry strings are factorized once, so a screen compares
+      the acquirer with each distinct value and then gathers by code
+    - tech stacks are a sparse (CSR) token matrix; the Jaccard intersections
+      for a chunk of candidates are a single ``bincount`` over the chunk's
+      entries that hit the acquirer's tokens
+    - the team-size revenue/cost terms are array arithmetic over all candidates
+
+    Candidates are scored in fixed-size chunks, optionally on several threads,
+    and each chunk keeps only its own top-K, so memory stays bounded by the
+    chunk size no matter how large the universe is. Scores are bit-identical
+    to calling ``transform`` pair by pair.
+    """
+
+    def __init__(self, company_ids: Sequence, markets: Sequence, industries: Sequence,
+                 tech_stacks: Sequence, team_sizes: Sequence, names: Optional[Sequence] = None):
+        self.company_ids = np.asarray(company_ids, dtype=object)
+        self.size = len(self.company_ids)
+        self.names = np.asarray(names, dtype=object) if names is not None else None
+        self._agent = SynergyAgent()
+
+        # Missing markets/industries compare like empty strings
+        self._market_codes, self._markets = self._factorize(markets)
+        self._industry_codes, self._industries = self._factorize(industries)
+
+        # CSR token matrix over the distinct tokens of each stack
+        self._vocabulary: Dict[str, int] = {}
+        indptr = [0]
+        indices = []
+        for stack in tech_stacks:
+            tokens = {self._vocabulary.setdefault(token, len(self._vocabulary)) for token in set(stack or ())}
+            indices.extend(sorted(tokens))
+            indptr.append(len(indices))
+        self._indptr = np.asarray(indptr, dtype=np.int64)
+        self._indices = np.asarray(indices, dtype=np.int64)
+        self._entry_rows = np.repeat(np.arange(self.size, dtype=np.int64), np.diff(self._indptr))
+        self._stack_sizes = np.diff(self._indptr)
+
+        self._team_sizes = np.asarray(team_sizes, dtype=np.float64)
+        self._positions = {company_id: position for position, company_id in enumerate(self.company_ids)}
+
+    @staticmethod
+    def _factorize(values: Sequence):
+        normalized = [value if isinstance(value, str) else '' for value in values]
+        codes, uniques = pd.factorize(pd.Series(normalized, dtype=object))
+        return codes.astype(np.int64), list(uniques)
+
+    @classmethod
+    def from_companies(cls, companies_df: pd.DataFrame, tech_stack_column: Optional[str] = None) -> 'SynergyScreen':
+        """
+        Universe from the Crunchbase objects table.
+
+        Market and industry are both ``category_code`` and the team size is
+        the pipeline's estimate of one employee per $1M raised, as in
+        ``process_datasets.build_crunchbase_scenarios``.
+
+        Args:
+            companies_df: Objects table with id, name, category_code and funding_total_usd
+            tech_stack_column: Optional column of comma-separated tags to use as tech stacks
+        """
+        if 'entity_type' in companies_df.columns:
+            companies_df = companies_df[companies_df['entity_type'] == 'Company']
+        categories = companies_df['category_code'].astype(object).where(companies_df['category_code'].notna(), '')
+        funding = pd.to_numeric(companies_df.get('funding_total_usd'), errors='coerce')
+        funding = funding.fillna(0.0).to_numpy(dtype=np.float64) if funding is not None else np.zeros(len(companies_df))
+        team_sizes = np.maximum(1, np.floor(np.nan_to_num(funding / 1000000, posinf=0.0)))
+        if tech_stack_column is not None:
+            tech_stacks = [
+                [tag.strip() for tag in tags.split(',') if tag.strip()] if isinstance(tags, str) else []
+                for tags in companies_df[tech_stack_column].tolist()
+            ]
+        else:
+            tech_stacks = [[]] * len(companies_df)
+        return cls(
+            companies_df['id'].tolist(), categories.tolist(), categories.tolist(), tech_stacks, team_sizes,
+            names=companies_df['name'].tolist() if 'name' in companies_df.columns else None
+        )
+
+    def _acquirer_arrays(self, acquirer: dict) -> dict:
+        """Per-screen lookups: similarity per distinct market/industry and the acquirer's token mask."""
+        market = acquirer.get('market', '')
+        industry = acquirer.get('industry', '')
+        team_size = acquirer.get('team_size', 1)
+        stack = acquirer.get('tech_stack', [])
+        # Reject the acquirers transform would fail on
+        for value in (market, industry):
+            if value and not isinstance(value, str):
+                raise ValueError("acquirer market and industry must be strings")
+        if not is_number(team_size):
+            raise ValueError("acquirer team_size must be numeric")
+        try:
+            stack_tokens = set(stack or ())
+        except TypeError:
+            raise ValueError("acquirer tech_stack must be a list of strings")
+
+        token_mask = np.zeros(len(self._vocabulary) + 1, dtype=bool)
+        for token in stack_tokens:
+            position = self._vocabulary.get(token)
+            if position is not None:
+                token_mask[position] = True
+
+        similarity = self._agent._calculate_string_similarity
+        return {
+            'market': np.asarray([similarity(market, value) for value in self._markets], dtype=np.float64),
+            'industry': np.asarray([similarity(industry, value) for value in self._industries], dtype=np.float64),
+            'token_mask': token_mask,
+            'stack_size': len(stack_tokens),
+            'team_size': float(team_size)
+        }
+
+    def _score_chunk(self, lookups: dict, start: int, end: int) -> Dict[str, np.ndarray]:
+        """All five synergy scores for candidates ``start:end``."""
+        market_sim = (lookups['market'][self._market_codes[start:end]]
+                      + lookups['industry'][self._industry_codes[start:end]]) / 2
+
+        # Jaccard from the chunk's CSR entries that hit an acquirer token
+        lo, hi = self._indptr[start], self._indptr[end]
+        hits = lookups['token_mask'][self._indices[lo:hi]]
+        intersection = np.bincount(self._entry_rows[lo:hi][hits] - start, minlength=end - start)
+        target_sizes = self._stack_sizes[start:end]
+        union = target_sizes + lookups['stack_size'] - intersection
+        with np.errstate(divide='ignore', invalid='ignore'):
+            tech_sim = np.where(union > 0, intersection / np.maximum(union, 1), 0.0)
+        acquirer_empty = lookups['stack_size'] == 0
+        target_empty = target_sizes == 0
+        tech_sim = np.where(target_empty | acquirer_empty, 0.0, tech_sim)
+        tech_sim = np.where(target_empty & acquirer_empty, 1.0, tech_sim)
+
+        acquirer_team_size = lookups['team_size']
+        target_team_size = self._team_sizes[start:end]
+        revenue_synergy = market_sim + (acquirer_team_size + target_team_size) / 100
+        with np.errstate(divide='ignore', invalid='ignore'):
+            team_size_ratio = acquirer_team_size / target_team_size
+            cost_synergy = np.where(
+                team_size_ratio >= 1, clip_upper(team_size_ratio / 2, 1.0), team_size_ratio / 2
+            )
+            cost_synergy = np.where(target_team_size > 0, cost_synergy, 0.0)
+
+        overall_synergy = (
+            market_sim * 0.35 +
+            tech_sim * 0.35 +
+            revenue_synergy * 0.15 +
+            cost_synergy * 0.15
+        )
+        return {
+            'market_similarity': market_sim,
+            'tech_similarity': tech_sim,
+            'revenue_synergy_score': revenue_synergy,
+            'cost_synergy_score': cost_synergy,
+            'overall_synergy_score': overall_synergy
+        }
+
+    def _chunk_top_k(self, lookups: dict, start: int, end: int, k: int, excluded: np.ndarray) -> Dict[str, np.ndarray]:
+        scores = self._score_chunk(lookups, start, end)
+        overall = scores['overall_synergy_score'].copy()
+        local_excluded = excluded[(excluded >= start) & (excluded < end)] - start
+        overall[local_excluded] = -np.inf
+        if k < len(overall):
+            # Every candidate tied with the k-th best, then the first k of those in universe
+            # order, so that ties resolve the same way however the universe is chunked
+            kth = -np.partition(-overall, k - 1)[k - 1]
+            keep = np.flatnonzero(overall >= kth)
+            keep = keep[np.lexsort((keep, -overall[keep]))[:k]]
+        else:
+            keep = np.arange(len(overall))
+        keep = keep[overall[keep] > -np.inf]
+        selected = {column: values[keep] for column, values in scores.items()}
+        selected['position'] = keep + start
+        return selected
+
+    def top_k(self, acquirer: dict, k: int = 10, exclude: Sequence = (), chunk_size: int = 65536,
+              n_jobs: int = 1) -> List[dict]:
+        """
+        The ``k`` candidates with the highest overall synergy for ``acquirer``.
+
+        Args:
+            acquirer: Acquirer dict, as passed to ``SynergyAgent.transform``
+            k: Number of candidates to return
+            exclude: Company ids to leave out, e.g. the acquirer itself
+            chunk_size: Candidates scored per chunk; bounds the working memory
+            n_jobs: Threads scoring chunks concurrently
+
+        Returns:
+            Candidate dicts with the company id, name, position and the five
+            synergy scores, best first (ties in universe order)
+        """
+        if k <= 0 or self.size == 0:
+            return []
+        lookups = self._acquirer_arrays(acquirer)
+        excluded = np.asarray(
+            sorted(self._positions[company_id] for company_id in exclude if company_id in self._positions),
+            dtype=np.int64
+        )
+        bounds = [(start, min(start + chunk_size, self.size)) for start in range(0, self.size, chunk_size)]
+        if n_jobs > 1 and len(bounds) > 1:
+            with ThreadPoolExecutor(max_workers=n_jobs, thread_name_prefix="synergy-screen") as executor:
+                parts = list(executor.map(lambda bound: self._chunk_top_k(lookups, *bound, k, excluded), bounds))
+        else:
+            parts = [self._chunk_top_k(lookups, start, end, k, excluded) for start, end in bounds]
+
+        merged = {column: np.concatenate([part[column] for part in parts]) for column in parts[0]}
+        order = np.lexsort((merged['position'], -merged['overall_synergy_score']))[:k]
+        candidates = []
+        for index in order:
+            position = int(merged['position'][index])
+            candidate = {
+                'company_id': self.company_ids[position],
+                'name': self.names[position] if self.names is not None and isinstance(self.names[position], str) else None,
+                'position': position
+            }
+            candidate.update({column: float(merged[column][index]) for column in SYNERGY_COLUMNS})
+            candidates.append(candidate)
+        return candidates
+
+    def score_all(self, acquirer: dict) -> pd.DataFrame:
+        """Synergy scores against every candidate, indexed by company id (materializes the universe)."""
+        lookups = self._acquirer_arrays(acquirer)
+        return pd.DataFrame(self._score_chunk(lookups, 0, self.size), index=self.company_ids)
@@ -1,32 +1,54 @@
-import json
 from typing import Dict, Any, Union, List
 import pandas as pd
 import os
 import numpy as np
 import math
 
+from .company_index import CompanyIndex
+from .dataset_cache import load_dataset
+from . import json_codec
+from .vector_ops import as_records, is_number, clip_upper, segment_sum
+
+# Columns used by the competitor/acquisition lookups and the synergy screen (which keeps only entity_type Company)
+COMPANY_COLUMNS = ['id', 'entity_type', 'name', 'permalink', 'domain', 'category_code', 'funding_total_usd']
+ACQUISITION_COLUMNS = ['acquiring_object_id', 'acquired_object_id', 'price_amount', 'price_currency_code', 'acquired_at']
+
+# Experience buckets used by transform/transform_batch, in bucket order
+EXPERIENCE_LEVELS = ["Junior", "Mid-level", "Senior", "Executive"]
+EXPERIENCE_DISTRIBUTION_KEYS = ['junior', 'mid_level', 'senior', 'executive']
+IDEAL_DISTRIBUTION = {
+    'junior': 0.4,   # 40% junior talent for execution
+    'mid_level': 0.35,  # 35% mid-level for stability
+    'senior': 0.2,   # 20% senior for leadership
+    'executive': 0.05   # 5% executive for vision
+}
+
 class TeamAgent:
-    def __init__(self):
+    FEATURE_VERSION = 1
+
+    def __init__(self, load_datasets: bool = True):
         # Load company data for competitor/acquisition lookup
         self.companies_df = None
         self.acquisitions_df = None
-        self._load_datasets()
+        self.company_index = None
+        if load_datasets:
+            self.load_datasets()
     
-    def _load_datasets(self):
-        """Load datasets for company and acquisition lookup"""
+    def load_datasets(self):
+        """Load datasets for company and acquisition lookup and index them"""
         try:
             if os.path.exists("datasets/objects.csv"):
-                # Load more data for better coverage, but limit for performance
-                self.companies_df = pd.read_csv("datasets/objects.csv", nrows=5000)
+                self.companies_df = load_dataset("objects", columns=COMPANY_COLUMNS)
             if os.path.exists("datasets/acquisitions.csv"):
-                # Load more acquisition data to increase chances of finding matches
-                self.acquisitions_df = pd.read_csv("datasets/acquisitions.csv", nrows=5000)
+                self.acquisitions_df = load_dataset("acquisitions", columns=ACQUISITION_COLUMNS)
+            if self.companies_df is not None:
+                self.company_index = CompanyIndex(self.companies_df, self.acquisitions_df)
         except Exception as e:
             print(f"Warning: Could not load datasets - {e}")
     
     def transform(self, team_json: Union[str, Dict[str, Any]]) -> Dict[str, Any]:
         if isinstance(team_json, str):
-            team_data = json.loads(team_json)
+            team_data = json_codec.loads(team_json)
         else:
             team_data = team_json
             
@@ -122,17 +144,10 @@ class TeamAgent:
         if team_size <= 0:
             return 0.0
             
-        # Ideal distribution percentages (based on startup best practices)
-        ideal_distribution = {
-            'junior': 0.4,   # 40% junior talent for execution
-            'mid_level': 0.35,  # 35% mid-level for stability
-            'senior': 0.2,   # 20% senior for leadership
-            'executive': 0.05   # 5% executive for vision
-        }
-        
         # Calculate how close the actual distribution is to ideal
+        # (ideal percentages are based on startup best practices)
         score = 0.0
-        for level, ideal_pct in ideal_distribution.items():
+        for level, ideal_pct in IDEAL_DISTRIBUTION.items():
             actual_pct = experience_distribution.get(level, 0) / team_size
             # Score based on how close we are to ideal (0 to 1, where 1 is perfect match)
             level_score = 1.0 - abs(actual_pct - ideal_pct)
@@ -140,96 +155,141 @@ class TeamAgent:
             
         return score * 10  # Scale to 0-10
     
+    def transform_batch(self, team_column) -> pd.DataFrame:
+        """
+        Columnar version of ``transform`` for many teams at once.
+
+        Founders are flattened into one array per field, bucketed into
+        experience levels with NumPy and aggregated per team, so the scores
+        are bit-identical to ``transform``.
+
+        Args:
+            team_column: Column (Series, list or Arrow array) of team dicts or
+                JSON strings
+
+        Returns:
+            DataFrame with one row per valid input, indexed like the input.
+            Rows that ``transform`` would reject are dropped.
+        """
+        index, records = as_records(team_column)
+
+        valid_rows = []
+        founder_counts = []
+        team_sizes = []
+        founder_row_ids = []
+        experiences = []
+        has_exits = []
+        roles = []
+        educations = []
+        for position, team_data in enumerate(records):
+            try:
+                founders = team_data.get('founders', [])
+                team_size = team_data.get('estimated_team_size', 0)
+                rows = [
+                    (founder.get('experience_years', 0), founder.get('has_exit', False),
+                     founder.get('role', 'Founder'), founder.get('education', ''))
+                    for founder in founders
+                ]
+                if not is_number(team_size) or not all(is_number(row[0]) for row in rows):
+                    continue
+            except Exception:
+                continue
+
+            row_id = len(valid_rows)
+            valid_rows.append(position)
+            founder_counts.append(len(rows))
+            team_sizes.append(team_size)
+            for experience, has_exit, role, education in rows:
+                founder_row_ids.append(row_id)
+                experiences.append(experience)
+                has_exits.append(has_exit)
+                roles.append(role)
+                educations.append(education)
+
+        num_rows = len(valid_rows)
+        founder_row_ids = np.asarray(founder_row_ids, dtype=np.int64)
+        founder_count = np.asarray(founder_counts, dtype=np.int64)
+        team_size = np.asarray(team_sizes, dtype=np.float64)
+        experience = np.asarray(experiences, dtype=np.float64)
+
+        # Bucket every founder into an experience level (0=Junior .. 3=Executive)
+        level_codes = np.select([experience < 3, experience < 7, experience < 15], [0, 1, 2], 3)
+        level_counts = np.bincount(
+            founder_row_ids * 4 + level_codes, minlength=num_rows * 4
+        ).reshape(num_rows, 4)
+
+        total_experience = segment_sum(founder_row_ids, experience, num_rows)
+        exits_count = np.bincount(
+            founder_row_ids[np.asarray([bool(e) for e in has_exits], dtype=bool)], minlength=num_rows
+        ).astype(np.int64)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            avg_experience = np.where(founder_count == 0, 0.0, total_experience / np.maximum(founder_count, 1))
+
+            # Same terms, in the same order, as _calculate_team_strength
+            unique_levels = (level_counts > 0).sum(axis=1)
+            team_strength_score = (
+                founder_count * 0.2
+                + avg_experience * 0.5
+                + exits_count * 1.0
+                + np.where(team_size > 0, clip_upper(team_size / 100, 2.0), 0)
+                + np.where(unique_levels > 1, unique_levels * 0.3, 0)
+                + (level_counts[:, 2] + level_counts[:, 3]) * 0.4
+            )
+
+            # Same terms, in the same order, as _calculate_team_composition_score
+            composition = np.zeros(num_rows, dtype=np.float64)
+            for column, ideal_pct in enumerate(IDEAL_DISTRIBUTION.values()):
+                actual_pct = level_counts[:, column] / team_size
+                composition = composition + (1.0 - np.abs(actual_pct - ideal_pct)) * ideal_pct
+            team_composition_score = np.where(team_size <= 0, 0.0, composition * 10)
+
+        # Rebuild the per-founder detail dicts and per-team distributions
+        level_names = np.asarray(EXPERIENCE_LEVELS, dtype=object)[level_codes]
+        all_details = [
+            {
+                'experience': exp,
+                'experience_level': level,
+                'has_exit': has_exit,
+                'role': role,
+                'education': education
+            }
+            for exp, level, has_exit, role, education in zip(experiences, level_names, has_exits, roles, educations)
+        ]
+        offsets = np.concatenate([[0], np.cumsum(founder_count)]).tolist()
+        founder_details = [all_details[offsets[i]:offsets[i + 1]] for i in range(num_rows)]
+        experience_distribution = [
+            dict(zip(EXPERIENCE_DISTRIBUTION_KEYS, counts)) for counts in level_counts.tolist()
+        ]
+
+        return pd.DataFrame({
+            'team_strength_score': team_strength_score.astype(np.float64),
+            'founder_count': founder_count,
+            'avg_experience': avg_experience.astype(np.float64),
+            'exits_count': exits_count,
+            'estimated_team_size': pd.Series(team_sizes).values,
+            'founder_details': founder_details,
+            'experience_distribution': experience_distribution,
+            'team_composition_score': team_composition_score.astype(np.float64)
+        }, index=index[valid_rows])
+    
     def find_competitors(self, company_name: str, industry: str = None) -> list:
         """Find competitors based on company name and industry"""
-        if self.companies_df is None:
+        if self.company_index is None:
             return []
             
         try:
-            # Filter by industry if provided
-            if industry:
-                competitors = self.companies_df[
-                    (self.companies_df['category_code'] == industry) &
-                    (self.companies_df['name'].str.contains(company_name, case=False, na=False) == False)
-                ].head(10)  # Increase to 10 results
-            else:
-                competitors = self.companies_df[
-                    self.companies_df['name'].str.contains(company_name, case=False, na=False) == False
-                ].head(10)  # Increase to 10 results
-                
-            # Convert to JSON-serializable format
-            result = []
-            for _, row in competitors.iterrows():
-                # Handle NaN values
-                funding_total = row.get('funding_total_usd', 0)
-                if pd.isna(funding_total) or np.isinf(funding_total):
-                    funding_total = 0.0
-                else:
-                    funding_total = float(funding_total)
-                
-                result.append({
-                    'name': row['name'],
-                    'permalink': row['permalink'],
-                    'domain': row.get('domain', ''),
-                    'funding_total_usd': funding_total,
-                    'category_code': row.get('category_code', '')
-                })
-            return result
+            return self.company_index.find_competitors(company_name, industry, limit=10)
         except Exception as e:
             print(f"Warning: Could not find competitors - {e}")
             return []
     
     def find_acquisition_targets(self, acquirer_name: str) -> list:
         """Find potential acquisition targets based on acquirer history"""
-        if self.acquisitions_df is None or self.companies_df is None:
+        if self.company_index is None or self.acquisitions_df is None:
             return []
             
         try:
-            # Find acquirer ID - use more flexible matching
-            acquirer_matches = self.companies_df[
-                self.companies_df['name'].str.contains(acquirer_name, case=False, na=False)
-            ].head(5)
-            
-            if acquirer_matches.empty:
-                return []
-                
-            # Use the first match
-            acquirer_id = acquirer_matches.iloc[0]['id']
-            
-            # Find past acquisitions by this company
-            acquisitions = self.acquisitions_df[
-                self.acquisitions_df['acquiring_object_id'] == acquirer_id
-            ].head(10)  # Increase to 10 results
-            
-            # Get acquired company details
-            targets = []
-            for _, acquisition in acquisitions.iterrows():
-                acquired_id = acquisition['acquired_object_id']
-                acquired_company = self.companies_df[
-                    self.companies_df['id'] == acquired_id
-                ]
-                
-                if not acquired_company.empty:
-                    company_row = acquired_company.iloc[0]
-                    
-                    # Handle NaN values for price_amount
-                    price_amount = acquisition.get('price_amount', 0)
-                    if pd.isna(price_amount) or np.isinf(price_amount):
-                        price_amount = 0.0
-                    else:
-                        price_amount = float(price_amount)
-                    
-                    targets.append({
-                        'name': company_row['name'],
-                        'permalink': company_row['permalink'],
-                        'domain': company_row.get('domain', ''),
-                        'price_amount': price_amount,
-                        'price_currency_code': acquisition.get('price_currency_code', 'USD'),
-                        'acquired_at': acquisition.get('acquired_at', ''),
-                        'category_code': company_row.get('category_code', '')
-                    })
-                    
-            return targets
+            return self.company_index.find_acquisition_targets(acquirer_name, limit=10)
         except Exception as e:
             print(f"Warning: Could not find acquisition targets - {e}")
             return []
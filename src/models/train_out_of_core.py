@@ -0,0 +1,305 @@
+"""
+Out-of-core training of the meta and valuation models.
+
+The in-memory trainers in ``train_with_crunchbase`` read the whole feature
+table, so they are limited by RAM. These trainers only ever hold one chunk
+of the feature CSV:
+
+1. One pass over the file feeds the columns behind the data-dependent cuts
+   (the meta target's 70th percentiles, the valuation target's 99th
+   percentile outlier cut) into ``QuantileSketch`` instances.
+2. An ``xgboost.DataIter`` streams the file again, applies the cuts and
+   hands the chunks to an ``ExtMemQuantileDMatrix``. That matrix is binned
+   and paged to a cache directory on disk, and training reads the pages
+   from there.
+3. A last pass scores the held-out rows chunk by chunk.
+
+Rows are held out by a hash of their startup_id (one in five), so the split
+does not depend on the chunk size or row order. The meta model is an
+XGBoost classifier weighted for balanced classes, since random forests
+cannot be trained from external memory; the valuation model is the usual
+XGBoost regressor. Both are saved as the API loads them.
+"""
+import os
+import shutil
+import tempfile
+import time
+from typing import Callable, List, Optional
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from .quantile_sketch import QuantileSketch
+from .train_with_crunchbase import META_FEATURE_COLUMNS, VALUATION_FEATURE_COLUMNS
+
+# XGBoost is required for out-of-core training
+try:
+    import xgboost as xgb
+except ImportError:
+    xgb = None
+
+TRAIN_CHUNK_SIZE = 100_000
+TEST_BUCKETS = 5
+
+
+def _chunks(path: str, columns: List[str], chunk_size: int):
+    return pd.read_csv(path, usecols=columns, chunksize=chunk_size)
+
+
+def _is_test_row(chunk: pd.DataFrame) -> np.ndarray:
+    """One row in ``TEST_BUCKETS``, chosen by a hash of startup_id."""
+    return (pd.util.hash_pandas_object(chunk['startup_id'], index=False).to_numpy() % TEST_BUCKETS) == 0
+
+
+def _report(label: str, chunk_number: int, rows: int, start: float, progress: bool) -> None:
+    if progress:
+        print(f"  [{label}] chunk {chunk_number}: {rows:,} rows ({time.perf_counter() - start:.1f}s)", flush=True)
+
+
+class _FeatureChunks(xgb.DataIter if xgb is not None else object):
+    """
+    Streams the training rows of a feature CSV into XGBoost.
+
+    Args:
+        path: Feature CSV
+        columns: Columns to read
+        prepare: Function turning a chunk into (X, y), or None to skip it
+        cache_prefix: Where XGBoost pages the binned matrix
+        chunk_size: Rows per chunk
+        progress: Report each chunk of the first pass
+    """
+
+    def __init__(self, path: str, columns: List[str], prepare: Callable, cache_prefix: str, chunk_size: int,
+                 progress: bool):
+        self.path = path
+        self.columns = columns
+        self.prepare = prepare
+        self.chunk_size = chunk_size
+        self.progress = progress
+        self.rows = 0
+        self._counted = False
+        self._reader = None
+        self._chunk_number = 0
+        self._start = time.perf_counter()
+        super().__init__(cache_prefix=cache_prefix)
+
+    def next(self, input_data: Callable) -> bool:
+        if self._reader is None:
+            self._reader = iter(_chunks(self.path, self.columns, self.chunk_size))
+        for chunk in self._reader:
+            self._chunk_number += 1
+            prepared = self.prepare(chunk)
+            if prepared is None or not len(prepared[0]):
+                continue
+            X, y = prepared
+            if not self._counted:
+                self.rows += len(X)
+                _report("train", self._chunk_number, self.rows, self._start, self.progress)
+            input_data(data=X, label=y)
+            return True
+        return False
+
+    def reset(self) -> None:
+        # XGBoost may read the data several times; count and report the first pass only
+        self._counted = self._counted or self._chunk_number > 0
+        self._reader = None
+        self._chunk_number = 0
+
+
+def _train_booster(path: str, columns: List[str], prepare: Callable, params: dict, num_rounds: int,
+                   chunk_size: int, cache_dir: Optional[str], progress: bool, label_weights: bool = False):
+    """Build the external-memory matrix from the training rows and train on it."""
+    if cache_dir:
+        os.makedirs(cache_dir, exist_ok=True)
+    cache_dir = tempfile.mkdtemp(prefix="xgb-extmem-", dir=cache_dir or None)
+    chunks = _FeatureChunks(path, columns, prepare, os.path.join(cache_dir, "train"), chunk_size, progress)
+    dtrain = None
+    try:
+        try:
+            dtrain = xgb.ExtMemQuantileDMatrix(chunks, max_bin=params.get("max_bin", 256))
+        except xgb.core.XGBoostError:
+            # XGBoost refuses a matrix without any batch
+            if chunks.rows == 0:
+                return None
+            raise
+        if dtrain.num_row() == 0:
+            return None
+        if label_weights:
+            # Balanced class weights, as the in-memory meta model uses
+            labels = dtrain.get_label()
+            positives = float(labels.sum())
+            params = {**params, "scale_pos_weight": (len(labels) - positives) / max(positives, 1.0)}
+        start = time.perf_counter()
+        booster = xgb.train(params, dtrain, num_boost_round=num_rounds)
+        if progress:
+            print(f"  [train] {num_rounds} rounds on {dtrain.num_row():,} rows in "
+                  f"{time.perf_counter() - start:.1f}s")
+        return booster
+    finally:
+        # The matrix owns the cache pages, so release it before removing them
+        del dtrain, chunks
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+
+def _as_estimator(booster, estimator_class):
+    """Wrap a trained booster in the sklearn estimator the API loads."""
+    model = estimator_class()
+    model.load_model(bytearray(booster.save_raw("ubj")))
+    return model
+
+
+def meta_thresholds(features_path: str, chunk_size: int = TRAIN_CHUNK_SIZE, progress: bool = True) -> dict:
+    """
+    Sketched 70th percentiles of total_raised_usd and team_strength_score.
+
+    Returns:
+        Column -> approximate 70th percentile
+    """
+    sketches = {'total_raised_usd': QuantileSketch(), 'team_strength_score': QuantileSketch()}
+    start, rows = time.perf_counter(), 0
+    for number, chunk in enumerate(_chunks(features_path, list(sketches), chunk_size), 1):
+        for column, sketch in sketches.items():
+            sketch.update(chunk[column].to_numpy(dtype=np.float64))
+        rows += len(chunk)
+        _report("scan", number, rows, start, progress)
+    return {column: sketch.quantile(0.7) for column, sketch in sketches.items()}
+
+
+def _meta_rows(thresholds: dict, test: bool) -> Callable:
+    def prepare(chunk):
+        # Same target and cleaning as train_with_crunchbase.meta_training_data
+        target = ((chunk['total_raised_usd'] > thresholds['total_raised_usd'])
+                  & (chunk['team_strength_score'] > thresholds['team_strength_score'])).astype(int)
+        keep = ~chunk[META_FEATURE_COLUMNS].isnull().any(axis=1).to_numpy() & (_is_test_row(chunk) == test)
+        return chunk.loc[keep, META_FEATURE_COLUMNS], target[keep]
+    return prepare
+
+
+def train_meta_model_out_of_core(features_path: str = "data/processed/crunchbase_features.csv",
+                                 model_path: str = "models/meta_model_crunchbase.joblib",
+                                 chunk_size: int = TRAIN_CHUNK_SIZE, params: Optional[dict] = None,
+                                 num_rounds: int = 100, cache_dir: Optional[str] = None, progress: bool = True):
+    """
+    Train the meta model from a feature CSV without loading it into memory.
+
+    Args:
+        features_path: Feature CSV
+        model_path: Where to save the model
+        chunk_size: Rows read at a time
+        params: XGBoost parameters overriding the defaults
+        num_rounds: Boosting rounds
+        cache_dir: Directory for the external-memory pages (default: the system temporary directory)
+        progress: Print per-chunk progress
+
+    Returns:
+        ``model_path``, or None if there was nothing to train on
+    """
+    if xgb is None:
+        raise ImportError("xgboost is required for out-of-core training")
+    print("Training meta model out of core...")
+    if not os.path.exists(features_path):
+        print(f"{features_path} not found. Please run the dataset processing pipeline first.")
+        return
+
+    thresholds = meta_thresholds(features_path, chunk_size, progress)
+    print(f"Target thresholds: {thresholds}")
+    columns = ['startup_id'] + META_FEATURE_COLUMNS
+    params = {"objective": "binary:logistic", "tree_method": "hist", "max_bin": 256, "seed": 42, **(params or {})}
+    booster = _train_booster(features_path, columns, _meta_rows(thresholds, test=False), params,
+                             num_rounds, chunk_size, cache_dir, progress, label_weights=True)
+    if booster is None:
+        print("No valid data after cleaning.")
+        return
+
+    correct = total = 0
+    for chunk in _chunks(features_path, columns, chunk_size):
+        X, y = _meta_rows(thresholds, test=True)(chunk)
+        if len(X):
+            correct += int(((booster.inplace_predict(X) >= 0.5) == y.to_numpy()).sum())
+            total += len(X)
+    if total:
+        print(f"Accuracy: {correct / total:.4f} on {total:,} held-out rows")
+
+    joblib.dump(_as_estimator(booster, xgb.XGBClassifier), model_path)
+    print(f"Meta model saved as {model_path}!")
+    return model_path
+
+
+def valuation_cut(features_path: str, chunk_size: int = TRAIN_CHUNK_SIZE, progress: bool = True) -> float:
+    """Sketched 99th percentile of valuation_12m_forward over the valid rows."""
+    sketch = QuantileSketch()
+    start, rows = time.perf_counter(), 0
+    for number, chunk in enumerate(_chunks(features_path, VALUATION_FEATURE_COLUMNS + ['valuation_12m_forward'],
+                                           chunk_size), 1):
+        sketch.update(chunk.loc[_valid_valuation_rows(chunk), 'valuation_12m_forward'].to_numpy(dtype=np.float64))
+        rows += len(chunk)
+        _report("scan", number, rows, start, progress)
+    return sketch.quantile(0.99)
+
+
+def _valid_valuation_rows(chunk: pd.DataFrame) -> np.ndarray:
+    X = chunk[VALUATION_FEATURE_COLUMNS]
+    y = chunk['valuation_12m_forward']
+    return (~(X.isnull().any(axis=1) | y.isnull() | np.isinf(y) | np.isinf(X).any(axis=1))).to_numpy()
+
+
+def _valuation_rows(cut: float, test: bool) -> Callable:
+    def prepare(chunk):
+        # Same cleaning and outlier cut as train_with_crunchbase.valuation_training_data
+        keep = _valid_valuation_rows(chunk)
+        keep &= (chunk['valuation_12m_forward'] <= cut).to_numpy() & (_is_test_row(chunk) == test)
+        return chunk.loc[keep, VALUATION_FEATURE_COLUMNS], chunk.loc[keep, 'valuation_12m_forward']
+    return prepare
+
+
+def train_valuation_model_out_of_core(features_path: str = "data/processed/crunchbase_features_with_targets.csv",
+                                      model_path: str = "models/valuation_model_crunchbase.joblib",
+                                      chunk_size: int = TRAIN_CHUNK_SIZE, params: Optional[dict] = None,
+                                      num_rounds: int = 100, cache_dir: Optional[str] = None,
+                                      progress: bool = True):
+    """
+    Train the valuation model from a feature CSV without loading it into memory.
+
+    Args:
+        features_path: Feature CSV with valuation_12m_forward
+        model_path: Where to save the model
+        chunk_size: Rows read at a time
+        params: XGBoost parameters overriding the defaults
+        num_rounds: Boosting rounds
+        cache_dir: Directory for the external-memory pages (default: the system temporary directory)
+        progress: Print per-chunk progress
+
+    Returns:
+        ``model_path``, or None if there was nothing to train on
+    """
+    if xgb is None:
+        raise ImportError("xgboost is required for out-of-core training")
+    print("\nTraining valuation model out of core...")
+    if not os.path.exists(features_path):
+        print(f"{features_path} not found. Please run the dataset processing pipeline first.")
+        return
+
+    cut = valuation_cut(features_path, chunk_size, progress)
+    print(f"Outlier cut (99th percentile): {cut:,.2f}")
+    columns = ['startup_id', 'valuation_12m_forward'] + VALUATION_FEATURE_COLUMNS
+    params = {"objective": "reg:squarederror", "tree_method": "hist", "max_bin": 256, "seed": 42,
+              **(params or {})}
+    booster = _train_booster(features_path, columns, _valuation_rows(cut, test=False), params,
+                             num_rounds, chunk_size, cache_dir, progress)
+    if booster is None:
+        print("No valid data after cleaning.")
+        return
+
+    absolute_error = total = 0
+    for chunk in _chunks(features_path, columns, chunk_size):
+        X, y = _valuation_rows(cut, test=True)(chunk)
+        if len(X):
+            absolute_error += float(np.abs(booster.inplace_predict(X) - y.to_numpy()).sum())
+            total += len(X)
+    if total:
+        print(f"MAE: ${absolute_error / total:,.2f} on {total:,} held-out rows")
+
+    joblib.dump(_as_estimator(booster, xgb.XGBRegressor), model_path)
+    print(f"Valuation model saved as {model_path}!")
+    return model_path
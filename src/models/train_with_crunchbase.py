@@ -4,8 +4,49 @@ from sklearn.model_selection import train_test_split
 from sklearn.ensemble import RandomForestClassifier, RandomForestRegressor
 from sklearn.metrics import accuracy_score, mean_absolute_error
 from sklearn.preprocessing import LabelEncoder
+from scipy.stats import spearmanr
 import joblib
+import json
 import os
+import time
+
+from .funding_agent import round_type_codes
+from .inference_plan import _without_feature_name_check
+from .tree_engine import compile_model
+
+# XGBoost is optional: without it the valuation model is a random forest
+try:
+    from xgboost import XGBRegressor
+except ImportError:
+    XGBRegressor = None
+
+# LightGBM is optional: it is only needed for the "lightgbm" backend
+try:
+    import lightgbm
+except ImportError:
+    lightgbm = None
+
+# "default": random forest meta model and XGBoost (or random forest) valuation model.
+# "lightgbm": LightGBM for both, with histogram binning and last_round_type as a
+# native categorical feature.
+MODEL_BACKENDS = ('default', 'lightgbm')
+
+# Encoded last_round_type (funding_agent.ROUND_TYPES), a feature of the LightGBM models
+ROUND_TYPE_CODE_COLUMN = 'last_round_type_code'
+
+# Feature columns used by the meta model
+META_FEATURE_COLUMNS = [
+    'num_rounds', 'total_raised_usd', 'avg_round_size',
+    'team_strength_score', 'founder_count', 'avg_experience', 'exits_count',
+    'market_similarity', 'tech_similarity', 'revenue_synergy_score',
+    'cost_synergy_score', 'overall_synergy_score'
+]
+
+# Feature columns used by the valuation model
+VALUATION_FEATURE_COLUMNS = META_FEATURE_COLUMNS + [
+    'revenue_ttm', 'revenue_growth_mom', 'gross_margin', 'ebitda_margin',
+    'revenue_multiple_proxy', 'valuation_proxy_current'
+]
 
 def mean_absolute_percentage_error(y_true, y_pred):
     """Calculate Mean Absolute Percentage Error"""
@@ -16,17 +57,129 @@ def mean_absolute_percentage_error(y_true, y_pred):
         return np.inf
     return np.mean(np.abs((y_true[mask] - y_pred[mask]) / y_true[mask])) * 100
 
-def train_meta_model_with_crunchbase():
-    """Train the meta model using Crunchbase data"""
-    print("Training meta model with Crunchbase data...")
+def _check_backend(backend):
+    if backend not in MODEL_BACKENDS:
+        raise ValueError(f"Unknown model backend: {backend} (expected one of {', '.join(MODEL_BACKENDS)})")
+    if backend == 'lightgbm' and lightgbm is None:
+        raise ImportError("lightgbm is required for the lightgbm backend")
+
+def _with_round_type(X, df, backend):
+    # Unknown round types stay NaN, which LightGBM treats as missing
+    if backend != 'lightgbm':
+        return X
+    return X.assign(**{ROUND_TYPE_CODE_COLUMN: round_type_codes(df.loc[X.index, 'last_round_type'])})
+
+def meta_training_data(df, backend='default'):
+    """
+    Features and target of the meta model
+
+    Target: 1 if company has strong funding and team (both above their 70th
+    percentile), 0 otherwise. Rows with missing values are dropped. The
+    lightgbm backend also gets the encoded last round type.
+    """
+    target = (
+        (df['total_raised_usd'] > df['total_raised_usd'].quantile(0.7)) & 
+        (df['team_strength_score'] > df['team_strength_score'].quantile(0.7))
+    ).astype(int)
+    X = df[META_FEATURE_COLUMNS]
     
-    # Check if features file exists
-    if not os.path.exists("data/processed/crunchbase_features.csv"):
-        print("Crunchbase features file not found. Please run the dataset processing pipeline first.")
-        return
+    # Remove any rows with NaN values
+    mask = ~(X.isnull().any(axis=1) | target.isnull())
+    return _with_round_type(X[mask], df, backend), target[mask]
+
+def valuation_training_data(df, backend='default'):
+    """
+    Features and valuation_12m_forward target of the valuation model
+
+    Rows with missing or infinite values and targets beyond the 99th
+    percentile are dropped. The lightgbm backend also gets the encoded last
+    round type.
+    """
+    X = df[VALUATION_FEATURE_COLUMNS]
+    y = df["valuation_12m_forward"]
+    
+    # Remove any rows with NaN values or infinite values
+    mask = ~(X.isnull().any(axis=1) | y.isnull() | np.isinf(y) | np.isinf(X).any(axis=1))
+    X = _with_round_type(X[mask], df, backend)
+    y = y[mask]
+    
+    # Also remove extreme outliers (values beyond 99th percentile)
+    if len(X):
+        mask = y <= np.percentile(y, 99)
+        X = X[mask]
+        y = y[mask]
+    return X, y
+
+def split_training_data(X, y):
+    """The train/test split shared by training and tuning"""
+    return train_test_split(X, y, test_size=0.2, random_state=42)
+
+# LightGBM defaults: 255 histogram bins per feature, single-threaded for
+# serving (training uses every core, see _fit_on_all_cores)
+LIGHTGBM_PARAMS = {'n_estimators': 100, 'max_bin': 255, 'random_state': 42, 'n_jobs': 1, 'verbose': -1}
+
+def make_meta_model(params=None, backend='default'):
+    """The meta model's classifier; ``params`` (e.g. tuned ones) override the defaults"""
+    _check_backend(backend)
+    if backend == 'lightgbm':
+        return lightgbm.LGBMClassifier(**{**LIGHTGBM_PARAMS, 'class_weight': 'balanced', **(params or {})})
+    return RandomForestClassifier(**{'n_estimators': 100, 'random_state': 42, 'class_weight': 'balanced',
+                                     **(params or {})})
+
+def make_valuation_model(params=None, backend='default'):
+    """The valuation model's regressor (XGBoost if installed); ``params`` override the defaults"""
+    _check_backend(backend)
+    if backend == 'lightgbm':
+        return lightgbm.LGBMRegressor(**{**LIGHTGBM_PARAMS, **(params or {})})
+    if XGBRegressor is not None:
+        return XGBRegressor(**{'random_state': 42, 'n_estimators': 100, **(params or {})})
+    return RandomForestRegressor(**{'n_estimators': 100, 'random_state': 42, **(params or {})})
+
+def _fit_on_all_cores(model, X, y, **fit_params):
+    # Forests and LightGBM train on every core, but keep the default n_jobs for
+    # serving, where spreading one row over a thread pool only adds latency
+    if isinstance(model, (RandomForestClassifier, RandomForestRegressor)) or \
+            (lightgbm is not None and isinstance(model, lightgbm.LGBMModel)):
+        n_jobs = model.n_jobs
+        model.set_params(n_jobs=-1)
+        model.fit(X, y, **fit_params)
+        model.set_params(n_jobs=n_jobs)
+    else:
+        model.fit(X, y, **fit_params)
+    return model
+
+def _fit_params(X):
+    # The encoded round type is a native categorical feature of the LightGBM models
+    if ROUND_TYPE_CODE_COLUMN in X.columns:
+        return {'categorical_feature': [ROUND_TYPE_CODE_COLUMN]}
+    return {}
+
+def train_meta_model_with_crunchbase(df=None, model_path="models/meta_model_crunchbase.joblib", params=None,
+                                     backend='default'):
+    """
+    Train the meta model using Crunchbase data
+
+    Args:
+        df: Feature table; read from data/processed/crunchbase_features.csv if omitted.
+            It is not modified.
+        model_path: Where to save the model
+        params: Model parameters overriding the defaults, e.g. from ``tune_models``
+        backend: One of ``MODEL_BACKENDS``
+
+    Returns:
+        ``model_path``, or None if there was nothing to train on
+    """
+    print("Training meta model with Crunchbase data...")
+    _check_backend(backend)
     
-    # Load the features data
-    df = pd.read_csv("data/processed/crunchbase_features.csv")
+    if df is None:
+        # Check if features file exists
+        if not os.path.exists("data/processed/crunchbase_features.csv"):
+            print("Crunchbase features file not found. Please run the dataset processing pipeline first.")
+            return
+        
+        # Load the features data
+        df = pd.read_csv("data/processed/crunchbase_features.csv")
     
     if df.empty:
         print("No data found in features file.")
@@ -34,31 +187,9 @@ def train_meta_model_with_crunchbase():
     
     print(f"Loaded {len(df)} records for training")
     
-    # Create a more realistic target variable
-    # Target: 1 if company has strong funding and team, 0 otherwise
-    df['target'] = (
-        (df['total_raised_usd'] > df['total_raised_usd'].quantile(0.7)) & 
-        (df['team_strength_score'] > df['team_strength_score'].quantile(0.7))
-    ).astype(int)
-    
-    print(f"Target distribution: {df['target'].value_counts().to_dict()}")
-    
-    # Define the feature columns that should be used for the meta model
-    meta_feature_columns = [
-        'num_rounds', 'total_raised_usd', 'avg_round_size',
-        'team_strength_score', 'founder_count', 'avg_experience', 'exits_count',
-        'market_similarity', 'tech_similarity', 'revenue_synergy_score',
-        'cost_synergy_score', 'overall_synergy_score'
-    ]
-    
     # Prepare features and target
-    X = df[meta_feature_columns]
-    y = df["target"]
-    
-    # Remove any rows with NaN values
-    mask = ~(X.isnull().any(axis=1) | y.isnull())
-    X = X[mask]
-    y = y[mask]
+    X, y = meta_training_data(df, backend)
+    print(f"Target distribution: {y.value_counts().to_dict()}")
     
     if len(X) == 0:
         print("No valid data after cleaning.")
@@ -67,11 +198,10 @@ def train_meta_model_with_crunchbase():
     print(f"Training on {len(X)} samples with {len(X.columns)} features")
     
     # Split the data
-    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+    X_train, X_test, y_train, y_test = split_training_data(X, y)
     
     # Train the model
-    model = RandomForestClassifier(n_estimators=100, random_state=42, class_weight='balanced')
-    model.fit(X_train, y_train)
+    model = _fit_on_all_cores(make_meta_model(params, backend), X_train, y_train, **_fit_params(X_train))
     
     # Make predictions
     preds = model.predict(X_test)
@@ -93,20 +223,36 @@ def train_meta_model_with_crunchbase():
     print(feature_importance.head(10))
     
     # Save the model
-    joblib.dump(model, "models/meta_model_crunchbase.joblib")
-    print("Meta model saved as models/meta_model_crunchbase.joblib!")
+    joblib.dump(model, model_path)
+    print(f"Meta model saved as {model_path}!")
+    return model_path
+
+def train_valuation_model_with_crunchbase(df=None, model_path="models/valuation_model_crunchbase.joblib", params=None,
+                                          backend='default'):
+    """
+    Train the valuation model using Crunchbase data
 
-def train_valuation_model_with_crunchbase():
-    """Train the valuation model using Crunchbase data"""
+    Args:
+        df: Feature table with valuation_12m_forward; read from
+            data/processed/crunchbase_features_with_targets.csv if omitted
+        model_path: Where to save the model
+        params: Model parameters overriding the defaults, e.g. from ``tune_models``
+        backend: One of ``MODEL_BACKENDS``
+
+    Returns:
+        ``model_path``, or None if there was nothing to train on
+    """
     print("\nTraining valuation model with Crunchbase data...")
+    _check_backend(backend)
     
-    # Check if features file exists
-    if not os.path.exists("data/processed/crunchbase_features_with_targets.csv"):
-        print("Crunchbase features with targets file not found. Please run the dataset processing pipeline first.")
-        return
-    
-    # Load the features data
-    df = pd.read_csv("data/processed/crunchbase_features_with_targets.csv")
+    if df is None:
+        # Check if features file exists
+        if not os.path.exists("data/processed/crunchbase_features_with_targets.csv"):
+            print("Crunchbase features with targets file not found. Please run the dataset processing pipeline first.")
+            return
+        
+        # Load the features data
+        df = pd.read_csv("data/processed/crunchbase_features_with_targets.csv")
     
     if df.empty:
         print("No data found in features file.")
@@ -114,56 +260,30 @@ def train_valuation_model_with_crunchbase():
     
     print(f"Loaded {len(df)} records for training")
     
-    # Define the feature columns that should be used for the valuation model
-    valuation_feature_columns = [
-        'num_rounds', 'total_raised_usd', 'avg_round_size',
-        'team_strength_score', 'founder_count', 'avg_experience', 'exits_count',
-        'market_similarity', 'tech_similarity', 'revenue_synergy_score',
-        'cost_synergy_score', 'overall_synergy_score',
-        'revenue_ttm', 'revenue_growth_mom', 'gross_margin', 'ebitda_margin',
-        'revenue_multiple_proxy', 'valuation_proxy_current'
-    ]
-    
     # Prepare features and target
-    X = df[valuation_feature_columns]
-    y = df["valuation_12m_forward"]
-    
-    # Remove any rows with NaN values or infinite values
-    mask = ~(X.isnull().any(axis=1) | y.isnull() | np.isinf(y) | np.isinf(X).any(axis=1))
-    X = X[mask]
-    y = y[mask]
+    X, y = valuation_training_data(df, backend)
     
     if len(X) == 0:
         print("No valid data after cleaning.")
         return
     
-    # Also remove extreme outliers (values beyond 99th percentile)
-    y_upper_limit = np.percentile(y, 99)
-    mask = y <= y_upper_limit
-    X = X[mask]
-    y = y[mask]
-    
-    if len(X) == 0:
-        print("No valid data after outlier removal.")
-        return
-    
     print(f"Training on {len(X)} samples with {len(X.columns)} features")
     print(f"Target variable statistics: min={y.min():.2f}, max={y.max():.2f}, median={np.median(y):.2f}")
     
     # Split the data
-    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+    X_train, X_test, y_train, y_test = split_training_data(X, y)
     
-    # Try to import and use XGBRegressor, fallback to RandomForestRegressor if unavailable
-    try:
-        from xgboost import XGBRegressor
-        model = XGBRegressor(random_state=42, n_estimators=100)
+    # LGBMRegressor, XGBRegressor, or RandomForestRegressor if xgboost is unavailable
+    model = make_valuation_model(params, backend)
+    if backend == 'lightgbm':
+        print("Using LGBMRegressor")
+    elif XGBRegressor is not None:
         print("Using XGBRegressor")
-    except ImportError:
-        model = RandomForestRegressor(n_estimators=100, random_state=42)
+    else:
         print("Using RandomForestRegressor (xgboost not available)")
     
     # Train the model
-    model.fit(X_train, y_train)
+    _fit_on_all_cores(model, X_train, y_train, **_fit_params(X_train))
     
     # Make predictions
     preds = model.predict(X_test)
@@ -186,8 +306,136 @@ def train_valuation_model_with_crunchbase():
         print(feature_importance.head(10))
     
     # Save the model
-    joblib.dump(model, "models/valuation_model_crunchbase.joblib")
-    print("Valuation model saved as models/valuation_model_crunchbase.joblib!")
+    joblib.dump(model, model_path)
+    print(f"Valuation model saved as {model_path}!")
+    return model_path
+
+# A few shallow trees: the meta model only contributes 20% of the decision score
+META_STUDENT_PARAMS = {'n_estimators': 10, 'max_depth': 6, 'min_samples_leaf': 20}
+
+def scoring_latency_us(model, X, repeats=50):
+    """
+    Median single-row scoring time in microseconds on the API's scoring path
+
+    Models that the tree engine can compile are timed compiled, as the API
+    serves them; others the way ``InferencePlan`` calls them.
+    """
+    try:
+        model = compile_model(model)
+    except ValueError:
+        model = _without_feature_name_check(model)
+    predict = model.predict_proba if getattr(model, 'classes_', None) is not None else model.predict
+    row = np.asarray(X, dtype=np.float64)[:1]
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        predict(row)
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings) * 1e6)
+
+def model_node_count(model):
+    """Total number of tree nodes of a forest, booster or LightGBM model"""
+    if hasattr(model, 'estimators_'):
+        return int(sum(tree.tree_.node_count for tree in model.estimators_))
+    if lightgbm is not None and isinstance(model, lightgbm.LGBMModel):
+        return int(sum(2 * tree['num_leaves'] - 1 for tree in model.booster_.dump_model()['tree_info']))
+    return int(len(compile_model(model).feature))
+
+def soft_label_data(X, proba):
+    """
+    Rows weighted by a teacher's positive-class probabilities
+
+    Every row appears once as class 1 with weight ``proba`` and once as
+    class 0 with weight ``1 - proba``, so a classifier fitted with these
+    sample weights learns the teacher's probabilities rather than its labels.
+    """
+    X = pd.concat([X, X])
+    y = np.r_[np.ones(len(proba), dtype=int), np.zeros(len(proba), dtype=int)]
+    weights = np.r_[proba, 1.0 - proba]
+    keep = weights > 0
+    return X[keep], y[keep], weights[keep]
+
+def distill_meta_model(df=None, teacher_path="models/meta_model_crunchbase.joblib",
+                       model_path="models/meta_model_crunchbase.student.joblib", params=None):
+    """
+    Distill the meta model into a small forest trained on its predict_proba outputs
+
+    The student is a ``RandomForestClassifier`` too, so the tree engine, the
+    ``.trees.npz`` export and the API's scoring path serve it unchanged. It is
+    fitted on the training split; fidelity is measured on the test split:
+    mean and max absolute error of the probabilities against the teacher, the
+    Spearman rank correlation between them and the share of equal labels.
+
+    Args:
+        df: Feature table; read from data/processed/crunchbase_features.csv if omitted
+        teacher_path: The trained meta model
+        model_path: Where to save the student; the report is written next to it as .json
+        params: Student parameters overriding ``META_STUDENT_PARAMS``
+
+    Returns:
+        The report dict, or None if there was nothing to distill
+    """
+    print("\nDistilling the meta model...")
+
+    if not os.path.exists(teacher_path):
+        print(f"Meta model {teacher_path} not found. Please train it first.")
+        return
+    teacher = joblib.load(teacher_path)
+
+    if df is None:
+        if not os.path.exists("data/processed/crunchbase_features.csv"):
+            print("Crunchbase features file not found. Please run the dataset processing pipeline first.")
+            return
+        df = pd.read_csv("data/processed/crunchbase_features.csv")
+
+    # A LightGBM teacher also takes the encoded round type; the student gets the same columns
+    backend = 'lightgbm' if ROUND_TYPE_CODE_COLUMN in getattr(teacher, 'feature_names_in_', []) else 'default'
+    X, y = meta_training_data(df, backend)
+    if len(X) == 0:
+        print("No valid data after cleaning.")
+        return
+    X_train, X_test, y_train, y_test = split_training_data(X, y)
+
+    X_soft, y_soft, weights = soft_label_data(X_train, teacher.predict_proba(X_train)[:, 1])
+    student = RandomForestClassifier(**{'random_state': 42, **META_STUDENT_PARAMS, **(params or {})})
+    student.set_params(n_jobs=-1)
+    student.fit(X_soft, y_soft, sample_weight=weights)
+    student.set_params(n_jobs=None)
+
+    teacher_proba = teacher.predict_proba(X_test)[:, 1]
+    student_proba = student.predict_proba(X_test)[:, 1]
+    teacher_latency = scoring_latency_us(teacher, X_test)
+    student_latency = scoring_latency_us(student, X_test)
+    errors = np.abs(student_proba - teacher_proba)
+    report = {
+        'teacher': teacher_path,
+        'student': model_path,
+        'params': student.get_params(),
+        'test_rows': int(len(X_test)),
+        'proba_mae': float(errors.mean()),
+        'proba_max_error': float(errors.max()),
+        'rank_correlation': float(spearmanr(teacher_proba, student_proba)[0]),
+        'label_agreement': float(np.mean((teacher_proba >= 0.5) == (student_proba >= 0.5))),
+        'teacher_accuracy': float(accuracy_score(y_test, teacher.predict(X_test))),
+        'student_accuracy': float(accuracy_score(y_test, student.predict(X_test))),
+        'teacher_nodes': model_node_count(teacher),
+        'student_nodes': model_node_count(student),
+        'teacher_latency_us': round(teacher_latency, 2),
+        'student_latency_us': round(student_latency, 2),
+        'speedup': round(teacher_latency / student_latency, 2)
+    }
+
+    print(f"Probability MAE vs teacher: {report['proba_mae']:.4f} (max {report['proba_max_error']:.4f})")
+    print(f"Rank correlation: {report['rank_correlation']:.4f}, label agreement: {report['label_agreement']:.4f}")
+    print(f"Accuracy: teacher {report['teacher_accuracy']:.4f}, student {report['student_accuracy']:.4f}")
+    print(f"Single-row latency: {teacher_latency:.0f} us -> {student_latency:.0f} us "
+          f"({report['speedup']}x, {report['teacher_nodes']} -> {report['student_nodes']} nodes)")
+
+    joblib.dump(student, model_path)
+    with open(os.path.splitext(model_path)[0] + ".json", "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Meta model student saved as {model_path}!")
+    return report
 
 def compare_models():
     """Compare the new models with the existing ones"""
@@ -210,6 +458,7 @@ if __name__ == "__main__":
     # Train models with Crunchbase data
     train_meta_model_with_crunchbase()
     train_valuation_model_with_crunchbase()
+    distill_meta_model()
     
     # Compare models
     compare_models()
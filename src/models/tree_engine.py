@@ -0,0 +1,282 @@
+"""
+Flat-array evaluator for the fitted tree ensembles.
+
+The meta model (a scikit-learn ``RandomForestClassifier``) and the valuation
+model (an ``XGBRegressor``) are exported into packed NumPy node arrays:
+feature, threshold, left, right, missing direction and leaf value, with the
+nodes of every tree concatenated. A row is scored by walking all trees at
+once, one depth level per step, so a single-row prediction costs a few dozen
+vectorized NumPy operations instead of one Python dispatch and one input
+validation per tree.
+
+Evaluation reproduces the libraries' arithmetic: inputs are rounded to
+float32 as both libraries do, thresholds compare the same way (``<=`` for
+scikit-learn, ``<`` for XGBoost) and tree outputs are accumulated in tree
+order, so the results are bit-identical to ``predict_proba`` and ``predict``.
+
+Exported models are plain ``.npz`` files. Loading and scoring them needs only
+NumPy, so scoring workers can run without scikit-learn or XGBoost installed.
+
+Usage:
+    python -m src.models.tree_engine models/meta_model_crunchbase.joblib models/valuation_model_crunchbase.joblib
+"""
+import json
+import os
+import sys
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+FOREST_CLASSIFIER = "forest_classifier"
+BOOSTED_REGRESSOR = "boosted_regressor"
+
+
+class TreeEnsembleEvaluator:
+    """
+    Tree ensemble packed into flat node arrays.
+
+    Leaf nodes point to themselves, so every row can take exactly
+    ``max_depth`` steps without checking which trees have already finished.
+    """
+
+    def __init__(self, kind: str, feature: np.ndarray, threshold: np.ndarray, left: np.ndarray,
+                 right: np.ndarray, missing_left: np.ndarray, value: np.ndarray, roots: np.ndarray,
+                 max_depth: int, feature_names: Optional[Sequence[str]] = None, n_features: int = 0,
+                 classes: Optional[Sequence] = None, base_score: float = 0.0):
+        if kind not in (FOREST_CLASSIFIER, BOOSTED_REGRESSOR):
+            raise ValueError(f"Unknown tree ensemble kind: {kind}")
+        self.kind = kind
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.missing_left = missing_left
+        self.value = value
+        self.roots = roots
+        self.max_depth = int(max_depth)
+        self.feature_names = list(feature_names) if feature_names is not None else None
+        self.n_features = int(n_features or (len(self.feature_names) if self.feature_names else 0))
+        self.classes_ = np.asarray(classes) if classes is not None else None
+        self.base_score = np.float32(base_score)
+
+    @property
+    def feature_names_in_(self) -> Optional[np.ndarray]:
+        return np.asarray(self.feature_names, dtype=object) if self.feature_names is not None else None
+
+    @property
+    def n_features_in_(self) -> int:
+        return self.n_features
+
+    @property
+    def n_trees(self) -> int:
+        return len(self.roots)
+
+    def _leaves(self, X) -> np.ndarray:
+        """Leaf node index reached in every tree, shape (n_rows, n_trees)."""
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim != 2 or X.shape[1] != self.n_features:
+            raise ValueError(f"Expected input of shape (n_rows, {self.n_features}), got {X.shape}")
+
+        rows = np.arange(X.shape[0])[:, None]
+        nodes = np.repeat(self.roots[None, :], X.shape[0], axis=0)
+        for _ in range(self.max_depth):
+            values = X[rows, self.feature[nodes]]
+            threshold = self.threshold[nodes]
+            if self.kind == FOREST_CLASSIFIER:
+                go_left = values <= threshold
+            else:
+                go_left = values < threshold
+            missing = np.isnan(values)
+            if missing.any():
+                go_left = np.where(missing, self.missing_left[nodes], go_left)
+            nodes = np.where(go_left, self.left[nodes], self.right[nodes])
+        return nodes
+
+    def predict_proba(self, X) -> np.ndarray:
+        """Class probabilities, identical to ``RandomForestClassifier.predict_proba``."""
+        if self.kind != FOREST_CLASSIFIER:
+            raise ValueError("predict_proba is only available for forest classifiers")
+        leaf_values = self.value[self._leaves(X)]
+        # Sum the trees in order, as scikit-learn accumulates them, then average
+        proba = np.cumsum(leaf_values, axis=1)[:, -1]
+        proba /= self.n_trees
+        return proba
+
+    def predict(self, X) -> np.ndarray:
+        """Predictions, identical to the source model's ``predict``."""
+        if self.kind == FOREST_CLASSIFIER:
+            return self.classes_.take(np.argmax(self.predict_proba(X), axis=1), axis=0)
+        leaf_values = self.value[self._leaves(X), 0]
+        # XGBoost starts from the base score and adds each tree's output in float32
+        margins = np.empty((leaf_values.shape[0], leaf_values.shape[1] + 1), dtype=np.float32)
+        margins[:, 0] = self.base_score
+        margins[:, 1:] = leaf_values
+        return np.cumsum(margins, axis=1, dtype=np.float32)[:, -1]
+
+    def save(self, path: str) -> None:
+        """Write the node arrays and metadata to an uncompressed ``.npz`` file."""
+        meta = {
+            "kind": self.kind,
+            "max_depth": self.max_depth,
+            "feature_names": self.feature_names,
+            "n_features": self.n_features,
+            "classes": self.classes_.tolist() if self.classes_ is not None else None,
+            "base_score": float(self.base_score)
+        }
+        np.savez(
+            path, feature=self.feature, threshold=self.threshold, left=self.left, right=self.right,
+            missing_left=self.missing_left, value=self.value, roots=self.roots,
+            meta=np.array(json.dumps(meta))
+        )
+
+    @classmethod
+    def load(cls, path: str) -> 'TreeEnsembleEvaluator':
+        """Load an exported ensemble. Needs only NumPy."""
+        with np.load(path) as archive:
+            arrays = {name: archive[name] for name in archive.files}
+        meta = json.loads(str(arrays.pop("meta")))
+        return cls(
+            meta["kind"], arrays["feature"], arrays["threshold"], arrays["left"], arrays["right"],
+            arrays["missing_left"], arrays["value"], arrays["roots"], meta["max_depth"],
+            feature_names=meta["feature_names"], n_features=meta["n_features"],
+            classes=meta["classes"], base_score=meta["base_score"]
+        )
+
+
+def _pack(trees: List[dict]) -> dict:
+    """Concatenate per-tree node arrays, offsetting child indices; leaves point to themselves."""
+    offsets = np.cumsum([0] + [len(tree["feature"]) for tree in trees])
+    packed = {name: [] for name in ("feature", "threshold", "left", "right", "missing_left", "value")}
+    for offset, tree in zip(offsets, trees):
+        n_nodes = len(tree["feature"])
+        own = np.arange(n_nodes)
+        is_leaf = tree["left"] < 0
+        packed["feature"].append(np.where(is_leaf, 0, tree["feature"]).astype(np.intp))
+        packed["threshold"].append(np.asarray(tree["threshold"], dtype=np.float64))
+        packed["left"].append(np.where(is_leaf, own, tree["left"]).astype(np.intp) + offset)
+        packed["right"].append(np.where(is_leaf, own, tree["right"]).astype(np.intp) + offset)
+        packed["missing_left"].append(np.asarray(tree["missing_left"], dtype=bool))
+        packed["value"].append(tree["value"])
+    arrays = {name: np.concatenate(parts) for name, parts in packed.items()}
+    arrays["roots"] = offsets[:-1].astype(np.intp)
+    return arrays
+
+
+def compile_forest(model) -> TreeEnsembleEvaluator:
+    """Export a fitted scikit-learn ``RandomForestClassifier`` (duck-typed, no sklearn import)."""
+    if getattr(model, "n_outputs_", 1) != 1:
+        raise ValueError("Only single-output forests can be compiled")
+    # scikit-learn 1.4 and later store the leaf class fractions and return them as they are
+    version = getattr(sys.modules.get("sklearn"), "__version__", "0")
+    normalize = tuple(int(part) for part in version.split(".")[:2] if part.isdigit()) < (1, 4)
+    trees = []
+    max_depth = 0
+    for estimator in model.estimators_:
+        tree = estimator.tree_
+        value = np.array(tree.value[:, 0, :len(model.classes_)], dtype=np.float64)
+        if normalize:
+            # Leaf class counts, normalized the way DecisionTreeClassifier.predict_proba does
+            normalizer = value.sum(axis=1)[:, np.newaxis]
+            normalizer[normalizer == 0.0] = 1.0
+            value /= normalizer
+        trees.append({
+            "feature": tree.feature,
+            "threshold": tree.threshold,
+            "left": tree.children_left,
+            "right": tree.children_right,
+            "missing_left": getattr(tree, "missing_go_to_left", np.zeros(tree.node_count, dtype=bool)),
+            "value": value
+        })
+        max_depth = max(max_depth, int(tree.max_depth))
+    return TreeEnsembleEvaluator(
+        FOREST_CLASSIFIER, **_pack(trees), max_depth=max_depth,
+        feature_names=getattr(model, "feature_names_in_", None), n_features=model.n_features_in_,
+        classes=model.classes_
+    )
+
+
+def compile_booster(model) -> TreeEnsembleEvaluator:
+    """
+    Export a fitted XGBoost regressor (``XGBRegressor`` or ``Booster``).
+
+    Only numerical splits and the identity-link ``reg:squarederror`` objective
+    are supported; anything else raises ValueError rather than scoring wrongly.
+    """
+    booster = model.get_booster() if hasattr(model, "get_booster") else model
+    learner = json.loads(bytes(booster.save_raw("json")))["learner"]
+    objective = learner["objective"]["name"]
+    if objective != "reg:squarederror":
+        raise ValueError(f"Only reg:squarederror boosters can be compiled, not {objective}")
+    gbtree = learner["gradient_booster"]
+    if gbtree.get("name") != "gbtree":
+        raise ValueError(f"Only gbtree boosters can be compiled, not {gbtree.get('name')}")
+    params = learner["learner_model_param"]
+    if int(params.get("num_target", 1)) != 1 or int(params.get("num_class", 0)) > 1:
+        raise ValueError("Only single-target boosters can be compiled")
+
+    trees = []
+    max_depth = 0
+    for tree in gbtree["model"]["trees"]:
+        if any(tree.get("split_type", [])):
+            raise ValueError("Boosters with categorical splits cannot be compiled")
+        left = np.asarray(tree["left_children"], dtype=np.intp)
+        right = np.asarray(tree["right_children"], dtype=np.intp)
+        conditions = np.asarray(tree["split_conditions"], dtype=np.float32)
+        # A leaf's split condition holds its (learning-rate scaled) output
+        trees.append({
+            "feature": np.asarray(tree["split_indices"], dtype=np.intp),
+            "threshold": conditions,
+            "left": left,
+            "right": right,
+            "missing_left": np.asarray(tree["default_left"], dtype=bool),
+            "value": conditions[:, np.newaxis]
+        })
+        max_depth = max(max_depth, _depth(left, right))
+
+    base_score = float(params["base_score"].strip("[]"))
+    feature_names = learner.get("feature_names") or getattr(model, "feature_names_in_", None)
+    return TreeEnsembleEvaluator(
+        BOOSTED_REGRESSOR, **_pack(trees), max_depth=max_depth,
+        feature_names=feature_names if feature_names is not None and len(feature_names) else None,
+        n_features=int(params["num_feature"]), base_score=base_score
+    )
+
+
+def _depth(left: np.ndarray, right: np.ndarray) -> int:
+    depth = 0
+    level = [0]
+    while True:
+        level = [child for node in level for child in (left[node], right[node]) if child >= 0]
+        if not level:
+            return depth
+        depth += 1
+
+
+def compile_model(model) -> TreeEnsembleEvaluator:
+    """Export a fitted forest or booster, whichever ``model`` is."""
+    if isinstance(model, TreeEnsembleEvaluator):
+        return model
+    if hasattr(model, "estimators_") and hasattr(model, "classes_"):
+        return compile_forest(model)
+    if hasattr(model, "get_booster") or hasattr(model, "save_raw"):
+        return compile_booster(model)
+    raise ValueError(f"Cannot compile a {type(model).__name__} into a tree evaluator")
+
+
+def compiled_path(artifact_path: str) -> str:
+    """Where the export of ``artifact_path`` is written, e.g. ``meta_model.trees.npz``."""
+    return os.path.splitext(artifact_path)[0] + ".trees.npz"
+
+
+def main(paths: List[str]) -> None:
+    import joblib
+
+    for path in paths:
+        evaluator = compile_model(joblib.load(path))
+        output = compiled_path(path)
+        evaluator.save(output)
+        print(f"Compiled {path} ({evaluator.n_trees} trees, {len(evaluator.feature)} nodes) -> {output}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:] or ["models/meta_model_crunchbase.joblib", "models/valuation_model_crunchbase.joblib"])
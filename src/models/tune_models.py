@@ -0,0 +1,303 @@
+"""
+Hyperparameter search for the meta and valuation models.
+
+Configurations are sampled from a grid of depths, leaf sizes, feature
+fractions and (for XGBoost) learning rates, and compared by successive
+halving with the number of trees as the budget: every configuration gets a
+few trees, the best third keeps growing (forests via ``warm_start``, boosters
+by continuing from the current booster), and so on up to ``max_trees``.
+Every model fits on all cores.
+
+The feature matrices are prepared once per feature file and cached as
+float32 arrays under data/cache/tuning/, keyed by the file's sha256.
+XGBoost trials share one ``QuantileDMatrix``, so the features are binned
+once per search rather than once per fit.
+
+Every evaluated (configuration, trees) point is written to
+models/tuning/<model>_curve.csv with its validation score, training time,
+node count and single-row latency on the compiled tree engine, which is
+the API's scoring path. models/tuning/<model>_best.json holds the current
+fixed configuration as a baseline and the recommendation: the cheapest
+point to score at least as well as the baseline (or the best-scoring point
+if none does), checked again on the held-out test split.
+"""
+import itertools
+import json
+import os
+import time
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+from sklearn.metrics import accuracy_score, mean_absolute_error
+from sklearn.model_selection import train_test_split
+from sklearn.utils.class_weight import compute_class_weight
+
+from .dataset_cache import source_sha256
+from .train_with_crunchbase import (XGBRegressor, make_meta_model, make_valuation_model, meta_training_data,
+                                    model_node_count, scoring_latency_us, split_training_data, valuation_training_data)
+
+# XGBoost is optional: without it the valuation search covers random forests
+try:
+    import xgboost as xgb
+except ImportError:
+    xgb = None
+
+TUNING_DIR = os.path.join("models", "tuning")
+TUNING_CACHE_DIR = os.path.join("data", "cache", "tuning")
+FEATURE_FILES = {
+    "meta": os.path.join("data", "processed", "crunchbase_features.csv"),
+    "valuation": os.path.join("data", "processed", "crunchbase_features_with_targets.csv")
+}
+
+FOREST_SPACE = {
+    "max_depth": [4, 6, 8, 12, 16, None],
+    "min_samples_leaf": [1, 2, 5, 10],
+    "max_features": ["sqrt", 0.5, 1.0]
+}
+BOOSTER_SPACE = {
+    "max_depth": [3, 4, 6, 8, 10],
+    "learning_rate": [0.03, 0.05, 0.1, 0.2, 0.3],
+    "min_child_weight": [1, 5, 10],
+    "subsample": [0.7, 0.85, 1.0]
+}
+
+
+def sample_configs(space: Dict[str, list], count: int, seed: int = 0) -> List[dict]:
+    """``count`` distinct configurations drawn from the grid ``space``."""
+    grid = list(itertools.product(*space.values()))
+    order = np.random.default_rng(seed).permutation(len(grid))[:count]
+    return [dict(zip(space.keys(), grid[position])) for position in order]
+
+
+def tuning_matrices(name: str, df: pd.DataFrame = None, features_path: Optional[str] = None,
+                    cache_dir: str = TUNING_CACHE_DIR) -> Dict[str, np.ndarray]:
+    """
+    Fit/validation/test matrices for one model, cached per feature file.
+
+    The test split is the one the trainers hold out; the rest is split again
+    into fit and validation parts for the search.
+
+    Args:
+        name: "meta" or "valuation"
+        df: Feature table; read from ``features_path`` if omitted
+        features_path: Feature CSV (default: the model's file under data/processed/)
+        cache_dir: Directory of the cached matrices
+
+    Returns:
+        Dict with X_fit, y_fit, X_valid, y_valid, X_test, y_test and feature_names
+    """
+    features_path = features_path or FEATURE_FILES[name]
+    cache_path = None
+    if df is None:
+        cache_path = os.path.join(cache_dir, f"{name}-{source_sha256(features_path, cache_dir)[:16]}.npz")
+        if os.path.exists(cache_path):
+            with np.load(cache_path, allow_pickle=False) as cached:
+                return dict(cached)
+        df = pd.read_csv(features_path)
+
+    X, y = (meta_training_data if name == "meta" else valuation_training_data)(df)
+    X_train, X_test, y_train, y_test = split_training_data(X, y)
+    X_fit, X_valid, y_fit, y_valid = train_test_split(X_train, y_train, test_size=0.25, random_state=42)
+    matrices = {
+        "X_fit": np.ascontiguousarray(X_fit, dtype=np.float32), "y_fit": y_fit.to_numpy(),
+        "X_valid": np.ascontiguousarray(X_valid, dtype=np.float32), "y_valid": y_valid.to_numpy(),
+        "X_test": np.ascontiguousarray(X_test, dtype=np.float32), "y_test": y_test.to_numpy(),
+        "feature_names": np.asarray(X.columns, dtype=str)
+    }
+    if cache_path is not None:
+        tmp_path = cache_path + ".tmp.npz"
+        np.savez(tmp_path, **matrices)
+        os.replace(tmp_path, cache_path)
+    return matrices
+
+
+class _ForestTrial:
+    """A random forest grown tree by tree budget with ``warm_start``."""
+
+    def __init__(self, make_model: Callable, params: dict, matrices: dict):
+        self.model = make_model({**params, "warm_start": True, "n_jobs": -1})
+        self.matrices = matrices
+        if self.model.get_params().get("class_weight") == "balanced":
+            # Same weights as "balanced", which sklearn discourages combining with warm_start
+            classes = np.unique(matrices["y_fit"])
+            weights = compute_class_weight("balanced", classes=classes, y=matrices["y_fit"])
+            self.model.set_params(class_weight=dict(zip(classes.tolist(), weights)))
+
+    def grow(self, n_trees: int) -> None:
+        self.model.set_params(n_estimators=n_trees)
+        self.model.fit(self.matrices["X_fit"], self.matrices["y_fit"])
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        return self.model.predict(X)
+
+    def serving_model(self):
+        return self.model
+
+
+class _BoosterTrial:
+    """An XGBoost booster grown by continuing training on the shared binned matrix."""
+
+    def __init__(self, params: dict, dtrain):
+        self.params = {"objective": "reg:squarederror", "tree_method": "hist", "seed": 42, **params}
+        self.dtrain = dtrain
+        self.booster = None
+        self.n_trees = 0
+
+    def grow(self, n_trees: int) -> None:
+        self.booster = xgb.train(self.params, self.dtrain, num_boost_round=n_trees - self.n_trees,
+                                 xgb_model=self.booster)
+        self.n_trees = n_trees
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        return self.booster.inplace_predict(X)
+
+    def serving_model(self):
+        return self.booster
+
+
+def successive_halving(make_trial: Callable[[dict], object], configs: List[dict], score: Callable,
+                       matrices: dict, max_trees: int = 300, eta: int = 3, progress: bool = True) -> List[dict]:
+    """
+    Compare ``configs`` by successive halving over the number of trees.
+
+    With n configurations the first rung trains ``max_trees / eta**k`` trees
+    each, where k = floor(log_eta(n)); after every rung the best 1/eta
+    (at least one) grow ``eta`` times more trees, until ``max_trees``.
+
+    Args:
+        make_trial: Creates a trial object (grow/predict/serving_model) for a configuration
+        configs: Configurations to compare
+        score: Validation score function (y_true, y_pred), higher is better
+        matrices: Output of ``tuning_matrices``
+        max_trees: Trees of the surviving configurations at the last rung
+        eta: Fraction of configurations dropped per rung is 1 - 1/eta
+
+    Returns:
+        One dict per evaluated (configuration, trees) point
+    """
+    rungs = int(np.floor(np.log(max(len(configs), 1)) / np.log(eta) + 1e-9))
+    rung = 0
+    n_trees = max(1, int(round(max_trees / eta ** rungs)))
+    trials = [{"config_id": config_id, "params": config, "trial": make_trial(config), "seconds": 0.0}
+              for config_id, config in enumerate(configs)]
+    curve = []
+    while True:
+        for trial in trials:
+            start = time.perf_counter()
+            trial["trial"].grow(n_trees)
+            trial["seconds"] += time.perf_counter() - start
+            model = trial["trial"].serving_model()
+            trial["score"] = float(score(matrices["y_valid"], trial["trial"].predict(matrices["X_valid"])))
+            curve.append({
+                "config_id": trial["config_id"], "n_estimators": n_trees, "params": trial["params"],
+                "score": trial["score"], "train_seconds": round(trial["seconds"], 4),
+                "nodes": model_node_count(model), "latency_us": round(scoring_latency_us(model, matrices["X_valid"]), 2)
+            })
+        if progress:
+            best = max(trials, key=lambda trial: trial["score"])
+            print(f"  {len(trials):>3} configurations x {n_trees:>4} trees, best score {best['score']:.4f}")
+        if n_trees >= max_trees or len(trials) == 1:
+            return curve
+        trials = sorted(trials, key=lambda trial: -trial["score"])[:max(1, len(trials) // eta)]
+        rung += 1
+        n_trees = max(n_trees + 1, int(round(max_trees / eta ** max(rungs - rung, 0))))
+
+
+def _model_setup(name: str, matrices: dict):
+    """(search space, trial factory, score function, metric name, model factory) for a model."""
+    if name == "meta":
+        return (FOREST_SPACE, lambda params: _ForestTrial(make_meta_model, params, matrices),
+                accuracy_score, "accuracy", make_meta_model)
+    negative_mae = lambda y_true, y_pred: -mean_absolute_error(y_true, y_pred)
+    if XGBRegressor is None or xgb is None:
+        return (FOREST_SPACE, lambda params: _ForestTrial(make_valuation_model, params, matrices),
+                negative_mae, "-mae", make_valuation_model)
+    dtrain = xgb.QuantileDMatrix(matrices["X_fit"], matrices["y_fit"], max_bin=256)
+    return (BOOSTER_SPACE, lambda params: _BoosterTrial(params, dtrain), negative_mae, "-mae", make_valuation_model)
+
+
+def _point(model, score: float, n_estimators: int, params: dict, seconds: float, X_valid: np.ndarray) -> dict:
+    return {"config_id": "baseline", "n_estimators": n_estimators, "params": params, "score": score,
+            "train_seconds": round(seconds, 4), "nodes": model_node_count(model),
+            "latency_us": round(scoring_latency_us(model, X_valid), 2)}
+
+
+def recommend(curve: List[dict], baseline: dict) -> dict:
+    """The fastest point scoring at least as well as ``baseline``, else the best-scoring point."""
+    good = [point for point in curve if point["score"] >= baseline["score"]]
+    if good:
+        return min(good, key=lambda point: (point["latency_us"], point["nodes"], -point["score"]))
+    return max(curve, key=lambda point: (point["score"], -point["latency_us"]))
+
+
+def tune_model(name: str, df: pd.DataFrame = None, trials: int = 27, max_trees: int = 300, eta: int = 3,
+               seed: int = 0, output_dir: str = TUNING_DIR, progress: bool = True) -> dict:
+    """
+    Search the hyperparameters of one model and record its cost-vs-quality curve.
+
+    Args:
+        name: "meta" or "valuation"
+        df: Feature table (default: the model's feature file, with cached matrices)
+        trials: Configurations sampled for the search
+        max_trees: Trees of the finalists
+        eta: Halving rate
+        seed: Seed of the configuration sample
+        output_dir: Where the curve and the recommendation are written
+
+    Returns:
+        The recommendation written to ``<output_dir>/<name>_best.json``
+    """
+    matrices = tuning_matrices(name, df)
+    space, make_trial, score, metric, make_model = _model_setup(name, matrices)
+    if progress:
+        print(f"Tuning the {name} model on {len(matrices['y_fit'])} rows ({metric}, higher is better)")
+
+    # The fixed configuration the trainers use without tuned parameters
+    start = time.perf_counter()
+    baseline_model = make_model({"n_jobs": -1}).fit(matrices["X_fit"], matrices["y_fit"])
+    seconds = time.perf_counter() - start
+    baseline = _point(baseline_model, float(score(matrices["y_valid"], baseline_model.predict(matrices["X_valid"]))),
+                      baseline_model.get_params()["n_estimators"], {}, seconds, matrices["X_valid"])
+
+    curve = successive_halving(make_trial, sample_configs(space, trials, seed), score, matrices,
+                               max_trees, eta, progress)
+    best = recommend(curve, baseline)
+    params = {**best["params"], "n_estimators": best["n_estimators"]}
+
+    # Check the recommendation against the baseline on the held-out test split
+    X_train = np.concatenate([matrices["X_fit"], matrices["X_valid"]])
+    y_train = np.concatenate([matrices["y_fit"], matrices["y_valid"]])
+    test_scores = {}
+    for label, model_params in (("baseline", {}), ("recommended", params)):
+        model = make_model({**model_params, "n_jobs": -1}).fit(X_train, y_train)
+        test_scores[label] = float(score(matrices["y_test"], model.predict(matrices["X_test"])))
+
+    os.makedirs(output_dir, exist_ok=True)
+    rows = [dict(point, params=json.dumps(point["params"], sort_keys=True)) for point in [baseline] + curve]
+    pd.DataFrame(rows).to_csv(os.path.join(output_dir, f"{name}_curve.csv"), index=False)
+    result = {
+        "model": name,
+        "metric": metric,
+        "baseline": baseline,
+        "recommended": dict(best, params=params),
+        "test_score": test_scores
+    }
+    with open(os.path.join(output_dir, f"{name}_best.json"), "w", encoding="utf-8") as f:
+        json.dump(result, f, indent=2)
+
+    if progress:
+        print(f"  baseline:    {metric} {baseline['score']:.4f} (test {test_scores['baseline']:.4f}), "
+              f"{baseline['latency_us']:.0f} us/row, {baseline['nodes']} nodes")
+        print(f"  recommended: {metric} {best['score']:.4f} (test {test_scores['recommended']:.4f}), "
+              f"{best['latency_us']:.0f} us/row, {best['nodes']} nodes, {params}")
+    return result
+
+
+def tuned_params(name: str, output_dir: str = TUNING_DIR) -> Optional[dict]:
+    """Recommended parameters from the last ``tune_model`` run, or None."""
+    try:
+        with open(os.path.join(output_dir, f"{name}_best.json"), "r", encoding="utf-8") as f:
+            return json.load(f)["recommended"]["params"]
+    except (OSError, ValueError, KeyError):
+        return None
@@ -1,4 +1,12 @@
+import numpy as np
+import pandas as pd
+
+from .vector_ops import as_records, clip_upper, clip_lower
+
+
 class ValuationAgent:
+    FEATURE_VERSION = 1
+
     def __init__(self):
         """
         Initialize ValuationAgent with no arguments.
@@ -54,6 +62,58 @@ class ValuationAgent:
             'valuation_proxy_current': valuation_proxy_current
         }
     
+    def transform_batch(self, financials_column) -> pd.DataFrame:
+        """
+        Columnar version of ``transform`` for many startups at once.
+
+        Args:
+            financials_column: Column (Series, list or Arrow array) of financials
+                dicts or JSON strings
+
+        Returns:
+            DataFrame with one row per valid input, indexed like the input.
+            Rows that ``transform`` would reject are dropped.
+        """
+        index, records = as_records(financials_column)
+
+        valid_rows = []
+        values = []
+        for position, financials in enumerate(records):
+            try:
+                if 'annual_revenue_usd' in financials:
+                    revenue_ttm = float(financials['annual_revenue_usd'])
+                elif 'monthly_revenue_usd' in financials:
+                    revenue_ttm = float(financials['monthly_revenue_usd']) * 12
+                else:
+                    revenue_ttm = 0.0
+                values.append((
+                    revenue_ttm,
+                    float(financials.get('revenue_growth_mom', 0.0)),
+                    float(financials.get('gross_margin', 0.0)),
+                    float(financials.get('ebitda_margin', 0.0))
+                ))
+            except Exception:
+                continue
+            valid_rows.append(position)
+
+        revenue_ttm, revenue_growth_mom, gross_margin, ebitda_margin = (
+            np.asarray(values, dtype=np.float64).reshape(-1, 4).T
+        )
+
+        # Same revenue-multiple heuristic and clamps as transform
+        growth_factor = clip_upper(1 + (revenue_growth_mom / 100), 2.0)
+        revenue_multiple_proxy = clip_lower(clip_upper(5.0 * growth_factor, 15.0), 1.0)
+        valuation_proxy_current = revenue_ttm * revenue_multiple_proxy
+
+        return pd.DataFrame({
+            'revenue_ttm': revenue_ttm,
+            'revenue_growth_mom': revenue_growth_mom,
+            'gross_margin': gross_margin,
+            'ebitda_margin': ebitda_margin,
+            'revenue_multiple_proxy': revenue_multiple_proxy,
+            'valuation_proxy_current': valuation_proxy_current
+        }, index=index[valid_rows])
+    
     @staticmethod
     def load() -> 'ValuationAgent':
         """
@@ -0,0 +1,60 @@
+from typing import Any, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .json_codec import loads_column
+
+
+def as_records(column: Any) -> Tuple[pd.Index, List[Any]]:
+    """
+    Turn a column of JSON payloads into a list of Python objects.
+
+    Args:
+        column: pandas Series, list, NumPy array or Arrow array whose cells are
+            dicts or JSON strings
+
+    Returns:
+        Tuple of (index, records). Cells that are not valid JSON become None so
+        the agents treat them as invalid rows instead of failing the batch.
+    """
+    if isinstance(column, pd.Series):
+        index = column.index
+        values = column.tolist()
+    elif hasattr(column, 'to_pylist'):
+        # pyarrow Array / ChunkedArray
+        values = column.to_pylist()
+        index = pd.RangeIndex(len(values))
+    else:
+        values = list(column)
+        index = pd.RangeIndex(len(values))
+
+    # One batch decode for the whole column, with the fastest available parser
+    return index, loads_column(values)
+
+
+def is_number(value: Any) -> bool:
+    """True for values the scalar agents can do arithmetic with."""
+    return isinstance(value, (int, float, np.integer, np.floating))
+
+
+def clip_upper(values: np.ndarray, bound: float) -> np.ndarray:
+    """Element-wise ``min(values, bound)`` with Python's NaN semantics."""
+    return np.where(bound < values, bound, values)
+
+
+def clip_lower(values: np.ndarray, bound: float) -> np.ndarray:
+    """Element-wise ``max(bound, values)`` with Python's NaN semantics."""
+    return np.where(values > bound, values, bound)
+
+
+def segment_sum(segment_ids: np.ndarray, values: np.ndarray, num_segments: int) -> np.ndarray:
+    """
+    Sum ``values`` per segment, adding in input order.
+
+    ``np.bincount`` accumulates sequentially, so the result is bit-identical to
+    a Python loop doing ``total += value`` for each segment.
+    """
+    if len(values) == 0:
+        return np.zeros(num_segments, dtype=np.float64)
+    return np.bincount(segment_ids, weights=np.asarray(values, dtype=np.float64), minlength=num_segments)
@@ -1,65 +1,410 @@
+import multiprocessing
 import pandas as pd
+import numpy as np
 import sys
 import os
-import json
+import time
+import zlib
+from collections import deque
+from typing import Iterator, List, Optional, Tuple
 
 # Add the parent directory to the path to import from src.models
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
 from models.funding_agent import FundingAgent
-from models.team_agent import TeamAgent
+from models.team_agent import EXPERIENCE_DISTRIBUTION_KEYS, TeamAgent
 from models.synergy_agent import SynergyAgent
 from models.valuation_agent import ValuationAgent
+from models.json_codec import from_typed_column, loads_column, to_typed_column
 
+# pyarrow is optional: without it the streaming pipeline writes CSV only
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
 
-def build_features():
-    # Load the raw startup data
-    df = pd.read_csv('data/raw/startups.csv')
-    
-    # Initialize agents
-    funding_agent = FundingAgent()
-    team_agent = TeamAgent()
-    synergy_agent = SynergyAgent()
-    val_agent = ValuationAgent()
-    
-    # Process each row to generate features
-    feature_rows = []
-    
-    for _, row in df.iterrows():
-        startup_id = row['startup_id']
-        funding_json = row['funding_json']
-        team_json = row['team_json']
-        
-        # Parse the acquirer and target JSON strings
-        acquirer_json = json.loads(row['acquirer_json']) if isinstance(row['acquirer_json'], str) else row['acquirer_json']
-        target_json = json.loads(row['target_json']) if isinstance(row['target_json'], str) else row['target_json']
-        
-        # Parse the financials JSON
-        financials_json = json.loads(row['financials_json']) if isinstance(row['financials_json'], str) else row['financials_json']
-        
-        # Generate features using the agents
-        funding_features = funding_agent.transform(funding_json)
-        team_features = team_agent.transform(team_json)
-        synergy_features = synergy_agent.transform(acquirer_json, target_json)
-        valuation_features = val_agent.transform(financials_json)
-        
-        # Combine all features into one dictionary
-        combined_features = {
-            'startup_id': startup_id,
-            **funding_features,
-            **team_features,
-            **synergy_features,
-            **valuation_features
-        }
-        
-        feature_rows.append(combined_features)
-    
-    # Convert to DataFrame and save
-    features_df = pd.DataFrame(feature_rows)
-    features_df.to_csv('data/processed/features.csv', index=False)
-    
-    print("Feature file created successfully!")
+# Rows per chunk; bounds the pipeline's working memory
+DEFAULT_CHUNK_SIZE = 50000
+# Worker processes for feature building (1 runs in-process)
+DEFAULT_WORKERS = int(os.environ.get("FEATURE_WORKERS", 1))
+# Payload columns of the raw startup files
+JSON_COLUMNS = ['funding_json', 'team_json', 'acquirer_json', 'target_json', 'financials_json']
+
+# Fixed dtypes of the feature columns. Feature files are written chunk by chunk, and a
+# chunk's inferred dtypes depend on its values (an estimated_team_size of 4 in one chunk
+# and 4.5 in the next), so every chunk is cast to these before it is written.
+INTEGER_FEATURES = ['num_rounds', 'founder_count', 'exits_count']
+FLOAT_FEATURES = [
+    'total_raised_usd', 'avg_round_size', 'team_strength_score', 'avg_experience', 'estimated_team_size',
+    'team_composition_score', 'market_similarity', 'tech_similarity', 'revenue_synergy_score',
+    'cost_synergy_score', 'overall_synergy_score', 'revenue_ttm', 'revenue_growth_mom', 'gross_margin',
+    'ebitda_margin', 'revenue_multiple_proxy', 'valuation_proxy_current'
+]
+TEXT_FEATURES = ['last_round_type']
+
+
+def compute_feature_frame(df, funding_agent, team_agent, synergy_agent, val_agent):
+    """
+    Build the feature table for a DataFrame of raw startup rows.
+
+    Each agent runs once over whole columns via ``transform_batch``. Rows that
+    any agent rejects are dropped, matching the per-row loop that skipped them.
+
+    Args:
+        df: DataFrame with startup_id and the five *_json columns
+        funding_agent, team_agent, synergy_agent, val_agent: Feature agents
+
+    Returns:
+        DataFrame with startup_id followed by funding, team, synergy and
+        valuation features, in input order
+    """
+    return _indexed_feature_frame(df, funding_agent, team_agent, synergy_agent, val_agent).reset_index(drop=True)
+
+
+def _indexed_feature_frame(df, funding_agent, team_agent, synergy_agent, val_agent):
+    """``compute_feature_frame`` keeping the input's index on the surviving rows."""
+    frames = [
+        funding_agent.transform_batch(df['funding_json']),
+        team_agent.transform_batch(df['team_json']),
+        synergy_agent.transform_batch(df['acquirer_json'], df['target_json']),
+        val_agent.transform_batch(df['financials_json'])
+    ]
+    features_df = pd.concat(frames, axis=1, join='inner')
+    features_df.insert(0, 'startup_id', df.loc[features_df.index, 'startup_id'].values)
+    return features_df
+
+
+def feature_agents() -> tuple:
+    """The four feature agents; the team agent skips the company lookup datasets it does not need here."""
+    return FundingAgent(), TeamAgent(load_datasets=False), SynergyAgent(), ValuationAgent()
+
+
+def shard_of(startup_ids, num_shards: int) -> np.ndarray:
+    """
+    Deterministic shard number for each startup_id.
+
+    Integer ids are taken modulo ``num_shards``; any other id by the CRC32 of
+    its text, which unlike ``hash`` is stable across processes and runs.
+    """
+    values = np.asarray(startup_ids)
+    if np.issubdtype(values.dtype, np.integer):
+        return np.mod(values, num_shards)
+    return np.asarray([zlib.crc32(str(value).encode('utf-8')) % num_shards for value in values], dtype=np.int64)
+
+
+# Agents of a pool worker, created once by _init_worker
+_worker_agents = None
+
+
+def _init_worker() -> None:
+    global _worker_agents
+    _worker_agents = feature_agents()
+
+
+def _feature_shard(shard: Tuple[np.ndarray, dict]) -> Optional[Tuple[np.ndarray, List[str], list]]:
+    """
+    Features for one shard of a chunk, run in a pool worker.
+
+    Takes and returns plain column arrays rather than DataFrames or row dicts,
+    which keeps the pickling between processes cheap.
+
+    Returns:
+        (row positions, column names, column arrays), or None if every row was rejected
+    """
+    positions, columns = shard
+    features_df = _indexed_feature_frame(pd.DataFrame(columns, index=positions), *_worker_agents)
+    if features_df.empty:
+        return None
+    return (features_df.index.to_numpy(), list(features_df.columns),
+            [features_df[column].to_numpy() for column in features_df.columns])
+
+
+def _split_shards(raw_chunk: pd.DataFrame, num_shards: int) -> list:
+    """Split a raw chunk by startup_id into (row positions, column arrays) shards."""
+    raw_chunk = raw_chunk.reset_index(drop=True)
+    shards = shard_of(raw_chunk['startup_id'].to_numpy(), num_shards)
+    tasks = []
+    for shard in range(num_shards):
+        positions = np.flatnonzero(shards == shard)
+        if len(positions):
+            tasks.append((positions, {column: raw_chunk[column].to_numpy()[positions] for column in raw_chunk.columns}))
+    return tasks
+
+
+def _merge_shards(results: list) -> pd.DataFrame:
+    """Reassemble shard results into the chunk's features, in input order."""
+    frames = [
+        pd.DataFrame(dict(zip(columns, arrays)), index=positions)
+        for positions, columns, arrays in (result for result in results if result is not None)
+    ]
+    if not frames:
+        return pd.DataFrame()
+    return pd.concat(frames).sort_index().reset_index(drop=True)
+
+
+def convert_raw_to_parquet(csv_path: str, parquet_path: str) -> dict:
+    """
+    Store a raw startups CSV as Parquet with the payloads already parsed.
+
+    Every *_json column that can be typed faithfully becomes a nested column
+    (e.g. rounds and founders as list-of-struct), so reading the file back
+    never re-parses JSON. Columns that cannot (mixed types in one field,
+    explicit nulls) stay JSON text. ``stream_features`` accepts the result
+    in place of the CSV and produces identical features.
+
+    Returns:
+        Dict mapping each *_json column to "typed" or "json"
+    """
+    if pa is None:
+        raise ImportError("pyarrow is required to write typed raw files")
+    df = pd.read_csv(csv_path)
+    columns = {}
+    layout = {}
+    for column in df.columns:
+        typed = to_typed_column(loads_column(df[column].tolist())) if column in JSON_COLUMNS else None
+        layout[column] = "typed" if typed is not None else "json"
+        columns[column] = typed if typed is not None else pa.array(df[column], from_pandas=True)
+    table = pa.table(columns)
+    table = table.replace_schema_metadata({b"typed_json_columns": ",".join(
+        column for column in JSON_COLUMNS if layout.get(column) == "typed").encode("utf-8")})
+    pq.write_table(table, parquet_path)
+    return {column: layout[column] for column in JSON_COLUMNS if column in layout}
+
+
+def cast_features(features_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    ``features_df`` with every feature column in its fixed dtype.
+
+    Counts become int64, the other numeric features float64 and
+    last_round_type text (missing values stay missing). startup_id and any
+    other columns, e.g. targets, are left as they are.
+    """
+    dtypes = {column: np.int64 for column in INTEGER_FEATURES}
+    dtypes.update({column: np.float64 for column in FLOAT_FEATURES})
+    features_df = features_df.astype({column: dtype for column, dtype in dtypes.items() if column in features_df})
+    for column in TEXT_FEATURES:
+        if column in features_df:
+            features_df[column] = [value if isinstance(value, str) or pd.isna(value) else str(value)
+                                   for value in features_df[column].tolist()]
+    return features_df
+
+
+def _text(value):
+    return None if value is None else str(value)
+
+
+def _arrow_features(features_df: pd.DataFrame):
+    """
+    A cast feature chunk as an Arrow table with the fixed feature schema.
+
+    The nested team features get fixed struct types: founder fields are
+    normalized (experience float, has_exit bool, role and education text)
+    because they pass through whatever the raw payload held. Columns that are
+    not features keep the type pyarrow infers for them.
+    """
+    founder_type = pa.list_(pa.struct([
+        ('experience', pa.float64()), ('experience_level', pa.string()), ('has_exit', pa.bool_()),
+        ('role', pa.string()), ('education', pa.string())
+    ]))
+    distribution_type = pa.struct([(key, pa.int64()) for key in EXPERIENCE_DISTRIBUTION_KEYS])
+    columns = {}
+    for column in features_df.columns:
+        values = features_df[column]
+        if column in INTEGER_FEATURES:
+            columns[column] = pa.array(values, type=pa.int64())
+        elif column in FLOAT_FEATURES:
+            columns[column] = pa.array(values, type=pa.float64())
+        elif column in TEXT_FEATURES:
+            columns[column] = pa.array(values, type=pa.string(), from_pandas=True)
+        elif column == 'founder_details':
+            columns[column] = pa.array([
+                None if details is None else [{
+                    'experience': float(founder['experience']), 'experience_level': founder['experience_level'],
+                    'has_exit': bool(founder['has_exit']), 'role': _text(founder['role']),
+                    'education': _text(founder['education'])
+                } for founder in details]
+                for details in values.tolist()
+            ], type=founder_type)
+        elif column == 'experience_distribution':
+            columns[column] = pa.array(values.tolist(), type=distribution_type)
+        else:
+            columns[column] = pa.array(values, from_pandas=True)
+    return pa.table(columns)
+
+
+def read_raw_chunks(input_path: str, chunk_size: int) -> Iterator[pd.DataFrame]:
+    """
+    Raw startup rows in chunks, from a CSV or from ``convert_raw_to_parquet`` output.
+
+    Typed payload columns come back as parsed dicts, which the agents'
+    batch transforms use without decoding.
+    """
+    if not input_path.endswith('.parquet'):
+        yield from pd.read_csv(input_path, chunksize=chunk_size)
+        return
+    parquet_file = pq.ParquetFile(input_path)
+    metadata = parquet_file.schema_arrow.metadata or {}
+    typed = set(filter(None, metadata.get(b"typed_json_columns", b"").decode("utf-8").split(",")))
+    for batch in parquet_file.iter_batches(batch_size=chunk_size):
+        yield pd.DataFrame({
+            name: from_typed_column(batch.column(name)) if name in typed else batch.column(name).to_pylist()
+            for name in batch.schema.names
+        })
+
+
+class FeatureWriter:
+    """
+    Appends feature chunks to a CSV or Parquet file as they are produced.
+
+    Every chunk is cast with ``cast_features`` first, so the output does not
+    depend on where the chunk boundaries fall: the CSV is byte-identical to
+    writing the whole cast frame with ``to_csv(index=False)``. Parquet output
+    (``.parquet`` paths, needs pyarrow) is written one row group per chunk
+    with the fixed feature schema; columns that are not features take their
+    type from the first chunk and later chunks are cast to it. Chunks go to a
+    temporary file that replaces ``path`` only when the writer closes without
+    an error.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.tmp_path = path + '.tmp'
+        self.parquet = path.endswith('.parquet')
+        if self.parquet and pq is None:
+            raise ImportError("pyarrow is required to write Parquet feature files")
+        self.rows = 0
+        self._file = None
+        self._writer = None
+        self._schema = None
+
+    def write(self, features_df: pd.DataFrame) -> None:
+        if features_df.empty:
+            return
+        features_df = cast_features(features_df)
+        if self.parquet:
+            table = _arrow_features(features_df)
+            if self._writer is None:
+                self._schema = table.schema
+                self._writer = pq.ParquetWriter(self.tmp_path, self._schema)
+            self._writer.write_table(table.cast(self._schema))
+        else:
+            if self._file is None:
+                self._file = open(self.tmp_path, 'w', newline='')
+            features_df.to_csv(self._file, header=self.rows == 0, index=False)
+        self.rows += len(features_df)
+
+    def close(self, commit: bool = True) -> None:
+        if self._writer is not None:
+            self._writer.close()
+        if self._file is not None:
+            self._file.close()
+        if os.path.exists(self.tmp_path):
+            if commit:
+                os.replace(self.tmp_path, self.path)
+            else:
+                os.remove(self.tmp_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close(commit=exc_type is None)
+        return False
+
+
+def stream_features(input_path: str, output_path: str, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                    agents: Optional[tuple] = None, progress: bool = True, workers: int = 1) -> dict:
+    """
+    Build features from a raw startups CSV without loading it all at once.
+
+    The CSV is read ``chunk_size`` rows at a time, each chunk runs through the
+    agents' batch transforms and is appended to ``output_path`` before the
+    next one is read, so memory stays flat however large the input is. If
+    every row is rejected, no output file is written.
+
+    With ``workers`` > 1 each chunk is sharded by startup_id across a process
+    pool whose workers create their agents once. The shards are merged back
+    into input order, so the output is byte-identical to the serial run. One
+    chunk is read ahead while the pool works on the previous one.
+
+    Args:
+        input_path: Raw CSV with startup_id and the five *_json columns, or its
+            ``convert_raw_to_parquet`` conversion
+        output_path: Feature file to write (.csv, or .parquet with pyarrow)
+        chunk_size: Rows per chunk
+        agents: (funding, team, synergy, valuation) agents; created once if omitted
+            (serial runs only, pool workers create their own)
+        progress: Print rows/sec after every chunk
+        workers: Worker processes; 1 builds the features in this process
+
+    Returns:
+        Dict with rows_read, rows_written, seconds and rows_per_second
+    """
+    start = time.perf_counter()
+    rows_read = 0
+
+    def report():
+        if progress:
+            rate = rows_read / max(time.perf_counter() - start, 1e-9)
+            print(f"  {rows_read:,} rows read, {writer.rows:,} written ({rate:,.0f} rows/s)")
+
+    with FeatureWriter(output_path) as writer:
+        if workers > 1:
+            pending = deque()
+
+            def write_until(limit):
+                nonlocal rows_read
+                while len(pending) > limit:
+                    chunk_rows, result = pending.popleft()
+                    writer.write(_merge_shards(result.get()))
+                    rows_read += chunk_rows
+                    report()
+
+            with multiprocessing.Pool(workers, initializer=_init_worker) as pool:
+                for raw_chunk in read_raw_chunks(input_path, chunk_size):
+                    pending.append((len(raw_chunk), pool.map_async(_feature_shard, _split_shards(raw_chunk, workers))))
+                    write_until(1)
+                write_until(0)
+        else:
+            agents = agents or feature_agents()
+            for raw_chunk in read_raw_chunks(input_path, chunk_size):
+                rows_read += len(raw_chunk)
+                writer.write(compute_feature_frame(raw_chunk, *agents))
+                report()
+        rows_written = writer.rows
+
+    seconds = time.perf_counter() - start
+    return {
+        'rows_read': rows_read,
+        'rows_written': rows_written,
+        'seconds': round(seconds, 3),
+        'rows_per_second': round(rows_read / seconds, 1) if seconds > 0 else None
+    }
+
+
+def build_features(chunk_size: int = DEFAULT_CHUNK_SIZE, workers: int = DEFAULT_WORKERS):
+    """
+    Build data/processed/features.csv from data/raw/startups.csv.
+
+    Rows that an agent rejects are skipped and counted, as
+    process_datasets.build_enhanced_features does, rather than aborting the
+    whole build on the first invalid row.
+
+    Returns:
+        The ``stream_features`` stats; rows_read - rows_written rows were skipped
+    """
+    # Stream the raw startup data through the agents' batch mode
+    stats = stream_features('data/raw/startups.csv', 'data/processed/features.csv', chunk_size, workers=workers)
+
+    skipped = stats['rows_read'] - stats['rows_written']
+    if skipped:
+        print(f"Skipped {skipped} rows with invalid data")
+
+    print(f"Feature file created successfully! ({stats['rows_written']} rows in {stats['seconds']}s)")
+    return stats
 
 
 if __name__ == "__main__":
-    build_features()
\ No newline at end of file
+    build_features()
@@ -0,0 +1,218 @@
+"""
+Incremental feature store keyed by startup_id.
+
+Each stored row holds a hash of the startup's five *_json payload cells,
+the ``FEATURE_VERSION`` of every feature agent it was built with, and its
+computed features (or a marker that the agents rejected it). A run diffs the
+raw file against the store and only sends new, changed or outdated rows
+through the agents; every other row is read back from the store. Bump an
+agent's ``FEATURE_VERSION`` whenever its output changes, so that rows built
+by the old code are recomputed.
+
+The store is a single SQLite file, committed after every chunk: an
+interrupted run leaves every stored row consistent, and the next run picks
+up where it stopped.
+"""
+import json
+import os
+import sqlite3
+import sys
+import time
+from typing import List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from models import json_codec
+from pipeline.build_features import (DEFAULT_CHUNK_SIZE, JSON_COLUMNS, FeatureWriter, _indexed_feature_frame,
+                                     feature_agents, read_raw_chunks)
+
+FEATURE_STORE_PATH = os.environ.get("FEATURE_STORE", os.path.join("data", "processed", "feature_store.sqlite"))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS features (
+    startup_id TEXT PRIMARY KEY,
+    input_hash INTEGER NOT NULL,
+    versions TEXT NOT NULL,
+    features TEXT
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+def feature_versions(agents: tuple) -> str:
+    """Version key of a set of agents, e.g. "FundingAgent=1,TeamAgent=1,...". """
+    return ",".join(f"{type(agent).__name__}={getattr(agent, 'FEATURE_VERSION', 0)}" for agent in agents)
+
+
+def input_hashes(raw_chunk: pd.DataFrame) -> np.ndarray:
+    """
+    64-bit content hash of each row's payload cells.
+
+    Uses pandas' vectorized hashing with its fixed key, so the same payloads
+    hash the same in every process and run. Cells already parsed into dicts
+    (typed Parquet input) are hashed by their canonical JSON text.
+    """
+    payloads = pd.DataFrame({
+        column: [json.dumps(value, sort_keys=True) if isinstance(value, (dict, list)) else value
+                 for value in raw_chunk[column].tolist()]
+        for column in JSON_COLUMNS
+    })
+    # SQLite integers are signed
+    return pd.util.hash_pandas_object(payloads, index=False).to_numpy().view(np.int64)
+
+
+class FeatureStore:
+    """
+    SQLite table of computed features, keyed by startup_id.
+
+    Ids are stored as text; the caller's ids (and their types) are kept in
+    the feature files it writes.
+    """
+
+    def __init__(self, path: str = FEATURE_STORE_PATH):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path)
+        self._conn.executescript(_SCHEMA)
+        self._conn.execute("CREATE TEMP TABLE seen (startup_id TEXT PRIMARY KEY)")
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM features").fetchone()[0]
+
+    def columns(self, versions: str) -> Optional[List[str]]:
+        """Feature columns written by agents with the given version key."""
+        row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (f"columns:{versions}",)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def set_columns(self, versions: str, columns: List[str]) -> None:
+        self._conn.execute("INSERT OR REPLACE INTO meta VALUES (?, ?)", (f"columns:{versions}", json.dumps(columns)))
+
+    def lookup(self, startup_ids: List[str]) -> dict:
+        """Stored (input_hash, versions, features text) for the ids that have a row."""
+        found = {}
+        # Chunks stay under SQLite's limit on bound parameters
+        for start in range(0, len(startup_ids), 30000):
+            batch = startup_ids[start:start + 30000]
+            query = ("SELECT startup_id, input_hash, versions, features FROM features WHERE startup_id IN "
+                     f"({','.join('?' * len(batch))})")
+            for startup_id, input_hash, versions, features in self._conn.execute(query, batch):
+                found[startup_id] = (input_hash, versions, features)
+        self._conn.executemany("INSERT OR IGNORE INTO seen VALUES (?)", ((startup_id,) for startup_id in startup_ids))
+        return found
+
+    def upsert(self, rows: List[Tuple[str, int, str, Optional[str]]]) -> None:
+        """Insert or replace (startup_id, input_hash, versions, features text) rows."""
+        self._conn.executemany("INSERT OR REPLACE INTO features VALUES (?, ?, ?, ?)", rows)
+
+    def prune(self) -> int:
+        """Delete the rows of every startup not looked up since the store was opened."""
+        cursor = self._conn.execute("DELETE FROM features WHERE startup_id NOT IN (SELECT startup_id FROM seen)")
+        return cursor.rowcount
+
+    def commit(self) -> None:
+        self._conn.commit()
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.commit()
+        self.close()
+        return False
+
+
+def update_features(input_path: str, output_path: str, store_path: str = FEATURE_STORE_PATH,
+                    chunk_size: int = DEFAULT_CHUNK_SIZE, agents: Optional[tuple] = None,
+                    progress: bool = True) -> dict:
+    """
+    Build the feature file for a raw startups file, recomputing only what changed.
+
+    Every chunk of the raw file is diffed against the store by startup_id:
+    rows whose payload hash or agent versions differ from the stored ones,
+    and rows the store has never seen, run through the agents and are saved;
+    the rest are read back from the store. Startups no longer in the raw file
+    are dropped from the store. The feature file has the same rows, values
+    and order as a full ``stream_features`` run.
+
+    Args:
+        input_path: Raw CSV (or ``convert_raw_to_parquet`` file) with startup_id and the *_json columns
+        output_path: Feature file to write (.csv, or .parquet with pyarrow)
+        store_path: SQLite feature store, created if missing
+        chunk_size: Rows per chunk
+        agents: (funding, team, synergy, valuation) agents; created if omitted
+        progress: Print progress after every chunk
+
+    Returns:
+        Dict with rows_read, rows_recomputed, rows_written, rows_removed and seconds
+    """
+    start = time.perf_counter()
+    agents = agents or feature_agents()
+    versions = feature_versions(agents)
+    rows_read = 0
+    rows_recomputed = 0
+
+    with FeatureStore(store_path) as store, FeatureWriter(output_path) as writer:
+        columns = store.columns(versions)
+        for raw_chunk in read_raw_chunks(input_path, chunk_size):
+            raw_chunk = raw_chunk.reset_index(drop=True)
+            startup_ids = [str(startup_id) for startup_id in raw_chunk['startup_id'].tolist()]
+            hashes = input_hashes(raw_chunk)
+            stored = store.lookup(startup_ids)
+
+            features_text = [None] * len(raw_chunk)
+            dirty = []
+            for position, (startup_id, input_hash) in enumerate(zip(startup_ids, hashes.tolist())):
+                entry = stored.get(startup_id)
+                if entry is not None and entry[0] == input_hash and entry[1] == versions:
+                    features_text[position] = entry[2]
+                else:
+                    dirty.append(position)
+
+            if dirty:
+                computed = _indexed_feature_frame(raw_chunk.iloc[dirty], *agents).drop(columns='startup_id')
+                if columns is None and len(computed.columns):
+                    columns = list(computed.columns)
+                    store.set_columns(versions, columns)
+                # Native Python values, so the JSON round trip gives back the same numbers
+                computed_rows = dict(zip(computed.index.tolist(), computed.to_dict('split')['data']))
+                updates = []
+                for position in dirty:
+                    values = computed_rows.get(position)
+                    features_text[position] = None if values is None else json.dumps(values)
+                    updates.append((startup_ids[position], int(hashes[position]), versions, features_text[position]))
+                store.upsert(updates)
+                rows_recomputed += len(dirty)
+
+            valid = [position for position, text in enumerate(features_text) if text is not None]
+            if valid:
+                features_df = pd.DataFrame(json_codec.loads_column([features_text[position] for position in valid]),
+                                           columns=columns)
+                features_df.insert(0, 'startup_id', raw_chunk['startup_id'].to_numpy()[valid])
+                writer.write(features_df)
+            store.commit()
+
+            rows_read += len(raw_chunk)
+            if progress:
+                print(f"  {rows_read:,} rows read, {rows_recomputed:,} recomputed, {writer.rows:,} written")
+        rows_removed = store.prune()
+        rows_written = writer.rows
+
+    return {
+        'rows_read': rows_read,
+        'rows_recomputed': rows_recomputed,
+        'rows_written': rows_written,
+        'rows_removed': rows_removed,
+        'seconds': round(time.perf_counter() - start, 3)
+    }
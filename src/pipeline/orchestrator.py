@@ -0,0 +1,282 @@
+"""
+In-process DAG runner for the training pipeline.
+
+Stages declare the stages they depend on, the files they read from outside
+the pipeline and the files they write. Independent stages run concurrently
+on a thread pool; a stage's return value is handed to the stages that depend
+on it, so intermediate tables are not re-read from disk within a run.
+
+Completed stages are recorded in a JSON state file together with the size
+and mtime of their input and output files. A later run skips every stage
+whose record still matches and whose dependencies were skipped too, so
+after a failure the pipeline resumes from the stages that did not finish.
+"""
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+PIPELINE_STATE_PATH = os.path.join("data", "processed", "pipeline_state.json")
+
+
+class Stage:
+    """
+    One step of the pipeline.
+
+    Args:
+        name: Unique stage name
+        run: Function called with a dict of the dependencies' results
+            (stage name -> return value); its return value is this stage's result
+        deps: Names of the stages that must complete first
+        inputs: Files read from outside the pipeline; a change reruns the stage
+        outputs: Files the stage writes; all must exist after it runs
+        load: Function rebuilding the stage's result from its outputs, used
+            when the stage is skipped but a dependent stage runs
+        config: JSON-serializable settings of the stage; a change reruns it
+    """
+
+    def __init__(self, name: str, run: Callable[[Dict[str, Any]], Any], deps: Sequence[str] = (),
+                 inputs: Sequence[str] = (), outputs: Sequence[str] = (),
+                 load: Optional[Callable[[], Any]] = None, config: Any = None):
+        self.name = name
+        self.run = run
+        self.deps = list(deps)
+        self.inputs = list(inputs)
+        self.outputs = list(outputs)
+        self.load = load
+        self.config = config
+
+
+def _fingerprint(paths: Sequence[str]) -> dict:
+    """Size and mtime of every file (None for missing files)."""
+    fingerprint = {}
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            fingerprint[path] = [stat.st_size, stat.st_mtime_ns]
+        except OSError:
+            fingerprint[path] = None
+    return fingerprint
+
+
+def _rss_bytes() -> Optional[int]:
+    """Current resident set size of this process, or None where it cannot be read."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    # Without /proc only the process high-water mark is available (KiB on Linux, bytes on macOS)
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class _MemorySampler:
+    """
+    Samples the process RSS on a background thread and keeps the peak seen
+    while each running stage was active. Stages running at the same time
+    share the process, so their peaks include each other's memory.
+    """
+
+    def __init__(self, interval: float = 0.05):
+        self.interval = interval
+        self._peaks: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _sample(self) -> None:
+        rss = _rss_bytes()
+        if rss is None:
+            return
+        with self._lock:
+            for name, peak in self._peaks.items():
+                self._peaks[name] = max(peak, rss)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def track(self, name: str) -> None:
+        with self._lock:
+            self._peaks[name] = 0
+        self._sample()
+
+    def untrack(self, name: str) -> Optional[int]:
+        self._sample()
+        with self._lock:
+            peak = self._peaks.pop(name, 0)
+        return peak or None
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._stop.set()
+        self._thread.join()
+        return False
+
+
+def _read_state(state_path: str) -> dict:
+    try:
+        with open(state_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_state(state_path: str, state: dict) -> None:
+    directory = os.path.dirname(state_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = state_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, state_path)
+
+
+def _check_graph(stages: List[Stage]) -> None:
+    names = [stage.name for stage in stages]
+    if len(set(names)) != len(names):
+        raise ValueError("Stage names must be unique")
+    known = set(names)
+    for stage in stages:
+        missing = [dep for dep in stage.deps if dep not in known]
+        if missing:
+            raise ValueError(f"Stage {stage.name!r} depends on unknown stages: {', '.join(missing)}")
+    # Kahn's algorithm: every stage must become ready eventually
+    remaining = {stage.name: set(stage.deps) for stage in stages}
+    while remaining:
+        ready = [name for name, deps in remaining.items() if not deps]
+        if not ready:
+            raise ValueError(f"Stages have a dependency cycle: {', '.join(sorted(remaining))}")
+        for name in ready:
+            del remaining[name]
+        for deps in remaining.values():
+            deps.difference_update(ready)
+
+
+def run_stages(stages: List[Stage], state_path: str = PIPELINE_STATE_PATH, workers: Optional[int] = None,
+               resume: bool = True) -> List[dict]:
+    """
+    Run a DAG of stages, in parallel where the dependencies allow.
+
+    A stage is skipped ("cached") when ``resume`` is set, the state file has
+    a record of it completing with the same fingerprint of its inputs, its
+    dependencies' outputs and its own outputs, and none of its dependencies
+    ran in this call. When a stage fails, the stages that depend on it are
+    not run ("blocked") while independent ones carry on; the completed ones
+    are recorded, so the next run resumes.
+
+    Args:
+        stages: Stages of the pipeline, in any order
+        state_path: JSON file recording completed stages
+        workers: Threads running stages concurrently (default: one per stage)
+        resume: Skip stages completed by an earlier run
+
+    Returns:
+        One dict per stage, in the given order, with stage, status
+        ("ran", "cached", "failed" or "blocked"), seconds, peak_rss_bytes and error
+    """
+    _check_graph(stages)
+    by_name = {stage.name: stage for stage in stages}
+    state = _read_state(state_path) if resume else {}
+    report = {stage.name: {"stage": stage.name, "status": None, "seconds": None, "peak_rss_bytes": None,
+                           "error": None} for stage in stages}
+    results: Dict[str, Any] = {}
+    results_lock = threading.Lock()
+
+    def fingerprint(stage: Stage) -> dict:
+        # The dependencies' outputs count as inputs, so a stage whose upstream
+        # files changed since it completed is not skipped
+        upstream = [path for dep in stage.deps for path in by_name[dep].outputs]
+        fingerprint = _fingerprint(stage.inputs + upstream + stage.outputs)
+        if stage.config is not None:
+            fingerprint["config"] = stage.config
+        return fingerprint
+
+    def dependency_results(stage: Stage) -> Dict[str, Any]:
+        # Results of skipped dependencies are loaded from their outputs on first use
+        with results_lock:
+            for dep in stage.deps:
+                if dep not in results:
+                    load = by_name[dep].load
+                    results[dep] = load() if load is not None else None
+            return {dep: results[dep] for dep in stage.deps}
+
+    def execute(stage: Stage, sampler: _MemorySampler):
+        print(f"[{stage.name}] started", flush=True)
+        sampler.track(stage.name)
+        start = time.perf_counter()
+        try:
+            result = stage.run(dependency_results(stage))
+            missing = [path for path in stage.outputs if not os.path.exists(path)]
+            if missing:
+                raise RuntimeError(f"stage did not write {', '.join(missing)}")
+            return result
+        finally:
+            report[stage.name]["seconds"] = round(time.perf_counter() - start, 3)
+            report[stage.name]["peak_rss_bytes"] = sampler.untrack(stage.name)
+
+    pending = {stage.name for stage in stages}
+    running = {}
+    with _MemorySampler() as sampler, ThreadPoolExecutor(max_workers=workers or len(stages) or 1) as pool:
+        while pending or running:
+            for name in sorted(pending):
+                stage = by_name[name]
+                statuses = [report[dep]["status"] for dep in stage.deps]
+                if any(status in ("failed", "blocked") for status in statuses):
+                    report[name]["status"] = "blocked"
+                    pending.discard(name)
+                    print(f"[{name}] blocked by a failed dependency", flush=True)
+                elif all(status in ("ran", "cached") for status in statuses):
+                    pending.discard(name)
+                    record = state.get(name)
+                    if (resume and record is not None and "ran" not in statuses
+                            and record.get("fingerprint") == fingerprint(stage)
+                            and all(os.path.exists(path) for path in stage.outputs)):
+                        report[name]["status"] = "cached"
+                        print(f"[{name}] up to date, skipped", flush=True)
+                    else:
+                        running[pool.submit(execute, stage, sampler)] = name
+            if not running:
+                continue
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                entry = report[name]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    entry["status"] = "failed"
+                    entry["error"] = f"{type(e).__name__}: {e}"
+                    state.pop(name, None)
+                    print(f"[{name}] failed after {entry['seconds']}s: {entry['error']}", flush=True)
+                else:
+                    with results_lock:
+                        results[name] = result
+                    entry["status"] = "ran"
+                    state[name] = {"fingerprint": fingerprint(by_name[name]), "seconds": entry["seconds"]}
+                    print(f"[{name}] finished in {entry['seconds']}s", flush=True)
+                _write_state(state_path, state)
+
+    return [report[stage.name] for stage in stages]
+
+
+def format_report(report: List[dict]) -> str:
+    """Table of per-stage status, time and peak memory."""
+    lines = [f"{'stage':<18} {'status':<8} {'seconds':>9} {'peak RSS MiB':>13}"]
+    for entry in report:
+        seconds = f"{entry['seconds']:.2f}" if entry["seconds"] is not None else "-"
+        peak = f"{entry['peak_rss_bytes'] / 2**20:.0f}" if entry["peak_rss_bytes"] else "-"
+        lines.append(f"{entry['stage']:<18} {entry['status']:<8} {seconds:>9} {peak:>13}")
+    return "\n".join(lines)
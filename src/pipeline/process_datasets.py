@@ -2,7 +2,6 @@ import pandas as pd
 import numpy as np
 import json
 import os
-from tqdm import tqdm
 import sys
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
@@ -10,232 +9,380 @@ from models.funding_agent import FundingAgent
 from models.team_agent import TeamAgent
 from models.synergy_agent import SynergyAgent
 from models.valuation_agent import ValuationAgent
+from models.business_model_agent import BusinessModelAgent
+from models.company_snapshot import COMPANY_SNAPSHOT_PATH, write_company_snapshot
+from models.dataset_cache import load_dataset
+from pipeline.build_features import DEFAULT_CHUNK_SIZE, DEFAULT_WORKERS, FeatureWriter, stream_features
+from pipeline.feature_store import FEATURE_STORE_PATH, feature_versions, update_features
 
-def process_crunchbase_data():
+# Seed of the synthetic team and financial fields
+SCENARIO_SEED = 42
+# Synthetic founders per company are drawn from 1..MAX_FOUNDERS
+MAX_FOUNDERS = 3
+
+def _company_table(objects_df, max_companies=None):
+    """Companies of the objects table, keyed by ``id`` (the first row wins for duplicated ids)."""
+    companies_df = objects_df[objects_df['entity_type'] == 'Company']
+    if max_companies is not None:
+        companies_df = companies_df.head(max_companies)
+    return companies_df.drop_duplicates('id')
+
+
+class _CompanyPayloads:
+    """
+    The funding, team, financials and company payload fields of every company.
+
+    Funding rounds are aggregated with a single groupby on ``object_id``. The
+    synthetic team and financial fields are generated as whole columns from a
+    ``np.random.Generator`` seeded with ``seed``, in company order, so the same
+    tables always give the same payloads. ``json(positions)`` serializes the
+    payloads of the companies at the given positions only.
+    """
+
+    def __init__(self, companies_df, funding_rounds_df, seed):
+        self.company_ids = companies_df['id'].to_numpy()
+        self.category_codes = companies_df['category_code'].astype(object).to_numpy()
+
+        # Aggregate funding rounds per company (hash join instead of a per-row scan)
+        rounds_df = funding_rounds_df[funding_rounds_df['object_id'].isin(self.company_ids)]
+        round_groups = rounds_df.groupby('object_id', sort=False)
+        funded_at = rounds_df['funded_at']
+        if pd.api.types.is_datetime64_any_dtype(funded_at):
+            # Typed dataset cache: write the dates back out as they appear in the CSV
+            funded_at = funded_at.dt.strftime('%Y-%m-%d').astype(object).where(funded_at.notna(), np.nan)
+        # Missing amounts count as zero and missing types are "Unknown" (FundingAgent's
+        # own default), so no payload carries NaN into the agents' outputs
+        round_records = pd.DataFrame({
+            'type': rounds_df['funding_round_type'].astype(object).fillna('Unknown'),
+            'amount': rounds_df['raised_amount_usd'].fillna(0.0),
+            'date': funded_at
+        }).to_dict('records')
+        self.funding_data = {
+            object_id: [round_records[i] for i in positions]
+            for object_id, positions in round_groups.indices.items()
+        }
+        # Missing amounts count as zero funding
+        total_funding = round_groups['raised_amount_usd'].sum()
+        funding_by_company = total_funding.reindex(self.company_ids, fill_value=0.0).to_numpy()
+
+        rng = np.random.default_rng(seed)
+        num_companies = len(self.company_ids)
+
+        # Founding years parsed in bulk; missing or unparseable dates are unknown (NaN)
+        founded_at = companies_df['founded_at']
+        if not pd.api.types.is_datetime64_any_dtype(founded_at):
+            founded_at = pd.to_datetime(founded_at, errors='coerce', format='ISO8601')
+        founded_year = founded_at.dt.year.to_numpy(dtype=float)
+
+        # Estimate team size (very rough approximation): 1 employee per $1M funding
+        self.team_size = np.maximum(1, (funding_by_company / 1000000).astype(np.int64))
+
+        # 1-3 synthetic founders; founder i has 2*i fewer years of experience,
+        # based on company age (0 when the founding year is unknown)
+        self.num_founders = rng.integers(1, MAX_FOUNDERS + 1, size=num_companies)
+        self.experience_years = np.where(
+            np.isnan(founded_year)[:, None], 0,
+            np.maximum(1, 2023 - np.nan_to_num(founded_year)[:, None] - 2 * np.arange(MAX_FOUNDERS))
+        ).astype(np.int64)
+        self.has_exit = rng.random((num_companies, MAX_FOUNDERS)) > 0.8  # 20% chance of having an exit
+
+        # Synthetic financials: revenue is 10% of total funding, 5-25% monthly
+        # growth, 60-90% gross and 10-30% EBITDA margins
+        self.annual_revenue = funding_by_company.astype(float) * 0.1
+        self.growth_rate = rng.uniform(5.0, 25.0, size=num_companies)
+        self.gross_margin = rng.uniform(0.6, 0.9, size=num_companies)
+        self.ebitda_margin = rng.uniform(0.1, 0.3, size=num_companies)
+
+    def funded(self, company_ids) -> np.ndarray:
+        """Whether each company has funding rounds."""
+        return pd.Series(company_ids).isin(self.funding_data.keys()).to_numpy()
+
+    def company_json(self, positions) -> list:
+        return [
+            json.dumps({
+                'industry': category_code,
+                'market': category_code,
+                'tech_stack': [],  # We don't have tech stack data
+                'team_size': team_size
+            })
+            for category_code, team_size in zip(self.category_codes[positions].tolist(),
+                                                 self.team_size[positions].tolist())
+        ]
+
+    def json(self, positions) -> dict:
+        """The funding_json, team_json, financials_json and company (target_json) payloads at ``positions``."""
+        def team_json(founder_count, experience, exits, size):
+            return json.dumps({
+                'founders': [
+                    {'experience_years': years, 'has_exit': had_exit}
+                    for years, had_exit in zip(experience[:founder_count], exits[:founder_count])
+                ],
+                'estimated_team_size': size
+            })
+
+        def financials_json(revenue, growth, gross, ebitda):
+            return json.dumps({
+                'annual_revenue_usd': revenue,
+                'revenue_growth_mom': growth,
+                'gross_margin': gross,
+                'ebitda_margin': ebitda
+            })
+
+        return {
+            'funding_json': [json.dumps({'rounds': self.funding_data[company_id]})
+                             for company_id in self.company_ids[positions].tolist()],
+            'team_json': [
+                team_json(*columns) for columns in zip(
+                    self.num_founders[positions].tolist(), self.experience_years[positions].tolist(),
+                    self.has_exit[positions].tolist(), self.team_size[positions].tolist()
+                )
+            ],
+            'target_json': self.company_json(positions),
+            'financials_json': [
+                financials_json(*columns) for columns in zip(
+                    self.annual_revenue[positions].tolist(), self.growth_rate[positions].tolist(),
+                    self.gross_margin[positions].tolist(), self.ebitda_margin[positions].tolist()
+                )
+            ]
+        }
+
+
+def build_crunchbase_scenarios(objects_df, funding_rounds_df, max_companies=None, max_scenarios=None,
+                               seed=SCENARIO_SEED):
+    """
+    Build synthetic acquirer/target scenarios from Crunchbase tables.
+
+    Funding rounds are aggregated with a single groupby on ``object_id`` and
+    the acquirer/target pairs are joined against a company table keyed by
+    ``id``, so the cost grows linearly with the number of companies and rounds.
+    The synthetic team and financial fields are generated as whole columns
+    from a ``np.random.Generator`` seeded with ``seed``, so the same tables
+    always give the same scenarios.
+
+    Args:
+        objects_df: Crunchbase objects table
+        funding_rounds_df: Crunchbase funding rounds table
+        max_companies: Only use the first N companies (None for all)
+        max_scenarios: Build at most N scenarios (None for one per company)
+        seed: Seed for the synthetic team and financial fields
+
+    Returns:
+        DataFrame with startup_id and the five *_json columns
+    """
+    companies_df = _company_table(objects_df, max_companies)
+    print(f"Found {len(companies_df)} companies")
+    payloads = _CompanyPayloads(companies_df, funding_rounds_df, seed)
+    num_companies = len(payloads.company_ids)
+    
+    # Create synthetic acquirer-target pairs: company i acquires company i + 1
+    num_scenarios = num_companies if max_scenarios is None else min(max_scenarios, num_companies)
+    acquirers = np.arange(num_scenarios)
+    targets = (acquirers + 1) % max(num_companies, 1)
+    
+    # Skip pairs where we don't have funding data for either company
+    funded = payloads.funded(payloads.company_ids[acquirers]) & payloads.funded(payloads.company_ids[targets])
+    acquirers, targets = acquirers[funded], targets[funded]
+    
+    # The target's payloads, serialized once per scenario
+    target_payloads = payloads.json(targets)
+    return pd.DataFrame({
+        'startup_id': acquirers.tolist(),
+        'funding_json': target_payloads['funding_json'],
+        'team_json': target_payloads['team_json'],
+        'acquirer_json': payloads.company_json(acquirers),
+        'target_json': target_payloads['target_json'],
+        'financials_json': target_payloads['financials_json']
+    })
+
+
+def build_company_payloads(objects_df, funding_rounds_df, max_companies=None, seed=SCENARIO_SEED):
+    """
+    The target-side payloads of every funded company.
+
+    These are the funding_json, team_json, target_json and financials_json a
+    scenario from ``build_crunchbase_scenarios`` (with the same tables and
+    seed) carries when the company is its target, so features computed from
+    them match the training features.
+
+    Returns:
+        DataFrame with id, permalink (when the objects table has it) and the
+        four payload columns, in company order
+    """
+    companies_df = _company_table(objects_df, max_companies)
+    payloads = _CompanyPayloads(companies_df, funding_rounds_df, seed)
+    positions = np.flatnonzero(payloads.funded(payloads.company_ids))
+    columns = {'id': payloads.company_ids[positions].tolist()}
+    if 'permalink' in companies_df.columns:
+        columns['permalink'] = companies_df['permalink'].astype(object).to_numpy()[positions].tolist()
+    columns.update(payloads.json(positions))
+    return pd.DataFrame(columns)
+
+
+def process_crunchbase_data(max_companies=None, max_scenarios=None):
     """
     Process Crunchbase datasets to create training data for our models
+
+    Returns:
+        The scenario DataFrame saved to data/raw/crunchbase_startups.csv, or
+        None if the datasets could not be loaded or gave no scenarios
     """
     print("Processing Crunchbase datasets...")
     
     # Load the datasets
     try:
-        objects_df = pd.read_csv('datasets/objects.csv', low_memory=False)
-        funding_rounds_df = pd.read_csv('datasets/funding_rounds.csv', low_memory=False)
-        investments_df = pd.read_csv('datasets/investments.csv', low_memory=False)
+        objects_df = load_dataset('objects', columns=['id', 'entity_type', 'category_code', 'founded_at'])
+        funding_rounds_df = load_dataset(
+            'funding_rounds', columns=['object_id', 'funding_round_type', 'raised_amount_usd', 'funded_at']
+        )
         print("Datasets loaded successfully")
     except Exception as e:
         print(f"Error loading datasets: {e}")
-        return
-    
-    # Filter for companies only
-    companies_df = objects_df[objects_df['entity_type'] == 'Company'].copy()
-    print(f"Found {len(companies_df)} companies")
-    
-    # Process a sample of companies for demonstration (to avoid memory issues)
-    sample_companies = companies_df.head(1000)
-    
-    # Create funding data for each company
-    funding_data = {}
-    for _, round_row in funding_rounds_df.iterrows():
-        object_id = round_row['object_id']
-        if object_id in sample_companies['id'].values:
-            if object_id not in funding_data:
-                funding_data[object_id] = []
-            
-            funding_data[object_id].append({
-                'type': round_row['funding_round_type'],
-                'amount': round_row['raised_amount_usd'],
-                'date': round_row['funded_at']
-            })
-    
-    # Create synthetic team data based on company information
-    team_data = {}
-    for _, company_row in sample_companies.iterrows():
-        company_id = company_row['id']
-        # Create synthetic team data based on company age and funding
-        founded_year = None
-        if pd.notna(company_row['founded_at']):
-            try:
-                founded_year = pd.to_datetime(company_row['founded_at']).year
-            except:
-                pass
-        
-        # Estimate team size based on funding and age
-        total_funding = 0
-        if company_id in funding_data:
-            total_funding = sum([f.get('amount', 0) or 0 for f in funding_data[company_id]])
-        
-        # Estimate team size (very rough approximation)
-        estimated_team_size = max(1, int(total_funding / 1000000))  # 1 employee per $1M funding
-        
-        # Create synthetic founders (1-3 founders)
-        import random
-        num_founders = random.randint(1, 3)
-        founders = []
-        for i in range(num_founders):
-            # Founder experience based on company age
-            experience_years = 0
-            if founded_year:
-                experience_years = max(1, 2023 - founded_year - i*2)
-            
-            founders.append({
-                'experience_years': experience_years,
-                'has_exit': random.random() > 0.8  # 20% chance of having an exit
-            })
-        
-        team_data[company_id] = {
-            'founders': founders,
-            'estimated_team_size': estimated_team_size
-        }
-    
-    # Create synthetic financial data
-    financial_data = {}
-    for company_id in sample_companies['id'].values:
-        # Create synthetic financials based on funding
-        total_funding = 0
-        if company_id in funding_data:
-            total_funding = sum([f.get('amount', 0) or 0 for f in funding_data[company_id]])
-        
-        # Estimate revenue (very rough - 10% of total funding as annual revenue)
-        annual_revenue = total_funding * 0.1
-        
-        # Estimate growth rate (higher for younger companies)
-        growth_rate = np.random.uniform(5.0, 25.0)  # 5-25% monthly growth
-        
-        # Estimate margins
-        gross_margin = np.random.uniform(0.6, 0.9)
-        ebitda_margin = np.random.uniform(0.1, 0.3)
-        
-        financial_data[company_id] = {
-            'annual_revenue_usd': annual_revenue,
-            'revenue_growth_mom': growth_rate,
-            'gross_margin': gross_margin,
-            'ebitda_margin': ebitda_margin
-        }
-    
-    # Create synthetic acquirer-target pairs
-    # For demonstration, we'll create pairs from the same dataset
-    processed_data = []
-    company_ids = list(sample_companies['id'].values)
+        return None
     
-    # Create 2000 synthetic acquisition scenarios
-    for i in range(min(2000, len(company_ids))):
-        acquirer_id = company_ids[i % len(company_ids)]
-        target_id = company_ids[(i + 1) % len(company_ids)]
-        
-        # Skip if we don't have data for either company
-        if acquirer_id not in funding_data or target_id not in funding_data:
-            continue
-            
-        # Create startup data
-        startup_data = {
-            'startup_id': i,
-            'funding_json': json.dumps({
-                'rounds': funding_data.get(target_id, [])
-            }),
-            'team_json': json.dumps(team_data.get(target_id, {'founders': []})),
-            'acquirer_json': json.dumps({
-                'industry': sample_companies[sample_companies['id'] == acquirer_id]['category_code'].iloc[0] if not sample_companies[sample_companies['id'] == acquirer_id]['category_code'].empty else 'unknown',
-                'market': sample_companies[sample_companies['id'] == acquirer_id]['category_code'].iloc[0] if not sample_companies[sample_companies['id'] == acquirer_id]['category_code'].empty else 'unknown',
-                'tech_stack': [],  # We don't have tech stack data
-                'team_size': team_data.get(acquirer_id, {}).get('estimated_team_size', 10)
-            }),
-            'target_json': json.dumps({
-                'industry': sample_companies[sample_companies['id'] == target_id]['category_code'].iloc[0] if not sample_companies[sample_companies['id'] == target_id]['category_code'].empty else 'unknown',
-                'market': sample_companies[sample_companies['id'] == target_id]['category_code'].iloc[0] if not sample_companies[sample_companies['id'] == target_id]['category_code'].empty else 'unknown',
-                'tech_stack': [],  # We don't have tech stack data
-                'team_size': team_data.get(target_id, {}).get('estimated_team_size', 10)
-            }),
-            'financials_json': json.dumps(financial_data.get(target_id, {}))
-        }
-        
-        processed_data.append(startup_data)
+    df = build_crunchbase_scenarios(objects_df, funding_rounds_df, max_companies, max_scenarios)
     
     # Save processed data
-    if processed_data:
-        df = pd.DataFrame(processed_data)
+    if not df.empty:
         df.to_csv('data/raw/crunchbase_startups.csv', index=False)
-        print(f"Processed {len(processed_data)} startup scenarios and saved to data/raw/crunchbase_startups.csv")
+        print(f"Processed {len(df)} startup scenarios and saved to data/raw/crunchbase_startups.csv")
+        return df
     else:
         print("No data processed")
+        return None
+
+
+def snapshot_agents():
+    """The agents whose outputs the company snapshot holds: funding, team, valuation and business model."""
+    return FundingAgent(), TeamAgent(load_datasets=False), ValuationAgent(), BusinessModelAgent()
 
-def build_enhanced_features():
+
+def company_records(payloads_df, agents=None):
     """
-    Build enhanced features using the Crunchbase data
+    Precomputed agent outputs of each company, for the company snapshot.
+
+    Runs the funding, team, valuation and business model agents on the
+    payloads from ``build_company_payloads``, exactly as /predict does for the
+    same JSON, and keeps the company profile for the synergy agent. Companies
+    that an agent rejects are skipped.
+
+    Args:
+        payloads_df: Output of ``build_company_payloads``
+        agents: ``snapshot_agents()``; created if omitted
+
+    Yields:
+        Dicts with id, permalink, funding, team, valuation, business_model and target
+    """
+    funding_agent, team_agent, valuation_agent, business_model_agent = agents or snapshot_agents()
+    permalinks = payloads_df['permalink'] if 'permalink' in payloads_df.columns else [None] * len(payloads_df)
+    for company_id, permalink, funding_text, team_text, target_text, financials_text in zip(
+        payloads_df['id'], permalinks, payloads_df['funding_json'], payloads_df['team_json'],
+        payloads_df['target_json'], payloads_df['financials_json']
+    ):
+        funding_json, team_json = json.loads(funding_text), json.loads(team_text)
+        financials_json = json.loads(financials_text)
+        try:
+            record = {
+                'id': company_id,
+                'permalink': permalink if isinstance(permalink, str) else None,
+                'funding': funding_agent.transform(funding_json),
+                'team': team_agent.transform(team_json),
+                'valuation': valuation_agent.transform(financials_json),
+                'business_model': business_model_agent.transform(funding_json, team_json, financials_json),
+                'target': json.loads(target_text)
+            }
+        except Exception as e:
+            print(f"Skipping company {company_id}: {e}")
+            continue
+        yield record
+
+
+def build_company_snapshot(objects_df, funding_rounds_df, path=COMPANY_SNAPSHOT_PATH, max_companies=None,
+                           seed=SCENARIO_SEED):
+    """
+    Write the snapshot of precomputed agent outputs for every funded company.
+
+    /predict looks companies up in it by id or permalink instead of running
+    the agents on request payloads (see ``models.company_snapshot``).
+
+    Returns:
+        Number of companies in the snapshot
+    """
+    agents = snapshot_agents()
+    payloads_df = build_company_payloads(objects_df, funding_rounds_df, max_companies, seed)
+    return write_company_snapshot(path, company_records(payloads_df, agents), manifest={
+        'versions': feature_versions(agents),
+        'seed': seed
+    })
+
+
+def process_company_snapshot(path=COMPANY_SNAPSHOT_PATH):
+    """
+    Build the company snapshot from the Crunchbase datasets
+
+    Returns:
+        Number of companies written, or None if the datasets could not be loaded
     """
-    print("Building enhanced features from Crunchbase data...")
-    
-    # Load the processed crunchbase data
     try:
-        df = pd.read_csv('data/raw/crunchbase_startups.csv')
-        print(f"Loaded {len(df)} startup records")
+        objects_df = load_dataset('objects', columns=['id', 'entity_type', 'permalink', 'category_code', 'founded_at'])
+        funding_rounds_df = load_dataset(
+            'funding_rounds', columns=['object_id', 'funding_round_type', 'raised_amount_usd', 'funded_at']
+        )
     except Exception as e:
-        print(f"Error loading data: {e}")
-        return
+        print(f"Error loading datasets: {e}")
+        return None
+
+    count = build_company_snapshot(objects_df, funding_rounds_df, path)
+    print(f"Wrote {count} companies to the snapshot at {path}")
+    return count
+
+
+def build_enhanced_features(chunk_size=DEFAULT_CHUNK_SIZE, workers=DEFAULT_WORKERS, store_path=FEATURE_STORE_PATH):
+    """
+    Build enhanced features using the Crunchbase data
+
+    The scenarios are streamed through the agents in chunks of ``chunk_size``
+    rows, so the feature file is written without holding the dataset in memory.
+    With a feature store (``store_path``, FEATURE_STORE sets the default) only
+    the scenarios that changed since the last run are recomputed. Without one
+    (``store_path`` empty) every scenario is recomputed, sharded by startup_id
+    across a process pool when ``workers`` > 1 (FEATURE_WORKERS sets the default).
+
+    Returns:
+        Path of the feature file, or None if no features were generated
+    """
+    print("Building enhanced features from Crunchbase data...")
     
-    # Initialize agents
-    funding_agent = FundingAgent()
-    team_agent = TeamAgent()
-    synergy_agent = SynergyAgent()
-    val_agent = ValuationAgent()
+    if not os.path.exists('data/raw/crunchbase_startups.csv'):
+        print("Error loading data: data/raw/crunchbase_startups.csv not found")
+        return None
     
-    # Process each row to generate features
-    feature_rows = []
+    output_path = 'data/processed/crunchbase_features.csv'
+    if store_path:
+        stats = update_features('data/raw/crunchbase_startups.csv', output_path, store_path, chunk_size)
+        print(f"Processed {stats['rows_read']} startup records ({stats['rows_recomputed']} recomputed, "
+              f"{stats['rows_removed']} removed from the feature store)")
+    else:
+        stats = stream_features('data/raw/crunchbase_startups.csv', output_path, chunk_size, workers=workers)
+        print(f"Processed {stats['rows_read']} startup records")
     
-    for _, row in tqdm(df.iterrows(), total=len(df), desc="Processing startups"):
-        try:
-            startup_id = row['startup_id']
-            
-            # Parse JSON data
-            funding_json = json.loads(row['funding_json']) if isinstance(row['funding_json'], str) else row['funding_json']
-            team_json = json.loads(row['team_json']) if isinstance(row['team_json'], str) else row['team_json']
-            acquirer_json = json.loads(row['acquirer_json']) if isinstance(row['acquirer_json'], str) else row['acquirer_json']
-            target_json = json.loads(row['target_json']) if isinstance(row['target_json'], str) else row['target_json']
-            financials_json = json.loads(row['financials_json']) if isinstance(row['financials_json'], str) else row['financials_json']
-            
-            # Generate features using the agents
-            funding_features = funding_agent.transform(funding_json)
-            team_features = team_agent.transform(team_json)
-            synergy_features = synergy_agent.transform(acquirer_json, target_json)
-            valuation_features = val_agent.transform(financials_json)
-            
-            # Combine all features into one dictionary
-            combined_features = {
-                'startup_id': startup_id,
-                **funding_features,
-                **team_features,
-                **synergy_features,
-                **valuation_features
-            }
-            
-            feature_rows.append(combined_features)
-        except Exception as e:
-            print(f"Error processing startup {row.get('startup_id', 'unknown')}: {e}")
-            continue
+    skipped = stats['rows_read'] - stats['rows_written']
+    if skipped:
+        print(f"Skipped {skipped} startups with invalid data")
     
-    # Convert to DataFrame and save
-    if feature_rows:
-        features_df = pd.DataFrame(feature_rows)
-        features_df.to_csv('data/processed/crunchbase_features.csv', index=False)
-        print(f"Feature file created with {len(feature_rows)} records!")
-        return features_df
+    if stats['rows_written']:
+        print(f"Feature file created with {stats['rows_written']} records!")
+        return output_path
     else:
         print("No features generated")
         return None
 
-def enhance_training_data_with_targets(features_df):
+def add_valuation_targets(features_df):
     """
-    Enhance the training data with synthetic target variables for valuation modeling
+    Add the synthetic ``valuation_12m_forward`` target to a chunk of features
+
+    The noise comes from NumPy's global generator, so targets for consecutive
+    chunks are the same as for the whole table at once.
     """
-    if features_df is None or features_df.empty:
-        print("No features data to enhance")
-        return
-    
-    print("Enhancing training data with target variables...")
-    
-    # Create synthetic target variables
-    # For demonstration, we'll create realistic targets based on features
-    
     # Create a valuation forecast based on current valuation and growth factors
     features_df['valuation_12m_forward'] = features_df['valuation_proxy_current'] * (
         1 + (features_df['revenue_growth_mom'] / 100) * 12 * 0.8  # 80% of growth rate
@@ -247,19 +394,45 @@ def enhance_training_data_with_targets(features_df):
     
     # Ensure positive values
     features_df['valuation_12m_forward'] = np.maximum(features_df['valuation_12m_forward'], 0)
+    return features_df
+
+def enhance_training_data_with_targets(features, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Enhance the training data with synthetic target variables for valuation modeling
+
+    Args:
+        features: Feature DataFrame, or the path of a feature CSV to stream in chunks
+        chunk_size: Rows per chunk when streaming from a file
+
+    Returns:
+        The DataFrame with the target column added (in place) when ``features``
+        is a DataFrame, otherwise None
+    """
+    if features is None or (isinstance(features, pd.DataFrame) and features.empty):
+        print("No features data to enhance")
+        return
+    
+    print("Enhancing training data with target variables...")
+    
+    # Create synthetic target variables
+    # For demonstration, we'll create realistic targets based on features
+    chunks = [features] if isinstance(features, pd.DataFrame) else pd.read_csv(features, chunksize=chunk_size)
     
     # Save enhanced data
-    features_df.to_csv('data/processed/crunchbase_features_with_targets.csv', index=False)
+    with FeatureWriter('data/processed/crunchbase_features_with_targets.csv') as writer:
+        for chunk in chunks:
+            writer.write(add_valuation_targets(chunk))
     print("Enhanced training data saved!")
+    return features if isinstance(features, pd.DataFrame) else None
 
 if __name__ == "__main__":
     # Process the Crunchbase datasets
     process_crunchbase_data()
     
     # Build features
-    features_df = build_enhanced_features()
+    features_path = build_enhanced_features()
     
     # Enhance with targets
-    enhance_training_data_with_targets(features_df)
+    enhance_training_data_with_targets(features_path)
     
     print("Dataset processing complete!")
\ No newline at end of file
@@ -0,0 +1,52 @@
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from fastapi.testclient import TestClient
+from src.api import app as api
+
+client = TestClient(api.app)
+
+# Test data
+test_data = {
+    "funding_json": {"rounds": [{"type": "Seed", "amount": "500000"}]},
+    "team_json": {"founders": [{"experience_years": 5, "has_exit": True}]},
+    "acquirer_json": {"industry": "tech", "market": "saas", "tech_stack": ["python"], "team_size": 500},
+    "target_json": {"industry": "tech", "market": "saas", "tech_stack": ["python"], "team_size": 50},
+    "financials_json": {"monthly_revenue_usd": 100000, "revenue_growth_mom": 15.0, "gross_margin": 0.8}
+}
+
+
+def test_predict_runs_on_inference_pool():
+    response = client.post("/predict", json=test_data)
+    assert response.status_code == 200
+    assert "mna_likelihood" in response.json()
+    assert api.inference_pool.in_flight == 0
+
+
+def test_saturated_pool_returns_503_and_health_stays_up():
+    # A scenario the result cache has not seen, so the request needs the pool
+    uncached = dict(test_data, financials_json=dict(test_data["financials_json"], revenue_growth_mom=77.7))
+    limit = api.inference_pool.max_in_flight
+    api.inference_pool.max_in_flight = 0
+    try:
+        response = client.post("/predict", json=uncached)
+        batch_response = client.post("/predict/batch", json={"items": [test_data]})
+        health = client.get("/health")
+    finally:
+        api.inference_pool.max_in_flight = limit
+
+    print(f"Status when saturated: {response.status_code}, Retry-After: {response.headers.get('retry-after')}")
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == str(api.RETRY_AFTER_SECONDS)
+    assert batch_response.status_code == 503
+    assert health.status_code == 200
+    assert health.json()["inference_pool"]["rejected"] >= 2
+
+    # Capacity is back once the limit is restored
+    assert client.post("/predict", json=test_data).status_code == 200
+
+
+if __name__ == "__main__":
+    test_predict_runs_on_inference_pool()
+    test_saturated_pool_returns_503_and_health_stays_up()
@@ -0,0 +1,79 @@
+import sys
+import os
+import copy
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from fastapi.testclient import TestClient
+from src.api.app import app
+
+client = TestClient(app)
+
+# Test data
+test_data = {
+    "funding_json": {
+        "rounds": [
+            {"type": "Seed", "amount": "500000"},
+            {"type": "Series A", "amount": "2000000"}
+        ]
+    },
+    "team_json": {
+        "founders": [
+            {"experience_years": 5, "has_exit": True},
+            {"experience_years": 3, "has_exit": False}
+        ]
+    },
+    "acquirer_json": {
+        "industry": "tech",
+        "market": "saas",
+        "tech_stack": ["python", "react"],
+        "team_size": 500
+    },
+    "target_json": {
+        "industry": "tech",
+        "market": "saas",
+        "tech_stack": ["python", "angular"],
+        "team_size": 50
+    },
+    "financials_json": {
+        "monthly_revenue_usd": 100000,
+        "revenue_growth_mom": 15.0,
+        "gross_margin": 0.8
+    }
+}
+
+
+def test_batch_matches_single_predictions():
+    second = copy.deepcopy(test_data)
+    second["funding_json"]["rounds"].append({"type": "Series B", "amount": 10000000})
+    second["financials_json"]["revenue_growth_mom"] = 40.0
+
+    singles = [client.post("/predict", json=item).json() for item in (test_data, second)]
+    batch = client.post("/predict/batch", json={"items": [test_data, second]}).json()
+
+    print(f"Batch count: {batch['count']}, errors: {batch['error_count']}")
+    assert batch["count"] == 2
+    assert batch["error_count"] == 0
+    for index, single in enumerate(singles):
+        result = batch["results"][index]
+        assert result["index"] == index
+        assert result["result"]["mna_likelihood"] == single["mna_likelihood"]
+        assert result["result"]["valuation_forecast_usd"] == single["valuation_forecast_usd"]
+        assert result["result"]["decision_score"] == single["decision_score"]
+
+
+def test_batch_keeps_item_errors_separate():
+    bad = copy.deepcopy(test_data)
+    bad["team_json"]["founders"] = [{"experience_years": "many"}]
+
+    batch = client.post("/predict/batch", json={"items": [test_data, bad, test_data]}).json()
+
+    print(f"Batch results: {[sorted(r.keys()) for r in batch['results']]}")
+    assert batch["error_count"] == 1
+    assert "result" in batch["results"][0]
+    assert "error" in batch["results"][1]
+    assert batch["results"][2]["result"]["mna_likelihood"] == batch["results"][0]["result"]["mna_likelihood"]
+
+
+if __name__ == "__main__":
+    test_batch_matches_single_predictions()
+    test_batch_keeps_item_errors_separate()
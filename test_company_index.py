@@ -0,0 +1,83 @@
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+import numpy as np
+import pandas as pd
+
+from models.company_index import CompanyIndex
+
+NAMES = ["Facebook", "Facebook Fan Club", "Google", "Goo", "Yahoo!", "Acme Web", None, "face.com", "Zynga"]
+
+
+def make_tables():
+    rng = np.random.default_rng(3)
+    count = 3000
+    companies = pd.DataFrame({
+        "id": [f"c:{i}" for i in range(count)],
+        "name": [NAMES[i % len(NAMES)] if i % 7 else f"Startup {i}" for i in range(count)],
+        "permalink": [f"/company/{i}" for i in range(count)],
+        "domain": [f"{i}.com" for i in range(count)],
+        "category_code": rng.choice(["web", "games_video", "software", None], count),
+        "funding_total_usd": np.where(rng.random(count) < 0.2, np.nan, rng.integers(0, 10**8, count))
+    })
+    acquisitions = pd.DataFrame({
+        "acquiring_object_id": rng.choice(companies["id"].head(50), 400),
+        "acquired_object_id": rng.choice(list(companies["id"]) + ["c:missing"], 400),
+        "price_amount": np.where(rng.random(400) < 0.5, np.nan, rng.integers(0, 10**9, 400)),
+        "price_currency_code": "USD",
+        "acquired_at": "2010-01-01"
+    })
+    return companies, acquisitions
+
+
+def reference_competitors(companies, company_name, industry=None):
+    """The original pandas filter used by TeamAgent.find_competitors."""
+    mask = companies["name"].str.contains(company_name, case=False, na=False, regex=False) == False
+    if industry:
+        mask &= companies["category_code"] == industry
+    return companies[mask].head(10)["permalink"].tolist()
+
+
+def reference_targets(companies, acquisitions, acquirer_name):
+    """The original pandas filters used by TeamAgent.find_acquisition_targets."""
+    matches = companies[companies["name"].str.contains(acquirer_name, case=False, na=False, regex=False)]
+    if matches.empty:
+        return []
+    rows = acquisitions[acquisitions["acquiring_object_id"] == matches.iloc[0]["id"]].head(10)
+    permalinks = []
+    for acquired_id in rows["acquired_object_id"]:
+        company = companies[companies["id"] == acquired_id]
+        if not company.empty:
+            permalinks.append(company.iloc[0]["permalink"])
+    return permalinks
+
+
+def test_index_matches_dataframe_filters():
+    companies, acquisitions = make_tables()
+    index = CompanyIndex(companies, acquisitions)
+
+    for query in ["facebook", "Goo", "go", "!", "startup 1", "zzz", "a"]:
+        for industry in [None, "web", "software", "unknown"]:
+            actual = [c["permalink"] for c in index.find_competitors(query, industry)]
+            assert actual == reference_competitors(companies, query, industry), (query, industry)
+        actual = [t["permalink"] for t in index.find_acquisition_targets(query)]
+        assert actual == reference_targets(companies, acquisitions, query), query
+
+    competitors = index.find_competitors("facebook")
+    assert all(isinstance(c["funding_total_usd"], float) and not np.isnan(c["funding_total_usd"]) for c in competitors)
+
+
+def test_exact_and_prefix_lookup():
+    companies, acquisitions = make_tables()
+    index = CompanyIndex(companies, acquisitions)
+
+    assert index.lookup("  FACEBOOK ") == [i for i, name in enumerate(companies["name"]) if name == "Facebook"]
+    prefix = [index.company(p)["name"] for p in index.search_prefix("face", limit=50)]
+    assert prefix and all(name.lower().startswith("face") for name in prefix)
+    assert index.position_of("c:5") == 5
+
+
+if __name__ == "__main__":
+    test_index_matches_dataframe_filters()
+    test_exact_and_prefix_lookup()
@@ -0,0 +1,98 @@
+import sys
+import os
+import json
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from fastapi.testclient import TestClient
+
+from src.api import app as api
+from models import company_snapshot
+from models.company_snapshot import CompanySnapshot
+from models.funding_agent import FundingAgent
+from models.team_agent import TeamAgent
+from pipeline.process_datasets import build_company_payloads, build_company_snapshot, build_crunchbase_scenarios
+from test_process_datasets import make_tables
+
+client = TestClient(api.app)
+
+acquirer_json = {"industry": "software", "market": "software", "tech_stack": ["python"], "team_size": 200}
+
+
+def make_snapshot(tmp_path, tables=None):
+    objects_df, funding_rounds_df = tables or make_tables()
+    objects_df["permalink"] = "/company/" + objects_df["id"].str.replace(":", "-")
+    path = str(tmp_path / "snapshot")
+    build_company_snapshot(objects_df, funding_rounds_df, path)
+    return CompanySnapshot(path), build_company_payloads(objects_df, funding_rounds_df), objects_df, funding_rounds_df
+
+
+def test_snapshot_holds_agent_outputs_of_the_training_payloads(tmp_path):
+    snapshot, payloads, objects_df, funding_rounds_df = make_snapshot(tmp_path)
+    assert snapshot.size == len(payloads) == funding_rounds_df["object_id"].nunique()
+
+    # The payloads are the ones a training scenario carries for the same target
+    scenarios = build_crunchbase_scenarios(objects_df, funding_rounds_df)
+    target_ids = objects_df["id"].to_numpy()[(scenarios["startup_id"].to_numpy() + 1) % len(objects_df)]
+    by_id = payloads.set_index("id")
+    for column in ("funding_json", "team_json", "target_json", "financials_json"):
+        assert scenarios[column].tolist() == by_id.loc[target_ids, column].tolist()
+
+    for row in payloads.head(20).itertuples():
+        record = snapshot.get(row.id)
+        assert snapshot.get(row.permalink) == record
+        assert record["funding"] == FundingAgent().transform(json.loads(row.funding_json))
+        assert record["team"] == TeamAgent(load_datasets=False).transform(json.loads(row.team_json))
+        assert record["target"] == json.loads(row.target_json)
+    assert snapshot.get("c:does-not-exist") is None
+
+
+def test_lookup_resolves_hash_collisions(tmp_path, monkeypatch):
+    monkeypatch.setattr(company_snapshot, "key_hash", lambda key: 0)
+    snapshot, payloads, _, _ = make_snapshot(tmp_path)
+    for company_id in payloads["id"].head(5):
+        assert snapshot.get(company_id)["id"] == company_id
+    assert "c:does-not-exist" not in snapshot
+
+
+def test_predict_by_company_reference_matches_payloads(tmp_path, monkeypatch):
+    api.model_registry.wait()
+    snapshot, payloads, _, _ = make_snapshot(tmp_path)
+    monkeypatch.setattr(api, "company_snapshot", snapshot)
+    row = payloads.iloc[3]
+    by_payload = client.post("/predict", json={
+        "funding_json": json.loads(row["funding_json"]), "team_json": json.loads(row["team_json"]),
+        "acquirer_json": acquirer_json, "target_json": json.loads(row["target_json"]),
+        "financials_json": json.loads(row["financials_json"])
+    }).json()
+
+    for company in (row["id"], row["permalink"]):
+        assert client.post("/predict", json={"acquirer_json": acquirer_json, "company": company}).json() == by_payload
+
+    assert client.post("/predict", json={"acquirer_json": acquirer_json, "company": "c:missing"}).status_code == 404
+    assert client.post("/predict", json={"acquirer_json": acquirer_json}).status_code == 422
+    assert client.post("/predict", json={"acquirer_json": acquirer_json, "company": row["id"],
+                                         "funding_json": {"rounds": []}}).status_code == 422
+
+    batch = client.post("/predict/batch", json={"items": [
+        {"acquirer_json": acquirer_json, "company": row["id"]},
+        {"acquirer_json": acquirer_json, "company": "c:missing"}
+    ]}).json()
+    assert batch["results"][0]["result"] == by_payload
+    assert "Unknown company" in batch["results"][1]["error"]
+
+
+def test_predict_by_reference_with_missing_round_fields(tmp_path, monkeypatch):
+    api.model_registry.wait()
+    objects_df, funding_rounds_df = make_tables()
+    funding_rounds_df.loc[0, "raised_amount_usd"] = float("nan")
+    funding_rounds_df.loc[1, "funding_round_type"] = float("nan")
+    snapshot, _, _, _ = make_snapshot(tmp_path, (objects_df, funding_rounds_df))
+    monkeypatch.setattr(api, "company_snapshot", snapshot)
+
+    no_amount, no_type = funding_rounds_df["object_id"].iloc[:2]
+    response = client.post("/predict", json={"acquirer_json": acquirer_json, "company": no_amount})
+    assert response.status_code == 200
+    assert response.json()["funding_json"]["total_raised_usd"] == 0.0
+    response = client.post("/predict", json={"acquirer_json": acquirer_json, "company": no_type})
+    assert response.status_code == 200
+    assert response.json()["funding_json"]["last_round_type"] == "Unknown"
@@ -0,0 +1,59 @@
+import sys
+import os
+import json
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+import pandas as pd
+
+from models.funding_agent import FundingAgent
+from pipeline.build_features import stream_features
+from pipeline.feature_store import FeatureStore, update_features
+from test_vectorized_agents import make_frame
+
+
+def build_both(raw, tmp_path):
+    raw_path = str(tmp_path / "startups.csv")
+    raw.to_csv(raw_path, index=False)
+    stream_features(raw_path, str(tmp_path / "full.csv"), chunk_size=64, progress=False)
+    stats = update_features(raw_path, str(tmp_path / "incremental.csv"), str(tmp_path / "store.sqlite"),
+                            chunk_size=64, progress=False)
+    assert (tmp_path / "incremental.csv").read_bytes() == (tmp_path / "full.csv").read_bytes()
+    return stats
+
+
+def test_only_changed_rows_are_recomputed(tmp_path):
+    raw = make_frame(400)
+    stats = build_both(raw, tmp_path)
+    assert stats["rows_recomputed"] == 400
+    assert stats["rows_written"] < 400  # make_frame has rows the agents reject
+
+    stats = build_both(raw, tmp_path)
+    assert stats["rows_recomputed"] == 0
+    assert stats["rows_removed"] == 0
+
+    # Two changed rounds, a fixed rejected row, two removed startups and a new one
+    raw.loc[10, "funding_json"] = json.dumps({"rounds": [{"type": "seed", "amount": 1000000}]})
+    raw.loc[20, "funding_json"] = json.dumps({"rounds": []})
+    raw.loc[7, "funding_json"] = json.dumps({"rounds": []})
+    raw = raw.drop(index=[30, 31])
+    new_row = raw.loc[[50]].assign(startup_id=1000)
+    raw = pd.concat([raw.iloc[:100], new_row, raw.iloc[100:]], ignore_index=True)
+    stats = build_both(raw, tmp_path)
+    assert stats["rows_recomputed"] == 4
+    assert stats["rows_removed"] == 2
+    with FeatureStore(str(tmp_path / "store.sqlite")) as store:
+        assert len(store) == 399
+
+
+def test_agent_version_bump_recomputes_everything(tmp_path, monkeypatch):
+    raw = make_frame(200)
+    build_both(raw, tmp_path)
+    monkeypatch.setattr(FundingAgent, "FEATURE_VERSION", FundingAgent.FEATURE_VERSION + 1)
+    assert build_both(raw, tmp_path)["rows_recomputed"] == 200
+    assert build_both(raw, tmp_path)["rows_recomputed"] == 0
+
+
+if __name__ == "__main__":
+    import tempfile
+    import pathlib
+    test_only_changed_rows_are_recomputed(pathlib.Path(tempfile.mkdtemp()))
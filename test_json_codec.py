@@ -0,0 +1,91 @@
+import sys
+import os
+import json
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+import pandas as pd
+import pyarrow.parquet as pq
+from fastapi.testclient import TestClient
+
+from src.api import app as api
+from models import json_codec
+from pipeline.build_features import convert_raw_to_parquet, stream_features
+from test_vectorized_agents import make_frame
+
+client = TestClient(api.app)
+
+
+def test_backends_decode_identically():
+    cells = make_frame(300)["funding_json"].tolist() + [
+        '{"rounds": [{"amount": NaN, "date": NaN}]}',  # written by json.dumps for missing values
+        '{"amount": Infinity, "team_size": 18446744073709551615}',
+        b'{"rounds": []}',
+        "not json",
+        float("nan"),
+        {"already": "parsed"}
+    ]
+    json_codec.loads = json_codec.get_decoder("json")
+    expected = json.dumps(json_codec.loads_column(cells), default=str)
+    for name in ("auto", "orjson"):
+        json_codec.loads = json_codec.get_decoder(name)
+        try:
+            assert json.dumps(json_codec.loads_column(cells), default=str) == expected, name
+        finally:
+            json_codec.loads = json_codec.get_decoder()
+    assert json_codec.loads_column(["not json"]) == [None]
+
+
+def test_typed_column_roundtrip():
+    sparse = [{"rounds": [{"type": "angel"}, {"type": "seed", "amount": 1.5}]}, {"rounds": []}, {"team_size": 3}]
+    array = json_codec.to_typed_column(sparse)
+    assert array is not None
+    assert json_codec.from_typed_column(array) == sparse
+
+    # Payloads Arrow would change are left as JSON
+    assert json_codec.to_typed_column([{"size": 1}, {"size": 2.5}]) is None
+    assert json_codec.to_typed_column([{"industry": None}]) is None
+    assert json_codec.to_typed_column([{"size": 1}, None]) is None
+
+
+def test_typed_parquet_features_match_csv(tmp_path):
+    # Regular payloads, as process_datasets writes them
+    raw = pd.DataFrame({
+        "startup_id": range(4),
+        "funding_json": [json.dumps({"rounds": [{"type": "angel", "amount": float(i) * 1e6, "date": "2010-01-01"}] * i})
+                         for i in range(4)],
+        "team_json": [json.dumps({"founders": [{"experience_years": 5 + i, "has_exit": i % 2 == 0}],
+                                  "estimated_team_size": i}) for i in range(4)],
+        "acquirer_json": [json.dumps({"industry": "web", "market": "web", "tech_stack": [], "team_size": 10})] * 4,
+        "target_json": [json.dumps({"industry": "web", "market": "web", "tech_stack": [], "team_size": i + 1})
+                        for i in range(4)],
+        "financials_json": [json.dumps({"annual_revenue_usd": 1e5 * i, "revenue_growth_mom": 5.0,
+                                        "gross_margin": 0.7, "ebitda_margin": 0.2}) for i in range(4)]
+    })
+    raw.loc[1, "funding_json"] = json.dumps({"rounds": [{"type": "angel", "amount": float("nan"), "date": "2010-01-01"}]})
+
+    for name, frame in (("regular", raw), ("irregular", make_frame(300))):
+        csv_path = str(tmp_path / f"{name}.csv")
+        parquet_path = str(tmp_path / f"{name}.parquet")
+        frame.to_csv(csv_path, index=False)
+        layout = convert_raw_to_parquet(csv_path, parquet_path)
+        if name == "regular":
+            assert set(layout.values()) == {"typed"}
+            assert "rounds" in str(pq.read_schema(parquet_path).field("funding_json").type)
+
+        stream_features(csv_path, str(tmp_path / "from_csv.csv"), chunk_size=64, progress=False)
+        stream_features(parquet_path, str(tmp_path / "from_parquet.csv"), chunk_size=64, progress=False)
+        assert (tmp_path / "from_parquet.csv").read_bytes() == (tmp_path / "from_csv.csv").read_bytes(), name
+
+
+def test_api_decodes_bodies_with_codec():
+    response = client.post("/predict", content=b'{"funding_json": {', headers={"content-type": "application/json"})
+    assert response.status_code == 422
+
+
+if __name__ == "__main__":
+    import tempfile
+    import pathlib
+    test_backends_decode_identically()
+    test_typed_column_roundtrip()
+    test_typed_parquet_features_match_csv(pathlib.Path(tempfile.mkdtemp()))
+    test_api_decodes_bodies_with_codec()
@@ -0,0 +1,75 @@
+import sys
+import os
+import warnings
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.api import app as api
+from models.funding_agent import ROUND_TYPES, round_type_code, round_type_codes
+from models.inference_plan import InferencePlan
+from models.train_with_crunchbase import META_FEATURE_COLUMNS, ROUND_TYPE_CODE_COLUMN, VALUATION_FEATURE_COLUMNS, \
+    meta_training_data, train_meta_model_with_crunchbase, train_valuation_model_with_crunchbase, \
+    valuation_training_data
+from pipeline.build_features import stream_features
+from pipeline.process_datasets import add_valuation_targets
+from test_vectorized_agents import make_frame
+
+
+def test_round_type_codes():
+    assert round_type_code("Series A") == round_type_code("series-a") == ROUND_TYPES.index("series-a")
+    assert round_type_code("Series D") == round_type_code("series-c+")
+    assert round_type_code("pre_seed") == ROUND_TYPES.index("pre-seed")
+    assert np.isnan(round_type_code("Unknown")) and np.isnan(round_type_code(None))
+    np.testing.assert_array_equal(round_type_codes(["Seed", np.nan, "Series B"]),
+                                  [ROUND_TYPES.index("seed"), np.nan, ROUND_TYPES.index("series-b")])
+
+
+def test_lightgbm_models_use_round_type_and_serve_through_plan(tmp_path):
+    make_frame(1500).to_csv(tmp_path / "raw.csv", index=False)
+    stream_features(str(tmp_path / "raw.csv"), str(tmp_path / "features.csv"), progress=False)
+    df = add_valuation_targets(pd.read_csv(tmp_path / "features.csv"))
+    meta_path, valuation_path = str(tmp_path / "meta.joblib"), str(tmp_path / "valuation.joblib")
+    assert train_meta_model_with_crunchbase(df, meta_path, backend="lightgbm") == meta_path
+    assert train_valuation_model_with_crunchbase(df, valuation_path, backend="lightgbm") == valuation_path
+    meta_model, valuation_model = joblib.load(meta_path), joblib.load(valuation_path)
+
+    for model in (meta_model, valuation_model):
+        assert model.feature_names_in_[-1] == ROUND_TYPE_CODE_COLUMN
+        # Only categorical features list the values seen in training
+        feature_infos = model.booster_.dump_model()["feature_infos"]
+        assert feature_infos[ROUND_TYPE_CODE_COLUMN]["values"] and not feature_infos["num_rounds"]["values"]
+        assert model.get_params()["n_jobs"] == 1  # training used every core, serving uses one
+
+    meta_columns = api._model_columns(meta_model, META_FEATURE_COLUMNS)
+    valuation_columns = api._model_columns(valuation_model, VALUATION_FEATURE_COLUMNS)
+    assert meta_columns == META_FEATURE_COLUMNS + [ROUND_TYPE_CODE_COLUMN]
+    plan = InferencePlan(meta_model, valuation_model, meta_columns, valuation_columns, compile_trees=True)
+    assert plan.compiled == {"meta_model": False, "valuation_model": False}
+
+    X_meta, _ = meta_training_data(df, "lightgbm")
+    X_valuation, _ = valuation_training_data(df, "lightgbm")
+    rows = X_valuation.index[:20]
+    feature_dicts = df.loc[rows].assign(**{ROUND_TYPE_CODE_COLUMN: X_valuation.loc[rows, ROUND_TYPE_CODE_COLUMN]}) \
+        .to_dict("records")
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        mna = plan.predict_mna(plan.meta_matrix(feature_dicts))
+        valuation = plan.predict_valuation(plan.valuation_matrix(feature_dicts))
+    np.testing.assert_allclose(mna, meta_model.predict_proba(X_meta.loc[rows])[:, 1])
+    np.testing.assert_allclose(valuation, valuation_model.predict(X_valuation.loc[rows]))
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError):
+        train_meta_model_with_crunchbase(pd.DataFrame({"a": [1]}), "unused.joblib", backend="catboost")
+
+
+if __name__ == "__main__":
+    import tempfile
+    import pathlib
+    test_round_type_codes()
+    test_lightgbm_models_use_round_type_and_serve_through_plan(pathlib.Path(tempfile.mkdtemp()))
+    test_unknown_backend_is_rejected()
@@ -0,0 +1,98 @@
+import sys
+import os
+import gzip
+import json
+import time
+import threading
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from models.logging_agent import LoggingAgent
+
+
+def read_lines(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_entries_are_written_in_order(tmp_path):
+    agent = LoggingAgent(log_dir=str(tmp_path), flush_interval=0.05)
+    for i in range(500):
+        agent.log("prediction", {"index": i, "score": i / 7})
+    agent.log("", "not a dict")
+    assert agent.flush()
+
+    entries = read_lines(tmp_path / "app_logs.jsonl")
+    assert [entry["data"]["index"] for entry in entries[:500]] == list(range(500))
+    assert entries[-1]["type"] == "unknown"
+    assert entries[-1]["data"] == {"value": "not a dict"}
+    assert set(entries[0]) == {"type", "data", "timestamp"}
+    agent.close()
+
+
+def test_memory_is_a_bounded_ring_buffer(tmp_path):
+    agent = LoggingAgent(log_dir=str(tmp_path), max_memory_entries=10)
+    for i in range(100):
+        agent.log("input", {"index": i})
+    logs = agent.get_logs()
+    assert [entry["data"]["index"] for entry in logs] == list(range(90, 100))
+    agent.close()
+
+
+def test_size_rotation_compresses_and_prunes(tmp_path):
+    agent = LoggingAgent(log_dir=str(tmp_path), max_bytes=2000, backup_count=2, flush_batch=5, flush_interval=0.01)
+    for i in range(200):
+        agent.log("features", {"index": i, "padding": "x" * 50})
+        if i % 5 == 4:
+            agent.flush()
+    agent.close()
+
+    backups = sorted(name for name in os.listdir(tmp_path) if name.endswith(".gz"))
+    print(f"Rotations: {agent.rotations}, backups kept: {backups}")
+    assert agent.rotations > 2
+    assert len(backups) == 2
+    with gzip.open(tmp_path / backups[-1], "rt", encoding="utf-8") as f:
+        rotated = [json.loads(line) for line in f]
+    current = read_lines(tmp_path / "app_logs.jsonl")
+    assert os.path.getsize(tmp_path / "app_logs.jsonl") <= 2000
+    # The newest backup ends right where the active file begins
+    assert rotated[-1]["data"]["index"] + 1 == current[0]["data"]["index"]
+    assert current[-1]["data"]["index"] == 199
+
+
+def test_log_never_blocks_when_queue_is_full(tmp_path):
+    agent = LoggingAgent(log_dir=str(tmp_path), queue_size=10, flush_batch=1)
+    writing, release = threading.Event(), threading.Event()
+
+    def stalled_write(payload):
+        writing.set()
+        release.wait()
+
+    # Stall the writer on its first entry so the queue fills up
+    agent._write = stalled_write
+    try:
+        agent.log("input", {"index": -1})
+        assert writing.wait(5)
+
+        start = time.perf_counter()
+        for i in range(1000):
+            agent.log("input", {"index": i})
+        elapsed = time.perf_counter() - start
+        print(f"1000 log calls against a stalled writer: {elapsed * 1000:.1f} ms, dropped {agent.dropped}")
+        assert elapsed < 0.5
+        assert agent.dropped == 990
+        assert agent.get_logs()[-1]["data"]["index"] == 999
+    finally:
+        del agent._write
+        release.set()
+
+    agent.close()
+    assert len(read_lines(tmp_path / "app_logs.jsonl")) == 10
+
+
+if __name__ == "__main__":
+    import tempfile
+    import pathlib
+    for test in (test_entries_are_written_in_order, test_memory_is_a_bounded_ring_buffer,
+                 test_size_rotation_compresses_and_prunes, test_log_never_blocks_when_queue_is_full):
+        with tempfile.TemporaryDirectory() as tmp:
+            test(pathlib.Path(tmp))
@@ -0,0 +1,64 @@
+import sys
+import os
+import json
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from api.model_registry import MODEL_ARTIFACTS, META_STUDENT_ARTIFACTS, model_artifacts
+from models.inference_plan import InferencePlan
+from models.train_with_crunchbase import META_FEATURE_COLUMNS, VALUATION_FEATURE_COLUMNS, distill_meta_model, \
+    make_valuation_model, soft_label_data, train_meta_model_with_crunchbase, valuation_training_data
+from pipeline.build_features import stream_features
+from pipeline.process_datasets import add_valuation_targets
+from test_vectorized_agents import make_frame
+
+
+def test_soft_labels_weight_both_classes():
+    X = pd.DataFrame({"a": [1.0, 2.0, 3.0]})
+    X_soft, y, weights = soft_label_data(X, np.array([1.0, 0.25, 0.0]))
+    assert X_soft["a"].tolist() == [1.0, 2.0, 2.0, 3.0]
+    assert y.tolist() == [1, 1, 0, 0]
+    assert weights.tolist() == [1.0, 0.25, 0.75, 1.0]
+
+
+def test_student_tracks_teacher_and_serves_through_plan(tmp_path):
+    make_frame(2000).to_csv(tmp_path / "raw.csv", index=False)
+    stream_features(str(tmp_path / "raw.csv"), str(tmp_path / "features.csv"), progress=False)
+    df = pd.read_csv(tmp_path / "features.csv")
+    teacher_path, student_path = str(tmp_path / "meta.joblib"), str(tmp_path / "meta.student.joblib")
+    train_meta_model_with_crunchbase(df, teacher_path)
+
+    report = distill_meta_model(df, teacher_path, student_path)
+    with open(tmp_path / "meta.student.json") as f:
+        assert json.load(f) == json.loads(json.dumps(report))
+    assert report["proba_mae"] < 0.1
+    assert report["rank_correlation"] > 0.4  # the synthetic teacher is near 0 or 1 almost everywhere
+    assert report["label_agreement"] > 0.9
+    assert report["student_nodes"] < report["teacher_nodes"] / 5
+
+    # The student is scored by the compiled tree engine like the full model
+    student = joblib.load(student_path)
+    X, y = valuation_training_data(add_valuation_targets(df))
+    plan = InferencePlan(student, make_valuation_model().fit(X, y), META_FEATURE_COLUMNS,
+                         VALUATION_FEATURE_COLUMNS, compile_trees=True)
+    assert plan.compiled["meta_model"]
+    rows = df[META_FEATURE_COLUMNS].head(20).to_numpy(dtype=np.float64)
+    np.testing.assert_array_equal(plan.predict_mna(rows), student.predict_proba(rows)[:, 1])
+
+
+def test_student_variant_is_preferred_with_fallback():
+    assert model_artifacts() == MODEL_ARTIFACTS
+    artifacts = model_artifacts("student")
+    assert artifacts["meta_model"] == META_STUDENT_ARTIFACTS + MODEL_ARTIFACTS["meta_model"]
+    assert artifacts["valuation_model"] == MODEL_ARTIFACTS["valuation_model"]
+
+
+if __name__ == "__main__":
+    import tempfile
+    import pathlib
+    test_soft_labels_weight_both_classes()
+    test_student_tracks_teacher_and_serves_through_plan(pathlib.Path(tempfile.mkdtemp()))
+    test_student_variant_is_preferred_with_fallback()
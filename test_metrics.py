@@ -0,0 +1,66 @@
+import sys
+import os
+import re
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from fastapi.testclient import TestClient
+
+from src.api import app as api
+from api.metrics import Histogram, render_metric
+
+client = TestClient(api.app)
+
+SAMPLE_LINE = re.compile(r'^[a-zA-Z_:][a-zA-Z0-9_:]*(\{[a-zA-Z_]+="[^"]*"(,[a-zA-Z_]+="[^"]*")*\})? [-+0-9.eInf]+$')
+
+PIPELINE_STAGES = [
+    "funding", "team", "synergy", "valuation", "business_model",
+    "meta_matrix", "predict_proba", "valuation_matrix", "predict",
+    "benchmark", "risk", "decision", "reasoning", "queue_wait"
+]
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram("test_seconds", "Test latency", "stage", buckets=(0.01, 0.1, 1.0))
+    for seconds in (0.005, 0.01, 0.05, 0.5, 2.0):
+        histogram.observe("a", seconds)
+    lines = histogram.render()
+
+    assert 'test_seconds_bucket{stage="a",le="0.01"} 2' in lines
+    assert 'test_seconds_bucket{stage="a",le="0.1"} 3' in lines
+    assert 'test_seconds_bucket{stage="a",le="1.0"} 4' in lines
+    assert 'test_seconds_bucket{stage="a",le="+Inf"} 5' in lines
+    assert 'test_seconds_count{stage="a"} 5' in lines
+    assert render_metric("x_total", "counter", "X", [({"k": 'a"b'}, 3)])[-1] == 'x_total{k="a\\"b"} 3'
+
+
+def test_metrics_endpoint_reports_every_stage():
+    assert api.model_registry.wait(60)
+    payload = {
+        "funding_json": {"rounds": [{"type": "Seed", "amount": 123457}]},
+        "team_json": {"founders": [{"experience_years": 4, "has_exit": False}]},
+        "acquirer_json": {"industry": "tech", "market": "saas", "tech_stack": ["go"], "team_size": 80},
+        "target_json": {"industry": "tech", "market": "saas", "tech_stack": ["go"], "team_size": 8},
+        "financials_json": {"monthly_revenue_usd": 1234, "revenue_growth_mom": 3.0, "gross_margin": 0.5}
+    }
+    assert client.post("/predict", json=payload).status_code == 200
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+
+    text = response.text
+    for stage in PIPELINE_STAGES:
+        assert f'smart_acquirer_stage_seconds_count{{stage="{stage}"}}' in text, stage
+    assert 'smart_acquirer_request_seconds_count{endpoint="/predict"}' in text
+    assert "smart_acquirer_cache_misses_total" in text
+    assert "smart_acquirer_inference_rejected_total" in text
+    assert 'smart_acquirer_model_load_seconds{item="meta_model"}' in text
+    assert "smart_acquirer_models_ready 1" in text
+
+    for line in text.splitlines():
+        assert line.startswith("# ") or SAMPLE_LINE.match(line), line
+
+
+if __name__ == "__main__":
+    test_histogram_buckets_are_cumulative()
+    test_metrics_endpoint_reports_every_stage()
@@ -0,0 +1,99 @@
+import sys
+import os
+import asyncio
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+import pytest
+
+from src.api import app as api
+from api.inference_pool import InferencePool, InferencePoolFull
+from api.micro_batcher import MicroBatcher
+
+# Test data
+test_data = {
+    "funding_json": {"rounds": [{"type": "Seed", "amount": "500000"}]},
+    "team_json": {"founders": [{"experience_years": 5, "has_exit": True}]},
+    "acquirer_json": {"industry": "tech", "market": "saas", "tech_stack": ["python"], "team_size": 500},
+    "target_json": {"industry": "tech", "market": "saas", "tech_stack": ["python"], "team_size": 50},
+    "financials_json": {"monthly_revenue_usd": 100000, "revenue_growth_mom": 15.0, "gross_margin": 0.8}
+}
+
+
+async def _direct_runner(func, *args):
+    return func(*args)
+
+
+def test_batches_by_size_and_scatters_results():
+    batch_sizes = []
+
+    def process(items):
+        batch_sizes.append(len(items))
+        return [ValueError(f"bad {item}") if item == 3 else item * 10 for item in items]
+
+    async def main():
+        batcher = MicroBatcher(process, _direct_runner, max_items=4, max_wait_ms=50)
+        return await asyncio.gather(*(batcher.submit(i) for i in range(10)), return_exceptions=True), batcher
+
+    outcomes, batcher = asyncio.run(main())
+    print(f"Batch sizes: {batch_sizes}")
+    assert batch_sizes == [4, 4, 2]
+    assert [o for i, o in enumerate(outcomes) if i != 3] == [i * 10 for i in range(10) if i != 3]
+    assert isinstance(outcomes[3], ValueError)
+    assert batcher.stats()["batches"] == 3 and batcher.pending == 0
+
+
+def test_partial_batch_flushes_after_wait():
+    async def main():
+        batcher = MicroBatcher(lambda items: items, _direct_runner, max_items=100, max_wait_ms=5)
+        return await asyncio.wait_for(batcher.submit("only"), timeout=2)
+
+    assert asyncio.run(main()) == "only"
+
+
+def test_rejects_when_pending_limit_reached():
+    async def main():
+        batcher = MicroBatcher(lambda items: items, _direct_runner, max_items=10, max_wait_ms=20, max_pending=2)
+        return await asyncio.gather(*(batcher.submit(i) for i in range(3)), return_exceptions=True)
+
+    outcomes = asyncio.run(main())
+    assert outcomes[:2] == [0, 1]
+    assert isinstance(outcomes[2], InferencePoolFull)
+
+
+def test_micro_batched_predictions_match_single_path():
+    assert api.model_registry.wait(60) and api._models_ready()
+    startups = []
+    for growth in (5.0, 15.0, 40.0):
+        payload = dict(test_data, financials_json=dict(test_data["financials_json"], revenue_growth_mom=growth))
+        startups.append(api.StartupInput(**payload))
+    expected = [api._predict_one(startup) for startup in startups]
+
+    async def main():
+        pool = InferencePool(max_workers=2, max_in_flight=4)
+        batcher = MicroBatcher(api._score_micro_batch, pool.run, max_items=8, max_wait_ms=20)
+        try:
+            return await asyncio.gather(*(batcher.submit(startup) for startup in startups)), batcher
+        finally:
+            pool.shutdown()
+
+    actual, batcher = asyncio.run(main())
+    assert batcher.stats()["batches"] == 1
+    for single, batched in zip(expected, actual):
+        assert batched["mna_likelihood"] == single["mna_likelihood"]
+        assert batched["valuation_forecast_usd"] == single["valuation_forecast_usd"]
+
+
+def test_micro_batched_item_errors_stay_separate():
+    bad = dict(test_data, team_json={"founders": [{"experience_years": "many"}]})
+    outcomes = api._score_micro_batch([api.StartupInput(**test_data), api.StartupInput(**bad)])
+    assert "mna_likelihood" in outcomes[0]
+    with pytest.raises(api.ItemScoringError):
+        raise outcomes[1]
+
+
+if __name__ == "__main__":
+    test_batches_by_size_and_scatters_results()
+    test_partial_batch_flushes_after_wait()
+    test_rejects_when_pending_limit_reached()
+    test_micro_batched_predictions_match_single_path()
+    test_micro_batched_item_errors_stay_separate()
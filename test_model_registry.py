@@ -0,0 +1,80 @@
+import sys
+import os
+import time
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+import joblib
+import numpy as np
+from fastapi.testclient import TestClient
+
+from src.api import app as api
+from api.model_registry import ModelRegistry
+
+client = TestClient(api.app)
+
+
+def test_registry_loads_in_parallel_and_reports_status(tmp_path):
+    fallback = tmp_path / "fallback.joblib"
+    joblib.dump({"weights": np.arange(10.0)}, fallback)
+
+    registry = ModelRegistry({"model": [str(tmp_path / "missing.joblib"), str(fallback)]}, mmap_mode="r")
+    registry.add_loader("slow_a", lambda: time.sleep(0.3) or "a")
+    registry.add_loader("slow_b", lambda: time.sleep(0.3) or "b")
+    registry.add_loader("broken", lambda: 1 / 0)
+    seen = []
+    registry.on_ready(lambda r: seen.append(r.get("slow_a")))
+
+    start = time.perf_counter()
+    registry.start()
+    assert registry.wait(5)
+    elapsed = time.perf_counter() - start
+
+    print(f"Registry ready in {elapsed:.2f}s: {registry.status()}")
+    assert elapsed < 0.55
+    assert seen == ["a"]
+    assert registry.get("slow_b") == "b"
+    assert registry.get("broken") is None
+    np.testing.assert_array_equal(registry.get("model")["weights"], np.arange(10.0))
+    assert isinstance(registry.get("model")["weights"], np.memmap)
+
+    status = registry.status()
+    assert status["ready"] and not status["loading"]
+    assert status["items"]["model"]["path"] == str(fallback)
+    assert "division by zero" in status["items"]["broken"]["error"]
+
+
+def test_readiness_is_separate_from_liveness():
+    assert client.get("/health").status_code == 200
+    assert api.model_registry.wait(60)
+
+    ready = client.get("/ready")
+    assert ready.status_code == 200
+    assert ready.json()["model_registry"]["items"]["meta_model"]["error"] is None
+
+
+def test_not_ready_while_loading():
+    registry = ModelRegistry()
+    registry.add_loader("slow", lambda: time.sleep(0.5))
+    original = api.model_registry
+    api.model_registry = registry
+    try:
+        registry.start()
+        response = client.get("/ready")
+        health = client.get("/health")
+    finally:
+        api.model_registry = original
+        registry.wait()
+
+    assert response.status_code == 503
+    assert response.json()["status"] == "loading"
+    assert health.status_code == 200
+    assert health.json()["ready"] is False
+
+
+if __name__ == "__main__":
+    import tempfile
+    import pathlib
+    with tempfile.TemporaryDirectory() as tmp:
+        test_registry_loads_in_parallel_and_reports_status(pathlib.Path(tmp))
+    test_readiness_is_separate_from_liveness()
+    test_not_ready_while_loading()
@@ -0,0 +1,128 @@
+import sys
+import os
+import threading
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+import pandas as pd
+import pytest
+
+import train_models
+from pipeline.build_features import stream_features
+from pipeline.orchestrator import Stage, run_stages
+from test_vectorized_agents import make_frame
+
+# Training stages that read the Crunchbase datasets
+DATASET_STAGES = ("scenarios", "company_snapshot")
+
+
+def make_stages(tmp_path, calls, fail=(), parallel=True):
+    """a -> (b, c) -> d; with ``parallel`` b and c must run at the same time to get past a barrier."""
+    barrier = threading.Barrier(2, timeout=10)
+
+    def step(name, wait=False):
+        def run(results):
+            calls.append(name)
+            if wait and parallel:
+                barrier.wait()
+            if name in fail:
+                raise ValueError(f"{name} broke")
+            (tmp_path / f"{name}.out").write_text(name + "".join(sorted(map(str, results.values()))))
+            return name
+        return run
+
+    if not (tmp_path / "source.txt").exists():
+        (tmp_path / "source.txt").write_text("v1")
+    return [
+        Stage("d", step("d"), deps=["b", "c"], outputs=[str(tmp_path / "d.out")]),
+        Stage("a", step("a"), inputs=[str(tmp_path / "source.txt")], outputs=[str(tmp_path / "a.out")],
+              load=lambda: "a (loaded)"),
+        Stage("b", step("b", wait=True), deps=["a"], outputs=[str(tmp_path / "b.out")]),
+        Stage("c", step("c", wait=True), deps=["a"], outputs=[str(tmp_path / "c.out")])
+    ]
+
+
+def statuses(report):
+    return {entry["stage"]: entry["status"] for entry in report}
+
+
+def test_independent_stages_run_in_parallel_and_resume(tmp_path):
+    state = str(tmp_path / "state.json")
+    calls = []
+    report = run_stages(make_stages(tmp_path, calls), state)
+    assert statuses(report) == {"d": "ran", "a": "ran", "b": "ran", "c": "ran"}
+    assert calls[0] == "a" and calls[-1] == "d"
+    assert (tmp_path / "d.out").read_text() == "dbc"
+    assert all(entry["seconds"] is not None for entry in report)
+
+    calls.clear()
+    assert set(statuses(run_stages(make_stages(tmp_path, calls), state)).values()) == {"cached"}
+    assert calls == []
+
+    # A changed input reruns everything below it; a missing output only its stage
+    (tmp_path / "source.txt").write_text("v2")
+    assert set(statuses(run_stages(make_stages(tmp_path, calls), state)).values()) == {"ran"}
+    (tmp_path / "d.out").unlink()
+    report = run_stages(make_stages(tmp_path, calls), state)
+    assert statuses(report) == {"d": "ran", "a": "cached", "b": "cached", "c": "cached"}
+
+
+def test_failed_stage_blocks_dependents_and_resumes(tmp_path):
+    state = str(tmp_path / "state.json")
+    calls = []
+    report = run_stages(make_stages(tmp_path, calls, fail=("c",), parallel=False), state)
+    assert statuses(report) == {"d": "blocked", "a": "ran", "b": "ran", "c": "failed"}
+    assert "c broke" in report[3]["error"]
+
+    # a and b completed last time; c resumes with a's result loaded from its outputs
+    calls.clear()
+    report = run_stages(make_stages(tmp_path, calls, parallel=False), state, workers=1)
+    assert statuses(report) == {"d": "ran", "a": "cached", "b": "cached", "c": "ran"}
+    assert calls == ["c", "d"]
+    assert (tmp_path / "c.out").read_text() == "ca (loaded)"
+
+
+def test_config_change_reruns_stage(tmp_path):
+    state = str(tmp_path / "state.json")
+    output = tmp_path / "out.txt"
+
+    def stages(config):
+        return [Stage("a", lambda results: output.write_text("a"), outputs=[str(output)], config=config),
+                Stage("b", lambda results: None, deps=["a"])]
+
+    assert set(statuses(run_stages(stages({"backend": "default"}), state)).values()) == {"ran"}
+    assert set(statuses(run_stages(stages({"backend": "default"}), state)).values()) == {"cached"}
+    assert set(statuses(run_stages(stages({"backend": "lightgbm"}), state)).values()) == {"ran"}
+
+
+def test_invalid_graphs_are_rejected(tmp_path):
+    with pytest.raises(ValueError, match="unknown"):
+        run_stages([Stage("a", lambda results: None, deps=["x"])], str(tmp_path / "state.json"))
+    with pytest.raises(ValueError, match="cycle"):
+        run_stages([Stage("a", lambda results: None, deps=["b"]), Stage("b", lambda results: None, deps=["a"])],
+                   str(tmp_path / "state.json"))
+
+
+def test_training_pipeline(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    for directory in ("data/raw", "data/processed", "models"):
+        os.makedirs(directory)
+    make_frame(600).to_csv(train_models.RAW_SCENARIOS, index=False)
+    # The Crunchbase datasets are not available here, so start from the scenarios
+    stages = [stage for stage in train_models.training_stages() if stage.name not in DATASET_STAGES]
+    stages[0].deps = []
+    stages[0].run = lambda results: (stream_features(train_models.RAW_SCENARIOS, train_models.FEATURES,
+                                                     progress=False), pd.read_csv(train_models.FEATURES))[1]
+
+    report = run_stages(stages, "state.json")
+    assert set(statuses(report).values()) == {"ran"}, report
+    for path in stages[-1].outputs + [train_models.META_MODEL, train_models.VALUATION_MODEL]:
+        assert os.path.exists(path)
+    assert "valuation_12m_forward" not in pd.read_csv(train_models.FEATURES).columns
+    assert set(statuses(run_stages(stages, "state.json")).values()) == {"cached"}
+
+
+if __name__ == "__main__":
+    import tempfile
+    import pathlib
+    test_independent_stages_run_in_parallel_and_resume(pathlib.Path(tempfile.mkdtemp()))
+    test_failed_stage_blocks_dependents_and_resumes(pathlib.Path(tempfile.mkdtemp()))
@@ -0,0 +1,115 @@
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+
+import train_models
+from models.inference_plan import InferencePlan
+from models.quantile_sketch import QuantileSketch
+from models.train_out_of_core import meta_thresholds, train_meta_model_out_of_core, \
+    train_valuation_model_out_of_core, valuation_cut
+from models.train_with_crunchbase import META_FEATURE_COLUMNS, VALUATION_FEATURE_COLUMNS
+from pipeline.build_features import stream_features
+from pipeline.feature_store import FEATURE_STORE_PATH
+from pipeline.orchestrator import run_stages
+from pipeline.process_datasets import add_valuation_targets
+from test_orchestrator import DATASET_STAGES
+from test_vectorized_agents import make_frame
+
+
+def test_sketch_quantiles_within_rank_error():
+    values = np.random.default_rng(0).lognormal(10, 2, 1_000_000)
+    sketch = QuantileSketch(k=1024)
+    for chunk in np.array_split(values, 37):
+        sketch.update(np.r_[chunk, np.nan, np.inf])
+    assert sketch.count == len(values)
+    assert sketch.size < 5000
+    ordered = np.sort(values)
+    for q in (0.01, 0.3, 0.5, 0.7, 0.99):
+        rank = np.searchsorted(ordered, sketch.quantile(q)) / len(values)
+        assert abs(rank - q) < 0.005, q
+    assert sketch.quantile(0) == values.min() and sketch.quantile(1) == values.max()
+    assert np.isnan(QuantileSketch().quantile(0.5))
+
+
+def make_feature_files(tmp_path, rows=1500):
+    make_frame(rows).to_csv(tmp_path / "raw.csv", index=False)
+    features_path, targets_path = tmp_path / "features.csv", tmp_path / "targets.csv"
+    stream_features(str(tmp_path / "raw.csv"), str(features_path), progress=False)
+    add_valuation_targets(pd.read_csv(features_path)).to_csv(targets_path, index=False)
+    return str(features_path), str(targets_path)
+
+
+def test_models_train_in_chunks_and_serve(tmp_path):
+    features_path, targets_path = make_feature_files(tmp_path)
+    features, targets = pd.read_csv(features_path), pd.read_csv(targets_path)
+
+    # Below k values the sketch keeps every value, so its quantiles are exact
+    thresholds = meta_thresholds(features_path, chunk_size=100, progress=False)
+    for column, threshold in thresholds.items():
+        assert threshold == np.quantile(features[column].dropna(), 0.7, method="inverted_cdf")
+    valid = targets.loc[targets[VALUATION_FEATURE_COLUMNS].notnull().all(axis=1), "valuation_12m_forward"]
+    assert valuation_cut(targets_path, chunk_size=100, progress=False) == \
+        np.quantile(valid, 0.99, method="inverted_cdf")
+
+    meta_path, valuation_path = str(tmp_path / "meta.joblib"), str(tmp_path / "valuation.joblib")
+    assert train_meta_model_out_of_core(features_path, meta_path, chunk_size=100, progress=False) == meta_path
+    assert train_valuation_model_out_of_core(targets_path, valuation_path, chunk_size=100,
+                                             cache_dir=str(tmp_path / "cache"), progress=False) == valuation_path
+    assert os.listdir(tmp_path / "cache") == []
+
+    meta_model, valuation_model = joblib.load(meta_path), joblib.load(valuation_path)
+    plan = InferencePlan(meta_model, valuation_model, META_FEATURE_COLUMNS, VALUATION_FEATURE_COLUMNS,
+                         compile_trees=True)
+    assert plan.compiled == {"meta_model": False, "valuation_model": True}
+    rows = targets[VALUATION_FEATURE_COLUMNS].head(20).to_dict("records")
+    np.testing.assert_allclose(plan.predict_mna(plan.meta_matrix(rows)),
+                               meta_model.predict_proba(targets[META_FEATURE_COLUMNS].head(20))[:, 1], rtol=1e-6)
+    np.testing.assert_allclose(plan.predict_valuation(plan.valuation_matrix(rows)),
+                               valuation_model.predict(targets[VALUATION_FEATURE_COLUMNS].head(20)), rtol=1e-6)
+
+
+def test_out_of_core_pipeline(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    for directory in ("data/raw", "data/processed", "models"):
+        os.makedirs(directory)
+    make_frame(600).to_csv(train_models.RAW_SCENARIOS, index=False)
+    open(train_models.META_STUDENT, "w").close()
+    # The Crunchbase datasets are not available here, so start from the scenarios
+    stages = [stage for stage in train_models.training_stages(out_of_core=True, chunk_size=100)
+              if stage.name not in DATASET_STAGES]
+    stages[0].deps = []
+
+    report = run_stages(stages, "state.json")
+    assert {entry["stage"]: entry["status"] for entry in report} == {
+        "features": "ran", "targets": "ran", "meta_model": "ran", "valuation_model": "ran", "compile_trees": "ran"}
+    assert os.path.exists(train_models.META_MODEL) and os.path.exists(train_models.VALUATION_MODEL)
+    assert not os.path.exists(train_models.META_STUDENT)
+    # The features were streamed, not kept in the feature store
+    assert not os.path.exists(FEATURE_STORE_PATH)
+
+
+def test_out_of_core_stages_fail_without_rows(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    for directory in ("data/processed", "models"):
+        os.makedirs(directory)
+    # Only rows that the cleaning drops
+    rows = pd.DataFrame(np.nan, index=range(10), columns=['valuation_12m_forward'] + list(
+        dict.fromkeys(META_FEATURE_COLUMNS + VALUATION_FEATURE_COLUMNS)))
+    rows.insert(0, 'startup_id', range(10))
+    for path in (train_models.FEATURES, train_models.FEATURES_WITH_TARGETS):
+        rows.to_csv(path, index=False)
+    for train in (train_models.train_meta_out_of_core, train_models.train_valuation_out_of_core):
+        with pytest.raises(RuntimeError):
+            train({})
+
+
+if __name__ == "__main__":
+    import tempfile
+    import pathlib
+    test_sketch_quantiles_within_rank_error()
+    test_models_train_in_chunks_and_serve(pathlib.Path(tempfile.mkdtemp()))
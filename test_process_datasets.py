@@ -0,0 +1,72 @@
+import sys
+import os
+import json
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+import numpy as np
+import pandas as pd
+
+from pipeline.process_datasets import build_crunchbase_scenarios
+
+
+def make_tables(companies=300, seed=0):
+    rng = np.random.default_rng(seed)
+    founded = pd.Series(pd.date_range("1995-01-01", periods=companies, freq="37D").strftime("%Y-%m-%d"))
+    founded[rng.random(companies) < 0.2] = np.nan
+    founded[5] = "not a date"
+    objects_df = pd.DataFrame({
+        "id": [f"c:{i}" for i in range(companies)],
+        "entity_type": "Company",
+        "category_code": rng.choice(["web", "software", "biotech"], companies),
+        "founded_at": founded
+    })
+    funded = rng.random(companies) < 0.9
+    funding_rounds_df = pd.DataFrame({
+        "object_id": objects_df["id"][funded].to_numpy(),
+        "funding_round_type": "seed",
+        "raised_amount_usd": rng.uniform(0, 5e7, funded.sum()),
+        "funded_at": "2012-01-01"
+    })
+    return objects_df, funding_rounds_df
+
+
+def test_scenarios_are_reproducible():
+    objects_df, funding_rounds_df = make_tables()
+    first = build_crunchbase_scenarios(objects_df, funding_rounds_df)
+    assert first.equals(build_crunchbase_scenarios(objects_df, funding_rounds_df))
+    other = build_crunchbase_scenarios(objects_df, funding_rounds_df, seed=7)
+    assert not first["team_json"].equals(other["team_json"])
+    assert first["funding_json"].equals(other["funding_json"])
+
+
+def test_synthetic_fields_follow_company_data():
+    objects_df, funding_rounds_df = make_tables()
+    scenarios = build_crunchbase_scenarios(objects_df, funding_rounds_df)
+    companies = objects_df.set_index("id")
+    funding = funding_rounds_df.groupby("object_id")["raised_amount_usd"].sum()
+
+    for startup_id, team_text, financials_text in zip(scenarios["startup_id"], scenarios["team_json"],
+                                                      scenarios["financials_json"]):
+        target_id = objects_df["id"][(startup_id + 1) % len(objects_df)]
+        team, financials = json.loads(team_text), json.loads(financials_text)
+        # The per-row rules of the original generator
+        try:
+            year = pd.to_datetime(companies.loc[target_id, "founded_at"]).year
+        except (ValueError, TypeError):
+            year = None
+        if pd.isna(year):
+            year = None
+        assert 1 <= len(team["founders"]) <= 3
+        assert [founder["experience_years"] for founder in team["founders"]] == [
+            max(1, 2023 - year - i * 2) if year else 0 for i in range(len(team["founders"]))
+        ]
+        assert team["estimated_team_size"] == max(1, int(funding[target_id] / 1000000))
+        assert financials["annual_revenue_usd"] == funding[target_id] * 0.1
+        assert 5.0 <= financials["revenue_growth_mom"] <= 25.0
+        assert 0.6 <= financials["gross_margin"] <= 0.9
+        assert 0.1 <= financials["ebitda_margin"] <= 0.3
+
+
+if __name__ == "__main__":
+    test_scenarios_are_reproducible()
+    test_synthetic_fields_follow_company_data()
@@ -0,0 +1,91 @@
+import sys
+import os
+import copy
+import time
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from fastapi.testclient import TestClient
+
+from src.api import app as api
+from api.result_cache import ResultCache, canonical_scenario, scenario_key
+
+client = TestClient(api.app)
+
+# Test data
+test_data = {
+    "funding_json": {"rounds": [{"type": "Seed", "amount": "500000"}, {"type": "Series A", "amount": 2000000}]},
+    "team_json": {"founders": [{"experience_years": 5, "has_exit": True}]},
+    "acquirer_json": {"industry": "tech", "market": "saas", "tech_stack": ["python"], "team_size": 500},
+    "target_json": {"industry": "tech", "market": "saas", "tech_stack": ["python"], "team_size": 50},
+    "financials_json": {"monthly_revenue_usd": 100000, "revenue_growth_mom": 15.0, "gross_margin": 0.8}
+}
+
+
+def equivalent_payload():
+    """Same scenario with reordered keys and differently written amounts."""
+    payload = copy.deepcopy(test_data)
+    payload["funding_json"]["rounds"] = [
+        {"amount": "$500,000", "type": "Seed"},
+        {"type": "Series A", "amount": "2000000"}
+    ]
+    payload["financials_json"] = dict(reversed(list(payload["financials_json"].items())))
+    return dict(reversed(list(payload.items())))
+
+
+def test_canonical_scenario_normalizes_order_and_amounts():
+    assert canonical_scenario(test_data) == canonical_scenario(equivalent_payload())
+    assert scenario_key(test_data, "model-a") == scenario_key(equivalent_payload(), "model-a")
+    assert scenario_key(test_data, "model-a") != scenario_key(test_data, "model-b")
+
+    changed = copy.deepcopy(test_data)
+    changed["target_json"]["team_size"] = 50.5
+    assert canonical_scenario(changed) != canonical_scenario(test_data)
+
+
+def test_lru_ttl_and_invalidation():
+    cache = ResultCache(max_entries=2, ttl_seconds=None)
+    cache.reset("v1")
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)  # evicts "b", the least recently used
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+    cache.reset("v1")
+    assert cache.get("a") == 1
+    cache.reset("v2")
+    assert cache.get("a") is None
+    assert cache.stats()["invalidations"] == 1
+
+    expiring = ResultCache(max_entries=10, ttl_seconds=0.01)
+    expiring.put("a", 1)
+    time.sleep(0.02)
+    assert expiring.get("a") is None
+    assert expiring.stats()["expirations"] == 1
+
+
+def test_repeated_scenario_is_served_from_cache():
+    assert api.model_registry.wait(60)
+    assert api.result_cache.enabled
+    api.result_cache.reset(None)
+    api.result_cache.reset(api.model_registry.fingerprint(["meta_model", "valuation_model"]))
+
+    uncached = api._predict_one(api.StartupInput(**test_data))
+    first = client.post("/predict", json=test_data)
+    hits_before = api.result_cache.hits
+    second = client.post("/predict", json=equivalent_payload())
+
+    print(f"Cache stats: {api.result_cache.stats()}")
+    assert first.status_code == second.status_code == 200
+    assert api.result_cache.hits == hits_before + 1
+    assert second.json() == first.json()
+    assert first.json()["mna_likelihood"] == uncached["mna_likelihood"]
+    assert first.json()["valuation_forecast_usd"] == uncached["valuation_forecast_usd"]
+
+
+if __name__ == "__main__":
+    test_canonical_scenario_normalizes_order_and_amounts()
+    test_lru_ttl_and_invalidation()
+    test_repeated_scenario_is_served_from_cache()
@@ -0,0 +1,121 @@
+import sys
+import os
+import json
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+import numpy as np
+import pandas as pd
+
+from pipeline.build_features import build_features, cast_features, compute_feature_frame, feature_agents, shard_of, \
+    stream_features
+from pipeline import process_datasets
+from test_vectorized_agents import make_frame
+
+
+def test_streamed_csv_matches_single_pass(tmp_path):
+    raw = make_frame(500)
+    raw_path = tmp_path / "startups.csv"
+    raw.to_csv(raw_path, index=False)
+
+    expected = cast_features(compute_feature_frame(pd.read_csv(raw_path), *feature_agents())).to_csv(index=False)
+    stats = stream_features(str(raw_path), str(tmp_path / "features.csv"), chunk_size=37, progress=False)
+
+    assert (tmp_path / "features.csv").read_text() == expected
+    assert stats["rows_read"] == 500
+    assert stats["rows_written"] == len(pd.read_csv(tmp_path / "features.csv")) < 500
+    assert not (tmp_path / "features.csv.tmp").exists()
+
+
+def test_build_features_skips_rejected_rows(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    os.makedirs("data/raw")
+    os.makedirs("data/processed")
+    raw = make_frame(50)
+    raw.to_csv("data/raw/startups.csv", index=False)
+
+    stats = build_features(chunk_size=20, workers=1)
+    # make_frame plants rows 3-7 that the agents reject
+    assert stats["rows_read"] == 50 and stats["rows_written"] == 45
+    assert "Skipped 5 rows with invalid data" in capsys.readouterr().out
+    written = pd.read_csv("data/processed/features.csv")["startup_id"].tolist()
+    assert written == [startup_id for startup_id in raw["startup_id"] if startup_id not in raw["startup_id"][3:8].tolist()]
+
+
+def test_parallel_run_is_byte_identical_to_serial(tmp_path):
+    raw = make_frame(600)
+    raw_path = tmp_path / "startups.csv"
+    raw.to_csv(raw_path, index=False)
+
+    stream_features(str(raw_path), str(tmp_path / "serial.csv"), chunk_size=100, progress=False)
+    stats = stream_features(str(raw_path), str(tmp_path / "parallel.csv"), chunk_size=100, progress=False, workers=3)
+    assert (tmp_path / "parallel.csv").read_bytes() == (tmp_path / "serial.csv").read_bytes()
+    assert stats["rows_read"] == 600
+
+    # Non-integer ids shard by a stable hash of their text
+    raw["startup_id"] = [f"s-{i}" for i in range(len(raw))]
+    raw.to_csv(raw_path, index=False)
+    stream_features(str(raw_path), str(tmp_path / "serial.csv"), chunk_size=128, progress=False)
+    stream_features(str(raw_path), str(tmp_path / "parallel.csv"), chunk_size=128, progress=False, workers=2)
+    assert (tmp_path / "parallel.csv").read_bytes() == (tmp_path / "serial.csv").read_bytes()
+
+
+def test_sharding_is_deterministic():
+    assert shard_of(np.array([0, 1, 2, 7]), 3).tolist() == [0, 1, 2, 1]
+    # CRC32 of the id text, the same in every process and run
+    assert shard_of(np.array(["a", "b", "c"], dtype=object), 4).tolist() == [3, 1, 3]
+
+
+def test_streamed_parquet_matches_single_pass(tmp_path):
+    raw = make_frame(300)
+    raw_path = tmp_path / "startups.csv"
+    raw.to_csv(raw_path, index=False)
+
+    stream_features(str(raw_path), str(tmp_path / "features.parquet"), chunk_size=64, progress=False)
+    expected = cast_features(compute_feature_frame(pd.read_csv(raw_path), *feature_agents()))
+    pd.testing.assert_frame_equal(pd.read_parquet(tmp_path / "features.parquet"), expected)
+
+
+def test_output_does_not_depend_on_chunk_size(tmp_path):
+    raw = make_frame(200)
+    # The first chunks have no founders and whole team sizes, a later one a fractional size
+    raw.loc[:49, "team_json"] = json.dumps({"founders": [], "estimated_team_size": 4})
+    raw.loc[150, "team_json"] = json.dumps({"founders": [], "estimated_team_size": 4.5})
+    raw_path = tmp_path / "startups.csv"
+    raw.to_csv(raw_path, index=False)
+
+    for suffix in ("csv", "parquet"):
+        small, large = tmp_path / f"small.{suffix}", tmp_path / f"large.{suffix}"
+        stream_features(str(raw_path), str(small), chunk_size=10, progress=False)
+        stream_features(str(raw_path), str(large), chunk_size=100, progress=False)
+        if suffix == "csv":
+            assert small.read_bytes() == large.read_bytes()
+        else:
+            pd.testing.assert_frame_equal(pd.read_parquet(small), pd.read_parquet(large))
+            assert pd.read_parquet(small)["estimated_team_size"].iloc[-50:].tolist().count(4.5) == 1
+
+
+def test_streamed_targets_match_single_pass(tmp_path, monkeypatch):
+    raw = make_frame(400)
+    raw_path = tmp_path / "startups.csv"
+    raw.to_csv(raw_path, index=False)
+    features_path = tmp_path / "features.csv"
+    stream_features(str(raw_path), str(features_path), progress=False)
+
+    monkeypatch.chdir(tmp_path)
+    os.makedirs("data/processed")
+    output = "data/processed/crunchbase_features_with_targets.csv"
+
+    np.random.seed(3)
+    process_datasets.enhance_training_data_with_targets(pd.read_csv(features_path))
+    whole = open(output).read()
+
+    np.random.seed(3)
+    process_datasets.enhance_training_data_with_targets(str(features_path), chunk_size=50)
+    assert open(output).read() == whole
+
+
+if __name__ == "__main__":
+    import tempfile
+    import pathlib
+    test_streamed_csv_matches_single_pass(pathlib.Path(tempfile.mkdtemp()))
+    test_streamed_parquet_matches_single_pass(pathlib.Path(tempfile.mkdtemp()))
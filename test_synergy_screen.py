@@ -0,0 +1,143 @@
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+import numpy as np
+import pandas as pd
+from fastapi.testclient import TestClient
+
+from src.api import app as api
+from models.synergy_agent import SynergyAgent
+from models.synergy_screen import SynergyScreen, SYNERGY_COLUMNS
+from models.team_agent import COMPANY_COLUMNS, TeamAgent
+
+client = TestClient(api.app)
+
+ACQUIRER = {"industry": "software", "market": "saas", "tech_stack": ["python", "react", "go"], "team_size": 120}
+
+
+def make_universe(size=3000, seed=0):
+    rng = np.random.default_rng(seed)
+    categories = np.array(["software", "saas", "enterprise software", "biotech", "", None], dtype=object)
+    tokens = ["python", "react", "go", "java", "rust", "kotlin", "swift"]
+    targets = []
+    for i in range(size):
+        targets.append({
+            "industry": categories[rng.integers(len(categories))],
+            "market": categories[rng.integers(len(categories))],
+            "tech_stack": list(rng.choice(tokens, rng.integers(0, 4))),
+            "team_size": int(rng.integers(0, 400))
+        })
+    screen = SynergyScreen(
+        [f"c:{i}" for i in range(size)],
+        [target["market"] for target in targets],
+        [target["industry"] for target in targets],
+        [target["tech_stack"] for target in targets],
+        [target["team_size"] for target in targets]
+    )
+    return screen, targets
+
+
+def test_scores_match_pairwise_transform():
+    screen, targets = make_universe()
+    agent = SynergyAgent()
+    expected = [agent.transform(ACQUIRER, target) for target in targets]
+
+    scores = screen.score_all(ACQUIRER)
+    for column in SYNERGY_COLUMNS:
+        assert np.array_equal(scores[column].to_numpy(), np.array([row[column] for row in expected])), column
+
+    no_stack = dict(ACQUIRER, tech_stack=[])
+    expected = [agent.transform(no_stack, target)["overall_synergy_score"] for target in targets]
+    assert np.array_equal(screen.score_all(no_stack)["overall_synergy_score"].to_numpy(), np.array(expected))
+
+
+def test_top_k_is_independent_of_chunking_and_threads():
+    screen, targets = make_universe()
+    agent = SynergyAgent()
+    overall = [agent.transform(ACQUIRER, target)["overall_synergy_score"] for target in targets]
+    expected = sorted(range(len(targets)), key=lambda position: (-overall[position], position))[:20]
+
+    for chunk_size, n_jobs in ((65536, 1), (97, 1), (97, 4)):
+        top = screen.top_k(ACQUIRER, k=20, chunk_size=chunk_size, n_jobs=n_jobs)
+        assert [candidate["position"] for candidate in top] == expected
+    assert top[0]["overall_synergy_score"] == overall[expected[0]]
+
+    ranked = sorted(range(len(targets)), key=lambda position: (-overall[position], position))
+    excluded = screen.top_k(ACQUIRER, k=20, exclude=[f"c:{expected[0]}"], chunk_size=97)
+    assert [candidate["position"] for candidate in excluded] == ranked[1:21]
+    assert len(screen.top_k(ACQUIRER, k=len(targets) + 5)) == len(targets)
+
+
+def test_tied_top_k_is_in_universe_order_at_any_chunk_size():
+    identical = SynergyScreen([f"c:{i}" for i in range(1000)], ["web"] * 1000, ["web"] * 1000,
+                              [[]] * 1000, [5] * 1000)
+    # Crunchbase-like: few categories, no tech stacks and bucketed team sizes, so most scores tie
+    rng = np.random.default_rng(1)
+    size = 2000
+    categories = rng.choice(["web", "software", "games_video", ""], size)
+    bucketed = SynergyScreen([f"c:{i}" for i in range(size)], categories, categories, [[]] * size,
+                             rng.choice([1, 2, 10], size))
+    acquirer = {"market": "web", "industry": "web", "team_size": 5}
+
+    overall = bucketed.score_all(acquirer)["overall_synergy_score"].to_numpy()
+    expected = sorted(range(size), key=lambda position: (-overall[position], position))[:25]
+    for chunk_size, n_jobs in ((65536, 1), (100, 1), (7, 1), (100, 4)):
+        top = identical.top_k(acquirer, k=5, chunk_size=chunk_size, n_jobs=n_jobs)
+        assert [candidate["position"] for candidate in top] == [0, 1, 2, 3, 4]
+        top = bucketed.top_k(acquirer, k=25, chunk_size=chunk_size, n_jobs=n_jobs)
+        assert [candidate["position"] for candidate in top] == expected
+
+
+def test_screen_endpoint():
+    assert api.model_registry.wait(60)
+    screen, _ = make_universe(size=500)
+    original = api.synergy_screen
+    api.synergy_screen = screen
+    try:
+        response = client.post("/screen", json={"acquirer": ACQUIRER, "k": 5, "exclude_id": "c:0"})
+        invalid = client.post("/screen", json={"acquirer": dict(ACQUIRER, team_size="big")})
+        invalid_stacks = [client.post("/screen", json={"acquirer": dict(ACQUIRER, tech_stack=stack)})
+                          for stack in (5, [["python"]], [{"name": "python"}])]
+        too_many = client.post("/screen", json={"acquirer": ACQUIRER, "k": 1000})
+    finally:
+        api.synergy_screen = original
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["universe_size"] == 500
+    assert len(body["candidates"]) == 5
+    assert all(candidate["company_id"] != "c:0" for candidate in body["candidates"])
+    assert invalid.status_code == 422
+    assert [response.status_code for response in invalid_stacks] == [422, 422, 422]
+    assert too_many.status_code == 422
+
+
+def test_screen_ranks_only_companies_from_the_objects_dataset(tmp_path, monkeypatch):
+    assert api.model_registry.wait(60)
+    monkeypatch.chdir(tmp_path)
+    os.makedirs("datasets")
+    entity_types = ["Company", "Person", "FinancialOrg", "Fund"] * 10
+    objects = pd.DataFrame({column: [None] * len(entity_types) for column in COMPANY_COLUMNS})
+    objects["id"] = [f"{entity_type[0].lower()}:{i}" for i, entity_type in enumerate(entity_types)]
+    objects["entity_type"] = entity_types
+    objects["name"] = [f"Object {i}" for i in range(len(entity_types))]
+    # Companies have a category, the other objects none, which an acquirer without one matches best
+    objects["category_code"] = ["web" if entity_type == "Company" else None for entity_type in entity_types]
+    objects.to_csv("datasets/objects.csv", index=False)
+
+    monkeypatch.setattr(api, "team_agent", TeamAgent())
+    monkeypatch.setattr(api, "synergy_screen", None)
+    api._on_companies_loaded(api.model_registry)
+    response = client.post("/screen", json={"acquirer": {"tech_stack": [], "team_size": 10}, "k": 20})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["universe_size"] == 10
+    assert {candidate["company_id"][0] for candidate in body["candidates"]} == {"c"}
+
+
+if __name__ == "__main__":
+    test_scores_match_pairwise_transform()
+    test_top_k_is_independent_of_chunking_and_threads()
+    test_screen_endpoint()
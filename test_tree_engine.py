@@ -0,0 +1,96 @@
+import sys
+import os
+import subprocess
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from src.api import app as api
+from models.tree_engine import TreeEnsembleEvaluator, compile_model
+
+meta_model = joblib.load("models/meta_model_crunchbase.joblib")
+valuation_model = joblib.load("models/valuation_model_crunchbase.joblib")
+
+
+def random_features(n_rows, n_columns, seed):
+    """Non-negative features on several scales, with a few exact zeros like the agents produce."""
+    rng = np.random.default_rng(seed)
+    scales = 10.0 ** rng.integers(0, 8, size=n_columns)
+    X = np.abs(rng.normal(size=(n_rows, n_columns))) * scales
+    X[rng.random(X.shape) < 0.1] = 0.0
+    return X
+
+
+def test_forest_probabilities_are_bit_identical():
+    evaluator = compile_model(meta_model)
+    X = random_features(5000, meta_model.n_features_in_, seed=1)
+    expected = meta_model.predict_proba(pd.DataFrame(X, columns=meta_model.feature_names_in_))
+
+    assert np.array_equal(evaluator.predict_proba(X), expected)
+    assert np.array_equal(evaluator.predict_proba(X[:1]), expected[:1])
+    assert np.array_equal(evaluator.predict(X), meta_model.predict(pd.DataFrame(X, columns=meta_model.feature_names_in_)))
+
+
+def test_booster_predictions_are_bit_identical():
+    evaluator = compile_model(valuation_model)
+    X = random_features(5000, valuation_model.n_features_in_, seed=2)
+    expected = valuation_model.predict(pd.DataFrame(X, columns=valuation_model.feature_names_in_))
+
+    assert evaluator.predict(X).dtype == expected.dtype
+    assert np.array_equal(evaluator.predict(X), expected)
+    X[0, 1] = np.nan  # missing values follow each split's default direction
+    expected = valuation_model.predict(pd.DataFrame(X[:1], columns=valuation_model.feature_names_in_))
+    assert np.array_equal(evaluator.predict(X[:1]), expected)
+
+
+def test_export_loads_and_scores_without_sklearn(tmp_path):
+    path = str(tmp_path / "meta_model.trees.npz")
+    compile_model(meta_model).save(path)
+    X = random_features(50, meta_model.n_features_in_, seed=3)
+    np.save(tmp_path / "X.npy", X)
+
+    script = (
+        "import sys; sys.modules['sklearn'] = None; sys.modules['xgboost'] = None\n"
+        "sys.path.insert(0, 'src')\n"
+        "import numpy as np\n"
+        "from models.tree_engine import TreeEnsembleEvaluator\n"
+        f"evaluator = TreeEnsembleEvaluator.load({path!r})\n"
+        f"np.save({str(tmp_path / 'proba.npy')!r}, evaluator.predict_proba(np.load({str(tmp_path / 'X.npy')!r})))\n"
+    )
+    subprocess.run([sys.executable, "-c", script], check=True, cwd=os.path.dirname(os.path.abspath(__file__)))
+
+    expected = meta_model.predict_proba(pd.DataFrame(X, columns=meta_model.feature_names_in_))
+    assert np.array_equal(np.load(tmp_path / "proba.npy"), expected)
+    assert list(TreeEnsembleEvaluator.load(path).feature_names_in_) == list(meta_model.feature_names_in_)
+
+
+def test_api_scores_with_compiled_trees():
+    assert api.model_registry.wait(60)
+    assert api.inference_plan.compiled == {"meta_model": True, "valuation_model": True}
+
+    test_data = {
+        "funding_json": {"rounds": [{"type": "Seed", "amount": "500000"}]},
+        "team_json": {"founders": [{"experience_years": 5, "has_exit": True}]},
+        "acquirer_json": {"industry": "tech", "market": "saas", "tech_stack": ["python"], "team_size": 500},
+        "target_json": {"industry": "tech", "market": "saas", "tech_stack": ["python"], "team_size": 50},
+        "financials_json": {"monthly_revenue_usd": 100000, "revenue_growth_mom": 15.0, "gross_margin": 0.8}
+    }
+    result = api._predict_one(api.StartupInput(**test_data))
+
+    features = api._compute_agent_features(api.StartupInput(**test_data))["mna"]
+    meta_row = pd.DataFrame([[features.get(c, 0) for c in api.META_FEATURE_COLUMNS]], columns=api.META_FEATURE_COLUMNS)
+    valuation_row = pd.DataFrame([[features.get(c, 0) for c in api.VALUATION_FEATURE_COLUMNS]],
+                                 columns=api.VALUATION_FEATURE_COLUMNS)
+    assert result["mna_likelihood"] == float(api.model.predict_proba(meta_row)[0][1])
+    assert result["valuation_forecast_usd"] == float(api.valuation_model.predict(valuation_row)[0])
+
+
+if __name__ == "__main__":
+    import tempfile
+    import pathlib
+    test_forest_probabilities_are_bit_identical()
+    test_booster_predictions_are_bit_identical()
+    test_export_loads_and_scores_without_sklearn(pathlib.Path(tempfile.mkdtemp()))
+    test_api_scores_with_compiled_trees()
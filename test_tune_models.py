@@ -0,0 +1,83 @@
+import sys
+import os
+import json
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+import pandas as pd
+
+from models import tune_models
+from models.train_with_crunchbase import train_meta_model_with_crunchbase
+from pipeline.build_features import stream_features
+from pipeline.process_datasets import add_valuation_targets
+from test_vectorized_agents import make_frame
+
+
+def make_features(tmp_path, rows=600):
+    make_frame(rows).to_csv(tmp_path / "raw.csv", index=False)
+    stream_features(str(tmp_path / "raw.csv"), str(tmp_path / "features.csv"), progress=False)
+    return pd.read_csv(tmp_path / "features.csv")
+
+
+def test_successive_halving_keeps_the_best_third(monkeypatch):
+    configs = [{"id": i} for i in range(9)]
+
+    class Trial:
+        def __init__(self, config):
+            self.quality = config["id"]
+            self.n_trees = 0
+
+        def grow(self, n_trees):
+            assert n_trees > self.n_trees  # survivors keep growing
+            self.n_trees = n_trees
+
+        def predict(self, X):
+            return [self.quality] * len(X)
+
+        def serving_model(self):
+            return None
+
+    matrices = {"X_valid": [[0.0]], "y_valid": [0.0]}
+    monkeypatch.setattr(tune_models, "model_node_count", lambda model: 0)
+    monkeypatch.setattr(tune_models, "scoring_latency_us", lambda model, X: 1.0)
+    curve = tune_models.successive_halving(Trial, configs, lambda y_true, y_pred: y_pred[0], matrices,
+                                           max_trees=90, eta=3, progress=False)
+    rungs = pd.DataFrame(curve).groupby("n_estimators")["config_id"].apply(sorted).to_dict()
+    assert rungs == {10: list(range(9)), 30: [6, 7, 8], 90: [8]}
+
+
+def test_tune_model_records_curve_and_recommendation(tmp_path):
+    df = add_valuation_targets(make_features(tmp_path))
+    for name in ("meta", "valuation"):
+        result = tune_models.tune_model(name, df, trials=4, max_trees=8, eta=2, output_dir=str(tmp_path),
+                                        progress=False)
+        curve = pd.read_csv(tmp_path / f"{name}_curve.csv")
+        assert curve["config_id"].iloc[0] == "baseline"
+        assert (curve["latency_us"] > 0).all() and (curve["nodes"] > 0).all()
+        assert set(curve["n_estimators"].iloc[1:]) == {2, 4, 8}
+        assert result["recommended"]["score"] >= result["baseline"]["score"] or \
+            result["recommended"]["score"] == curve["score"].iloc[1:].max()
+        with open(tmp_path / f"{name}_best.json") as f:
+            assert json.load(f) == json.loads(json.dumps(result))
+
+    # The trainers accept the recommended parameters
+    params = tune_models.tuned_params("meta", str(tmp_path))
+    model_path = str(tmp_path / "meta.joblib")
+    assert train_meta_model_with_crunchbase(df, model_path, params) == model_path
+
+
+def test_matrices_are_cached_per_feature_file(tmp_path):
+    make_features(tmp_path).to_csv(tmp_path / "features.csv", index=False)
+    cache_dir = str(tmp_path / "cache")
+    first = tune_models.tuning_matrices("meta", features_path=str(tmp_path / "features.csv"), cache_dir=cache_dir)
+    assert first["X_fit"].dtype == "float32"
+    assert len(os.listdir(cache_dir)) == 2  # matrices and the hash manifest
+    cached = tune_models.tuning_matrices("meta", features_path=str(tmp_path / "features.csv"), cache_dir=cache_dir)
+    for key in first:
+        assert (first[key] == cached[key]).all()
+
+
+if __name__ == "__main__":
+    import tempfile
+    import pathlib
+    test_tune_model_records_curve_and_recommendation(pathlib.Path(tempfile.mkdtemp()))
+    test_matrices_are_cached_per_feature_file(pathlib.Path(tempfile.mkdtemp()))
@@ -0,0 +1,118 @@
+import sys
+import os
+import json
+import random
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+import pandas as pd
+
+from models.funding_agent import FundingAgent
+from models.team_agent import TeamAgent
+from models.synergy_agent import SynergyAgent
+from models.valuation_agent import ValuationAgent
+from pipeline.build_features import compute_feature_frame
+
+ROUND_TYPES = ["Seed", "Series A", "Series B", "venture", "angel"]
+MARKETS = ["saas", "SaaS", "fintech", "saas-tools", "", None, "web"]
+TECH = ["python", "react", "angular", "aws", "gcp", "go"]
+
+
+def make_startup(rng: random.Random, startup_id: int) -> dict:
+    """Generate a random startup row, including the odd-shaped inputs seen in real data."""
+    rounds = []
+    for _ in range(rng.randint(0, 4)):
+        amount = rng.choice([rng.randint(0, 10**8), float(rng.randint(0, 10**7)) / 3, "$2,500,000", "n/a", 0])
+        rounds.append({"type": rng.choice(ROUND_TYPES), "amount": amount})
+    founders = [
+        {
+            "experience_years": rng.choice([0, 2, 3, 6.5, 7, 14, 15, 22, rng.random() * 20]),
+            "has_exit": rng.random() > 0.7,
+            "role": rng.choice(["CEO", "CTO"])
+        }
+        for _ in range(rng.randint(0, 4))
+    ]
+    acquirer = {
+        "industry": rng.choice(MARKETS),
+        "market": rng.choice(MARKETS),
+        "tech_stack": rng.sample(TECH, rng.randint(0, 4)),
+        "team_size": rng.choice([0, 1, 10, 55, 500, 2.5])
+    }
+    target = {
+        "industry": rng.choice(MARKETS),
+        "market": rng.choice(MARKETS),
+        "tech_stack": rng.sample(TECH, rng.randint(0, 4)),
+        "team_size": rng.choice([0, 1, 10, 55, 500, 2.5])
+    }
+    financials = rng.choice([
+        {"annual_revenue_usd": rng.randint(0, 10**7), "revenue_growth_mom": rng.uniform(-150, 250)},
+        {"monthly_revenue_usd": rng.randint(0, 10**6), "revenue_growth_mom": rng.uniform(0, 30), "gross_margin": 0.7},
+        {"revenue_growth_mom": float("nan"), "ebitda_margin": 0.2},
+        {}
+    ])
+    return {
+        "startup_id": startup_id,
+        "funding_json": json.dumps({"rounds": rounds}),
+        "team_json": json.dumps({"founders": founders, "estimated_team_size": rng.choice([0, 4, 12, 250])}),
+        "acquirer_json": json.dumps(acquirer),
+        "target_json": json.dumps(target),
+        "financials_json": json.dumps(financials)
+    }
+
+
+def make_frame(rows: int = 500) -> pd.DataFrame:
+    rng = random.Random(7)
+    df = pd.DataFrame([make_startup(rng, i) for i in range(rows)])
+    # Rows the scalar agents reject
+    df.loc[3, "team_json"] = json.dumps({"founders": [{"experience_years": "ten"}]})
+    df.loc[4, "acquirer_json"] = json.dumps({"market": 5, "industry": "web"})
+    df.loc[4, "target_json"] = json.dumps({"market": "web", "industry": "web"})
+    df.loc[5, "funding_json"] = json.dumps({"rounds": [{"amount": None}]})
+    df.loc[6, "financials_json"] = json.dumps({"gross_margin": "high"})
+    df.loc[7, "funding_json"] = "not json"
+    return df
+
+
+def scalar_features(df: pd.DataFrame) -> pd.DataFrame:
+    """The original per-row feature loop."""
+    funding_agent, team_agent = FundingAgent(), TeamAgent.__new__(TeamAgent)
+    synergy_agent, val_agent = SynergyAgent(), ValuationAgent()
+    feature_rows = []
+    for _, row in df.iterrows():
+        try:
+            features = {
+                "startup_id": row["startup_id"],
+                **funding_agent.transform(json.loads(row["funding_json"])),
+                **team_agent.transform(json.loads(row["team_json"])),
+                **synergy_agent.transform(json.loads(row["acquirer_json"]), json.loads(row["target_json"])),
+                **val_agent.transform(json.loads(row["financials_json"]))
+            }
+        except Exception:
+            continue
+        feature_rows.append(features)
+    return pd.DataFrame(feature_rows)
+
+
+def test_batch_features_match_scalar_path():
+    df = make_frame()
+    expected = scalar_features(df)
+    actual = compute_feature_frame(
+        df, FundingAgent(), TeamAgent.__new__(TeamAgent), SynergyAgent(), ValuationAgent()
+    )
+
+    print(f"Scalar rows: {len(expected)}, batch rows: {len(actual)}")
+    assert len(expected) == len(df) - 5
+    pd.testing.assert_frame_equal(actual, expected, check_exact=True)
+    assert actual.to_csv(index=False) == expected.to_csv(index=False)
+
+
+def test_empty_batch():
+    empty = pd.Series([], dtype=object)
+    assert FundingAgent().transform_batch(empty).empty
+    assert TeamAgent.__new__(TeamAgent).transform_batch(empty).empty
+    assert SynergyAgent().transform_batch(empty, empty).empty
+    assert ValuationAgent().transform_batch(empty).empty
+
+
+if __name__ == "__main__":
+    test_batch_features_match_scalar_path()
+    test_empty_batch()
@@ -2,75 +2,247 @@
 """
 Main training script for Smart Acquirer AI models
 This script processes the Crunchbase datasets and trains new models
+
+The steps run in-process as a DAG (src/pipeline/orchestrator.py):
+
+    scenarios -> features -+-> meta_model -> meta_student ----+-> compile_trees
+              |            +-> targets -> valuation_model ----+
+              +-> company_snapshot
+
+The meta and valuation branches run in parallel, as does company_snapshot,
+which precomputes the per-company features the API looks up for known
+companies (src/models/company_snapshot.py). Completed stages are
+recorded in data/processed/pipeline_state.json, and a rerun skips every
+stage whose inputs and outputs have not changed, so after a failure the
+pipeline resumes where it stopped. Use --fresh to run every stage.
+
+With --out-of-core the features are streamed to the feature file without
+the feature store, and the models are trained from the feature files in
+chunks (src/models/train_out_of_core.py), for feature sets that do not fit
+in memory; the meta student is not built in that mode.
+
+`train_models.py tune` searches the models' hyperparameters on the current
+features (src/models/tune_models.py) and writes the recommendations to
+models/tuning/; `train_models.py --tuned` then trains with them.
 """
 
+import argparse
+import functools
 import os
 import sys
-import subprocess
-
-def run_command(command, description):
-    """Run a command and handle errors"""
-    print(f"\n{'='*50}")
-    print(f"Running: {description}")
-    print(f"Command: {command}")
-    print('='*50)
-    
-    try:
-        result = subprocess.run(command, shell=True, check=True, capture_output=True, text=True)
-        print(result.stdout)
-        if result.stderr:
-            print("STDERR:", result.stderr)
-        return True
-    except subprocess.CalledProcessError as e:
-        print(f"Error running {description}:")
-        print(f"Command: {e.cmd}")
-        print(f"Return code: {e.returncode}")
-        print(f"Output: {e.output}")
-        print(f"Error: {e.stderr}")
-        return False
-
-def main():
+
+import joblib
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+
+from models.train_with_crunchbase import MODEL_BACKENDS, distill_meta_model, train_meta_model_with_crunchbase, \
+    train_valuation_model_with_crunchbase
+from models.tree_engine import compile_model, compiled_path
+from models.train_out_of_core import TRAIN_CHUNK_SIZE, train_meta_model_out_of_core, \
+    train_valuation_model_out_of_core
+from models.tune_models import FEATURE_FILES, TUNING_DIR, tune_model, tuned_params
+from models.company_snapshot import COMPANY_SNAPSHOT_PATH, MANIFEST_FILE
+from pipeline.feature_store import feature_versions
+from pipeline.orchestrator import PIPELINE_STATE_PATH, Stage, format_report, run_stages
+from pipeline.process_datasets import build_enhanced_features, enhance_training_data_with_targets, \
+    process_company_snapshot, process_crunchbase_data, snapshot_agents
+
+RAW_SCENARIOS = 'data/raw/crunchbase_startups.csv'
+FEATURES = 'data/processed/crunchbase_features.csv'
+FEATURES_WITH_TARGETS = 'data/processed/crunchbase_features_with_targets.csv'
+META_MODEL = 'models/meta_model_crunchbase.joblib'
+META_STUDENT = 'models/meta_model_crunchbase.student.joblib'
+VALUATION_MODEL = 'models/valuation_model_crunchbase.joblib'
+
+
+def build_scenarios(results):
+    if process_crunchbase_data() is None:
+        raise RuntimeError("no scenarios were built from the Crunchbase datasets")
+
+
+def build_company_snapshot(results):
+    if process_company_snapshot() is None:
+        raise RuntimeError("the company snapshot could not be built")
+
+
+def build_features(results):
+    if build_enhanced_features() is None:
+        raise RuntimeError("no features were generated")
+    return pd.read_csv(FEATURES)
+
+
+def build_targets(results):
+    # The meta model trains on the same table concurrently, so work on a copy
+    return enhance_training_data_with_targets(results['features'].copy())
+
+
+def build_features_file(results):
+    # Streamed straight to the feature file; the feature store would hold every row in SQLite
+    if build_enhanced_features(store_path='') is None:
+        raise RuntimeError("no features were generated")
+
+
+def build_targets_file(results):
+    # Streams the feature file in chunks
+    enhance_training_data_with_targets(FEATURES)
+
+
+def train_meta(results, tuned=False, backend='default'):
+    params = tuned_params('meta') if tuned else None
+    return train_meta_model_with_crunchbase(results['features'], META_MODEL, params, backend)
+
+
+def train_valuation(results, tuned=False, backend='default'):
+    params = tuned_params('valuation') if tuned else None
+    return train_valuation_model_with_crunchbase(results['targets'], VALUATION_MODEL, params, backend)
+
+
+def train_meta_out_of_core(results, chunk_size=TRAIN_CHUNK_SIZE):
+    if train_meta_model_out_of_core(FEATURES, META_MODEL, chunk_size) is None:
+        raise RuntimeError("the meta model had nothing to train on")
+    # A student distilled from an earlier meta model would no longer match it
+    for path in (META_STUDENT, compiled_path(META_STUDENT), os.path.splitext(META_STUDENT)[0] + '.json'):
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def train_valuation_out_of_core(results, chunk_size=TRAIN_CHUNK_SIZE):
+    if train_valuation_model_out_of_core(FEATURES_WITH_TARGETS, VALUATION_MODEL, chunk_size) is None:
+        raise RuntimeError("the valuation model had nothing to train on")
+
+
+def distill_meta(results):
+    if distill_meta_model(results['features'], META_MODEL, META_STUDENT) is None:
+        raise RuntimeError("the meta model could not be distilled")
+
+
+def compile_trees(results, paths=(META_MODEL, META_STUDENT, VALUATION_MODEL)):
+    for path in paths:
+        try:
+            compile_model(joblib.load(path)).save(compiled_path(path))
+        except ValueError as e:
+            # LightGBM models and classifier boosters are served by their own libraries
+            print(f"Not compiling {path}: {e}")
+            if os.path.exists(compiled_path(path)):
+                os.remove(compiled_path(path))
+
+
+def training_stages(tuned=False, backend='default', out_of_core=False, chunk_size=TRAIN_CHUNK_SIZE):
+    """
+    The stages of the Crunchbase training pipeline.
+
+    ``tuned`` trains with the tuned parameters; ``backend`` is one of
+    ``MODEL_BACKENDS`` (default: random forest and XGBoost). ``out_of_core``
+    trains XGBoost models from the feature files, ``chunk_size`` rows at a time.
+    """
+    def tuned_inputs(name):
+        return [os.path.join(TUNING_DIR, f'{name}_best.json')] if tuned else []
+
+    # Rebuilt when the datasets change or an agent bumps its FEATURE_VERSION. Runs after
+    # scenarios so that the two do not load the datasets into the cache at the same time.
+    snapshot = Stage('company_snapshot', build_company_snapshot, deps=['scenarios'],
+                     inputs=['datasets/objects.csv', 'datasets/funding_rounds.csv'],
+                     outputs=[os.path.join(COMPANY_SNAPSHOT_PATH, MANIFEST_FILE)],
+                     config={'versions': feature_versions(snapshot_agents())})
+
+    if out_of_core:
+        config = {'out_of_core': True}
+        return [
+            Stage('scenarios', build_scenarios,
+                  inputs=['datasets/objects.csv', 'datasets/funding_rounds.csv'], outputs=[RAW_SCENARIOS]),
+            Stage('features', build_features_file, deps=['scenarios'], outputs=[FEATURES]),
+            Stage('targets', build_targets_file, deps=['features'], outputs=[FEATURES_WITH_TARGETS]),
+            Stage('meta_model', functools.partial(train_meta_out_of_core, chunk_size=chunk_size),
+                  deps=['features'], outputs=[META_MODEL], config=config),
+            Stage('valuation_model', functools.partial(train_valuation_out_of_core, chunk_size=chunk_size),
+                  deps=['targets'], outputs=[VALUATION_MODEL], config=config),
+            Stage('compile_trees', functools.partial(compile_trees, paths=(META_MODEL, VALUATION_MODEL)),
+                  deps=['meta_model', 'valuation_model'], outputs=[compiled_path(VALUATION_MODEL)]),
+            snapshot
+        ]
+
+    return [
+        Stage('scenarios', build_scenarios,
+              inputs=['datasets/objects.csv', 'datasets/funding_rounds.csv'], outputs=[RAW_SCENARIOS]),
+        Stage('features', build_features, deps=['scenarios'], outputs=[FEATURES],
+              load=lambda: pd.read_csv(FEATURES)),
+        Stage('targets', build_targets, deps=['features'], outputs=[FEATURES_WITH_TARGETS],
+              load=lambda: pd.read_csv(FEATURES_WITH_TARGETS)),
+        Stage('meta_model', functools.partial(train_meta, tuned=tuned, backend=backend), deps=['features'],
+              inputs=tuned_inputs('meta'), outputs=[META_MODEL], config={'backend': backend}),
+        Stage('valuation_model', functools.partial(train_valuation, tuned=tuned, backend=backend), deps=['targets'],
+              inputs=tuned_inputs('valuation'), outputs=[VALUATION_MODEL], config={'backend': backend}),
+        Stage('meta_student', distill_meta, deps=['features', 'meta_model'],
+              outputs=[META_STUDENT, os.path.splitext(META_STUDENT)[0] + '.json']),
+        Stage('compile_trees', compile_trees, deps=['meta_model', 'meta_student', 'valuation_model'],
+              outputs=[compiled_path(META_STUDENT)] + ([compiled_path(META_MODEL), compiled_path(VALUATION_MODEL)]
+                                                       if backend == 'default' else [])),
+        snapshot
+    ]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Process the Crunchbase datasets and train the models")
+    parser.add_argument('command', nargs='?', choices=['train', 'tune'], default='train',
+                        help="train the models (default) or tune their hyperparameters")
+    parser.add_argument('--tuned', action='store_true', help="train with the parameters found by 'tune'")
+    parser.add_argument('--backend', choices=MODEL_BACKENDS, default='default',
+                        help="model library: random forest/XGBoost (default) or LightGBM")
+    parser.add_argument('--out-of-core', action='store_true',
+                        help="train from the feature files in chunks, for feature sets larger than memory")
+    parser.add_argument('--chunk-size', type=int, default=TRAIN_CHUNK_SIZE, help="rows per chunk with --out-of-core")
+    parser.add_argument('--models', nargs='+', choices=['meta', 'valuation'], default=['meta', 'valuation'],
+                        help="models to tune")
+    parser.add_argument('--trials', type=int, default=27, help="configurations tried per model")
+    parser.add_argument('--max-trees', type=int, default=300, help="trees of the best configurations")
+    parser.add_argument('--eta', type=int, default=3, help="keep the best 1/eta configurations per round")
+    parser.add_argument('--seed', type=int, default=0, help="seed of the sampled configurations")
+    parser.add_argument('--fresh', action='store_true', help="ignore completed stages and run everything")
+    parser.add_argument('--workers', type=int, default=None, help="stages run concurrently (default: all ready)")
+    parser.add_argument('--state', default=PIPELINE_STATE_PATH, help="file recording completed stages")
+    args = parser.parse_args(argv)
+
     print("Smart Acquirer - Model Training Pipeline")
     print("========================================")
-    
+
     # Change to the project directory
     project_dir = os.path.dirname(os.path.abspath(__file__))
     os.chdir(project_dir)
     print(f"Working directory: {project_dir}")
-    
-    # Step 1: Process the datasets
-    print("\nStep 1: Processing Crunchbase datasets...")
-    success = run_command(
-        "python src/pipeline/process_datasets.py",
-        "Dataset Processing"
-    )
-    
-    if not success:
-        print("Dataset processing failed. Exiting.")
+
+    if args.command == 'tune':
+        for name in args.models:
+            if not os.path.exists(FEATURE_FILES[name]):
+                print(f"{FEATURE_FILES[name]} not found; run the training pipeline first")
+                return 1
+            tune_model(name, trials=args.trials, max_trees=args.max_trees, eta=args.eta, seed=args.seed)
+        print(f"\nRecommendations written to {TUNING_DIR}/; train with them using --tuned")
+        return 0
+
+    if args.tuned:
+        missing = [name for name in ('meta', 'valuation') if tuned_params(name) is None]
+        if missing:
+            print(f"No tuned parameters for the {', '.join(missing)} model; run 'train_models.py tune' first")
+            return 1
+
+    if args.tuned and (args.backend != 'default' or args.out_of_core):
+        print("Tuned parameters are for the default in-memory backend; train without --tuned")
         return 1
-    
-    # Step 2: Train models with Crunchbase data
-    print("\nStep 2: Training models with Crunchbase data...")
-    success = run_command(
-        "python src/models/train_with_crunchbase.py",
-        "Model Training"
-    )
-    
-    if not success:
-        print("Model training failed. Exiting.")
+    if args.out_of_core and args.backend != 'default':
+        print("Out-of-core training uses XGBoost; drop --backend")
         return 1
-    
-    # Step 3: Test the API
-    print("\nStep 3: Testing API health...")
-    success = run_command(
-        "curl -X GET http://localhost:8000/health",
-        "API Health Check"
-    )
-    
-    if not success:
-        print("API health check failed.")
+
+    stages = training_stages(args.tuned, args.backend, args.out_of_core, args.chunk_size)
+    report = run_stages(stages, args.state, workers=args.workers, resume=not args.fresh)
+    print("\n" + format_report(report))
+
+    failed = [entry for entry in report if entry['status'] in ('failed', 'blocked')]
+    if failed:
+        print(f"\nTraining pipeline did not complete: {', '.join(entry['stage'] for entry in failed)}")
+        print("Fix the error and rerun; completed stages will be skipped.")
         return 1
-    
+
     print("\n" + "="*50)
     print("TRAINING PIPELINE COMPLETED SUCCESSFULLY!")
     print("="*50)
@@ -78,8 +250,8 @@ def main():
     print("1. Start the API server: uvicorn src.api.app:app --reload")
     print("2. The API will automatically use the new Crunchbase-trained models")
     print("3. Test the API endpoints with your data")
-    
+
     return 0
 
 if __name__ == "__main__":
-    sys.exit(main())
\ No newline at end of file
+    sys.exit(main())